@@ -0,0 +1,129 @@
+"""
+Sondes de vivacité (/healthz) et de disponibilité (/readyz).
+
+``healthz`` ne fait aucune E/S. ``readyz`` vérifie l'état du modèle, la
+profondeur de la file d'inférence et la base de données ; le résultat des
+vérifications coûteuses est mis en cache quelques secondes.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+from ml_models.inference_queue import INTERACTIVE
+
+from . import runtime
+
+_cache_lock = threading.Lock()
+_cache = {}
+
+# Un seul thread dédié: la connexion à la base est réutilisée d'une sonde à l'autre
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='readyz-db')
+
+
+def _cached(name, check):
+    """Renvoie le dernier résultat de ``check`` s'il date de moins de HEALTH_CHECK_CACHE_SECONDS"""
+    now = time.monotonic()
+    with _cache_lock:
+        if name in _cache and now - _cache[name][0] < settings.HEALTH_CHECK_CACHE_SECONDS:
+            return _cache[name][1]
+    result = check()
+    with _cache_lock:
+        _cache[name] = (time.monotonic(), result)
+    return result
+
+
+def _ping_database():
+    # Ce thread ne reçoit pas les signaux de fin de requête: il fait lui-même le
+    # ménage des connexions, sans quoi une connexion coupée (redémarrage de la
+    # base, délai d'inactivité) ferait échouer toutes les sondes suivantes
+    connection.close_if_unusable_or_obsolete()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception:
+        connection.close()
+        raise
+    return True
+
+
+def _check_database():
+    start = time.perf_counter()
+    try:
+        _db_executor.submit(_ping_database).result(timeout=settings.HEALTH_CHECK_DB_TIMEOUT)
+        result = {'ok': True}
+    except FutureTimeoutError:
+        result = {'ok': False, 'error': 'timeout'}
+    except Exception as e:
+        result = {'ok': False, 'error': str(e)}
+    result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def check_database():
+    """Vérifie que la base répond avant l'échéance configurée (résultat mis en cache)"""
+    return _cached('database', _check_database)
+
+
+def _check_inference_server():
+    try:
+        status = runtime.get_inference_client().status()
+    except Exception as e:
+        return {'loaded': False, 'warmed': False, 'simulated': False, 'server': False, 'error': str(e)}
+    return {
+        'loaded': status['loaded'],
+        'warmed': status['warmed'],
+        'simulated': status['simulated'],
+        'server': True,
+    }
+
+
+def check_model():
+    """État du modèle; déclenche son chargement en arrière-plan s'il n'est pas encore prêt"""
+    if runtime.uses_inference_server():
+        return _cached('inference_server', _check_inference_server)
+    classifier = runtime.peek_classifier()
+    if runtime.is_idle_unloaded():
+        # Libéré après inactivité: rechargé par la prochaine prédiction, pas par la sonde
+        return {'loaded': False, 'warmed': False, 'simulated': False, 'idle_unloaded': True}
+    if classifier is None or not classifier.is_warmed:
+        runtime.start_warmup()
+    if classifier is None:
+        return {'loaded': False, 'warmed': False, 'simulated': False}
+    return {
+        'loaded': classifier.is_loaded,
+        'warmed': classifier.is_warmed,
+        'simulated': not classifier.is_tensorflow_available,
+    }
+
+
+def check_inference_queue():
+    # Un long travail en masse ne rend pas l'instance indisponible: seule la voie interactive compte
+    depth = runtime.queue_depth(INTERACTIVE)
+    return {'depth': depth, 'ok': depth <= settings.HEALTH_CHECK_MAX_QUEUE_DEPTH}
+
+
+def healthz(request):
+    """Sonde de vivacité: le processus répond, sans aucune E/S"""
+    return JsonResponse({'status': 'ok'})
+
+
+def readyz(request):
+    """Sonde de disponibilité: modèle chargé et préchauffé, file raisonnable, base joignable"""
+    model = check_model()
+    inference_queue = check_inference_queue()
+    database = check_database()
+    model_ready = (model['loaded'] and model['warmed']) or model.get('idle_unloaded', False)
+    ready = model_ready and inference_queue['ok'] and database['ok']
+    return JsonResponse(
+        {
+            'status': 'ready' if ready else 'unavailable',
+            'model': model,
+            'inference_queue': inference_queue,
+            'database': database,
+        },
+        status=200 if ready else 503,
+    )
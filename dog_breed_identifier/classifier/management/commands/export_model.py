@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_models.enhanced_model import EnhancedDogBreedClassifier
+
+from classifier import runtime
+
+
+class Command(BaseCommand):
+    help = 'Export the classifier as a SavedModel whose serving signature decodes, resizes and normalizes images in-graph'
+
+    def add_arguments(self, parser):
+        parser.add_argument('export_dir', help='SavedModel directory to write')
+        parser.add_argument(
+            '--model',
+            help='Trained .keras model to export (default: the model served by this deployment)'
+        )
+        parser.add_argument(
+            '--resolution',
+            type=int,
+            default=None,
+            help=f'Side of the images fed to the model (default: {settings.ML_DEFAULT_RESOLUTION})'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            resolution = runtime.resolve_resolution(options['resolution'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['model']:
+            classifier = EnhancedDogBreedClassifier(
+                input_shape=runtime.default_input_shape(),
+                num_classes=70,
+                resolutions=settings.ML_RESOLUTIONS,
+                weights_dir=settings.ML_WEIGHTS_DIR,
+                allow_weight_download=not settings.ML_WEIGHTS_OFFLINE,
+            )
+            if not classifier.load_model(options['model']):
+                raise CommandError(f'Unable to load {options["model"]}')
+        else:
+            classifier = runtime.get_classifier(warmup=False)
+
+        if not classifier.export_serving(options['export_dir'], resolution):
+            raise CommandError('TensorFlow model unavailable: only a simulation marker was written')
+        self.stdout.write(
+            self.style.SUCCESS(f'Exported to {options["export_dir"]} ({resolution}x{resolution})')  # type: ignore[attr-defined]
+        )
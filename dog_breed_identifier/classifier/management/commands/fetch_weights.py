@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_models.weight_store import KNOWN_WEIGHTS, WeightStore
+
+
+class Command(BaseCommand):
+    help = 'Download pretrained model weights into the local weight store and verify their checksums'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help=f'Weights to fetch (default: all of {", ".join(sorted(KNOWN_WEIGHTS))})'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Download again even if a verified copy is already present'
+        )
+        parser.add_argument(
+            '--verify-only',
+            action='store_true',
+            help='Only recompute checksums of the files already in the store'
+        )
+
+    def handle(self, *args, **options):
+        store = WeightStore(settings.ML_WEIGHTS_DIR)
+        names = options['names'] or sorted(KNOWN_WEIGHTS)
+        unknown = [name for name in names if name not in KNOWN_WEIGHTS]
+        if unknown:
+            raise CommandError(f'Unknown weights: {", ".join(unknown)}')
+
+        failures = 0
+        for name in names:
+            if options['verify_only']:
+                ok = store.verify(name)
+            else:
+                try:
+                    store.fetch(name, force=options['force'])
+                    ok = True
+                except Exception as e:
+                    self.stdout.write(
+                        self.style.ERROR(f'{name}: {e}')  # type: ignore[attr-defined]
+                    )
+                    ok = False
+
+            if ok:
+                self.stdout.write(
+                    self.style.SUCCESS(f'{name}: OK ({store.path_for(name)})')  # type: ignore[attr-defined]
+                )
+            else:
+                failures += 1
+                self.stdout.write(
+                    self.style.ERROR(f'{name}: missing or checksum mismatch')  # type: ignore[attr-defined]
+                )
+
+        if failures:
+            raise CommandError(f'{failures} weight file(s) unavailable')
@@ -0,0 +1,77 @@
+import logging
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ml_models.enhanced_model import EnhancedDogBreedClassifier
+from ml_models.inference_server import InferenceServer
+
+from classifier import runtime
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Run the inference server: the only process holding the model, serving batched predictions over a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--socket',
+            default=settings.INFERENCE_SOCKET,
+            help='Path of the Unix socket (default: INFERENCE_SOCKET)'
+        )
+        parser.add_argument(
+            '--max-batch-size',
+            type=int,
+            default=settings.INFERENCE_SERVER_MAX_BATCH_SIZE,
+            help='Maximum number of images per forward pass'
+        )
+        parser.add_argument(
+            '--max-wait-ms',
+            type=float,
+            default=settings.INFERENCE_MAX_WAIT_MS,
+            help='How long to wait for a batch to fill up'
+        )
+
+    def handle(self, *args, **options):
+        socket_path = options['socket']
+        if not socket_path:
+            raise CommandError('No socket path: pass --socket or set INFERENCE_SOCKET')
+
+        classifier = EnhancedDogBreedClassifier(
+            input_shape=(settings.ML_DEFAULT_RESOLUTION, settings.ML_DEFAULT_RESOLUTION, 3),
+            num_classes=70,
+            resolutions=settings.ML_RESOLUTIONS,
+            weights_dir=settings.ML_WEIGHTS_DIR,
+            allow_weight_download=not settings.ML_WEIGHTS_OFFLINE,
+            cascade_threshold=settings.ML_CASCADE_THRESHOLD or None,
+            dog_gate_threshold=settings.ML_DOG_GATE_THRESHOLD or None,
+        )
+        classifier.build_model()
+        # Same cascade and not-a-dog gate as a worker holding the model itself
+        runtime.build_auxiliary_models(classifier)
+        classifier.warmup()
+
+        server = InferenceServer(
+            socket_path,
+            classifier,
+            max_batch_size=options['max_batch_size'],
+            max_wait_ms=options['max_wait_ms'],
+        )
+
+        def stop(signum, frame):
+            # shutdown() attend la fin de serve_forever: à appeler depuis un autre thread
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Inference server listening on {socket_path}')  # type: ignore[attr-defined]
+        )
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.stdout.write('Inference server stopped')
@@ -0,0 +1,90 @@
+import logging
+import os
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ml_models.resources import plan_serving, read_cpu_quota, read_memory_limit
+
+logger = logging.getLogger(__name__)
+
+# Option de la commande -> variable d'environnement qui la remplace aussi
+OVERRIDES = {
+    'workers': ('WEB_CONCURRENCY', int),
+    'worker_class': ('GUNICORN_WORKER_CLASS', str),
+    'threads': ('GUNICORN_THREADS', int),
+    'intra_op_threads': ('TF_NUM_INTRAOP_THREADS', int),
+    'inter_op_threads': ('TF_NUM_INTEROP_THREADS', int),
+    'omp_threads': ('OMP_NUM_THREADS', int),
+}
+
+
+class Command(BaseCommand):
+    help = 'Start gunicorn with workers and TensorFlow/OpenMP threads sized to the cgroup CPU quota and memory limit'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', default=f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+        parser.add_argument('--workers', type=int, help='Number of gunicorn workers (env: WEB_CONCURRENCY)')
+        parser.add_argument('--worker-class', help='Gunicorn worker class (env: GUNICORN_WORKER_CLASS)')
+        parser.add_argument('--threads', type=int, help='Threads per gthread worker (env: GUNICORN_THREADS)')
+        parser.add_argument('--intra-op-threads', type=int, help='TensorFlow intra-op threads per worker (env: TF_NUM_INTRAOP_THREADS)')
+        parser.add_argument('--inter-op-threads', type=int, help='TensorFlow inter-op threads per worker (env: TF_NUM_INTEROP_THREADS)')
+        parser.add_argument('--omp-threads', type=int, help='OpenMP threads per worker (env: OMP_NUM_THREADS)')
+        parser.add_argument(
+            '--worker-memory-mb',
+            type=int,
+            default=settings.SERVE_WORKER_MEMORY_MB,
+            help='Expected memory of one worker, used to cap the worker count under a memory limit'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Print the plan without starting gunicorn')
+
+    def handle(self, *args, **options):
+        overrides = {}
+        for name, (variable, cast) in OVERRIDES.items():
+            value = options.get(name)
+            if value is None and os.environ.get(variable):
+                value = cast(os.environ[variable])
+            overrides[name] = value
+
+        cpu_quota = read_cpu_quota()
+        memory_limit = read_memory_limit()
+        plan, sources = plan_serving(
+            cpu_quota=cpu_quota,
+            memory_limit=memory_limit,
+            worker_memory_mb=options['worker_memory_mb'],
+            uses_inference_server=bool(settings.INFERENCE_SOCKET),
+            threads_per_worker=settings.INFERENCE_MAX_BATCH_SIZE,
+            overrides=overrides,
+        )
+
+        logger.info(
+            f"Ressources: {plan['cpus']} CPU (quota cgroup: {cpu_quota or 'aucun'}), "
+            f"mémoire: {plan['memory_limit_mb'] or 'illimitée'} Mo"
+        )
+        for name in OVERRIDES:
+            self.stdout.write(f"{name:<18} {plan[name]!s:<10} ({sources[name]})")
+
+        env = dict(os.environ)
+        env.update({
+            'WEB_CONCURRENCY': str(plan['workers']),
+            'TF_NUM_INTRAOP_THREADS': str(plan['intra_op_threads']),
+            'TF_NUM_INTEROP_THREADS': str(plan['inter_op_threads']),
+            'OMP_NUM_THREADS': str(plan['omp_threads']),
+        })
+        argv = [
+            sys.executable, '-m', 'gunicorn',
+            '--chdir', str(settings.BASE_DIR),
+            '-c', str(settings.BASE_DIR / 'gunicorn.conf.py'),
+            '--bind', options['bind'],
+            '--workers', str(plan['workers']),
+            '--worker-class', plan['worker_class'],
+            '--threads', str(plan['threads']),
+            'dog_identifier.wsgi:application',
+        ]
+        if options['dry_run']:
+            self.stdout.write(' '.join(argv))
+            return
+
+        logger.info(f"Démarrage de gunicorn: {' '.join(argv[1:])}")
+        sys.stdout.flush()
+        os.execvpe(argv[0], argv, env)
@@ -0,0 +1,665 @@
+"""
+Instances partagées du classifieur et de la file d'inférence pour le processus courant.
+"""
+
+import atexit
+import importlib.util
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from ml_models.admission import AdmissionController
+from ml_models.coalescing import SingleFlight
+from ml_models.enhanced_model import EnhancedDogBreedClassifier, read_model_metadata
+from ml_models.ensemble import EnsemblePredictor
+from ml_models.explanations import ExplanationJobs, encode_png, overlay
+from ml_models.idle import IdleUnloader
+from ml_models.inference_queue import BULK, InferenceQueue
+from ml_models.inference_server import InferenceClient
+from ml_models.metrics import metrics
+from ml_models.model_pool import ModelPool
+from ml_models.weight_store import WeightStore, map_file
+from ml_models.write_behind import WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_warmup_lock = threading.Lock()
+# Tenu pendant chaque inférence et pendant le déchargement du modèle
+_model_lock = threading.Lock()
+_classifier = None
+_inference_queue = None
+# Une file (et donc un lot) par résolution; ``_inference_queue`` est celle de la résolution par défaut
+_inference_queues = {}
+_inference_client = None
+_admission_controllers = {}
+_ensemble = None
+_ensemble_queue = None
+_ensemble_admission_controller = None
+_single_flight = SingleFlight()
+_preprocessor = None
+_warmup_thread = None
+_load_timings = {}
+_idle_unloader = None
+_idle_unloaded = False
+_unload_artifact = None
+_upload_writer = None
+_explanation_jobs = None
+_model_pool = None
+_variant_queues = {}
+_variant_admission_controllers = {}
+_variant_specs = {}
+_preloaded_files = []
+
+
+def get_classifier(warmup=True):
+    """Construit (une seule fois) et, par défaut, préchauffe le classifieur amélioré"""
+    global _classifier
+    if _classifier is None:
+        with _lock:
+            if _classifier is None:
+                start = time.perf_counter()
+                classifier = EnhancedDogBreedClassifier(
+                    input_shape=default_input_shape(),
+                    num_classes=70,
+                    resolutions=settings.ML_RESOLUTIONS,
+                    weights_dir=settings.ML_WEIGHTS_DIR,
+                    allow_weight_download=not settings.ML_WEIGHTS_OFFLINE,
+                    max_decode_pixels=settings.ML_MAX_DECODE_PIXELS,
+                    cascade_threshold=settings.ML_CASCADE_THRESHOLD or None,
+                    dog_gate_threshold=settings.ML_DOG_GATE_THRESHOLD or None,
+                )
+                classifier.build_model()
+                build_auxiliary_models(classifier)
+                _load_timings['build_seconds'] = time.perf_counter() - start
+                logger.info(f"Classifieur construit en {_load_timings['build_seconds']:.2f}s")
+                _classifier = classifier
+    if _idle_unloaded:
+        _reload()
+    if warmup and not _classifier.is_warmed:
+        ensure_warm()
+    return _classifier
+
+
+def build_auxiliary_models(classifier):
+    """MobileNetV2 entraîné de la cascade ou de l'ensemble, filtre chien"""
+    if classifier.cascade_threshold or 'mobilenet_v2' in settings.ML_ENSEMBLE_MEMBERS:
+        # Sans tête des races entraînée, les réponses du modèle rapide ne seraient que du bruit
+        if not settings.ML_FAST_MODEL_PATH:
+            raise ImproperlyConfigured(
+                "La cascade et le membre d'ensemble mobilenet_v2 demandent ML_FAST_MODEL_PATH (modèle rapide entraîné)"
+            )
+        if not classifier.load_fast_model(settings.ML_FAST_MODEL_PATH):
+            raise ImproperlyConfigured(f"Modèle rapide impossible à charger: {settings.ML_FAST_MODEL_PATH}")
+    if classifier.dog_gate_threshold:
+        classifier.build_gate_model()
+
+
+def ensure_warm():
+    """Préchauffe le classifieur dans le processus courant s'il ne l'est pas encore"""
+    classifier = get_classifier(warmup=False)
+    with _warmup_lock:
+        if not classifier.is_warmed:
+            start = time.perf_counter()
+            classifier.warmup()
+            _load_timings['warmup_seconds'] = time.perf_counter() - start
+    return classifier
+
+
+def _reload():
+    """Recharge le modèle déchargé après inactivité, depuis l'artefact sauvegardé si possible"""
+    global _idle_unloaded, _unload_artifact
+    with _lock:
+        if not _idle_unloaded:
+            return
+        start = time.perf_counter()
+        artifact = _unload_artifact
+        source = 'artifact'
+        if not (artifact and os.path.exists(artifact) and _classifier.load_model(artifact)):
+            source = 'build'
+            _classifier.build_model()
+        if artifact and os.path.exists(artifact):
+            os.remove(artifact)
+        _unload_artifact = None
+        build_auxiliary_models(_classifier)
+        elapsed = time.perf_counter() - start
+        _idle_unloaded = False
+    metrics.incr('model.reloads')
+    metrics.observe('model.reload_seconds', elapsed)
+    logger.info(f"Modèle rechargé ({source}) en {elapsed:.2f}s")
+
+
+def unload_model():
+    """Libère le modèle du processus; il est rechargé à la prochaine prédiction.
+
+    À chaque déchargement, le modèle est sauvegardé (écriture atomique) dans
+    un artefact propre au processus, dérivé de ``ML_MODEL_ARTIFACT``, pour
+    être rechargé à l'identique et plus vite qu'une reconstruction. Le
+    fichier d'un autre worker ou d'un ancien déploiement (autres poids, autres
+    ML_RESOLUTIONS) n'est donc jamais rechargé; il est supprimé après le
+    rechargement.
+    """
+    global _idle_unloaded, _unload_artifact
+    classifier = _classifier
+    if classifier is None or _idle_unloaded or classifier.model is None:
+        return False
+    with _model_lock:
+        start = time.perf_counter()
+        _unload_artifact = None
+        if settings.ML_MODEL_ARTIFACT:
+            root, extension = os.path.splitext(settings.ML_MODEL_ARTIFACT)
+            artifact = f'{root}.{os.getpid()}{extension}'
+            os.makedirs(os.path.dirname(artifact), exist_ok=True)
+            partial = f'{root}.{os.getpid()}.partial{extension}'
+            classifier.save_model(partial)
+            if os.path.exists(partial):
+                os.replace(partial, artifact)
+                _unload_artifact = artifact
+        with _lock:
+            classifier.unload()
+            _idle_unloaded = True
+        elapsed = time.perf_counter() - start
+    metrics.incr('model.unloads')
+    metrics.observe('model.unload_seconds', elapsed)
+    logger.info(f"Modèle déchargé après inactivité en {elapsed:.2f}s")
+    return True
+
+
+def is_idle_unloaded():
+    """Vrai si le modèle a été libéré après inactivité (il se recharge à la demande)"""
+    return _idle_unloaded
+
+
+def _predict_batch(batch):
+    if uses_inference_server():
+        return get_predictor().predict_batch(batch)
+    with _model_lock:
+        if _idle_unloader is not None:
+            _idle_unloader.touch()
+        return get_classifier().predict_batch(batch)
+
+
+def get_idle_unloader():
+    """Surveillance de l'inactivité du modèle (None si ML_IDLE_UNLOAD_SECONDS vaut 0)"""
+    global _idle_unloader
+    if _idle_unloader is None and settings.ML_IDLE_UNLOAD_SECONDS > 0 and not uses_inference_server():
+        with _lock:
+            if _idle_unloader is None:
+                _idle_unloader = IdleUnloader(
+                    unload_model,
+                    settings.ML_IDLE_UNLOAD_SECONDS,
+                    busy_fn=lambda: queue_depth() > 0,
+                )
+    return _idle_unloader
+
+
+def preload():
+    """Prépare les fichiers de poids dans le processus maître de gunicorn, avant le fork des workers.
+
+    Le maître vérifie (et télécharge si permis) les poids pré-entraînés et le
+    modèle rapide, puis les garde projetés en mémoire: leurs pages, dans le
+    cache du système, sont partagées par tous les workers. Il n'exécute
+    aucune opération TensorFlow: construire le modèle créerait les pools de
+    threads intra-op et inter-op, qui ne survivent pas à un fork. Chaque
+    worker construit et préchauffe son modèle après le fork (voir ``gunicorn.conf.py``).
+    """
+    global _preloaded_files
+    if uses_inference_server():
+        return []
+    store = WeightStore(settings.ML_WEIGHTS_DIR)
+    names = ['resnet50_notop'] + (['mobilenet_v2'] if settings.ML_DOG_GATE_THRESHOLD else [])
+    paths = [store.resolve(name, allow_download=not settings.ML_WEIGHTS_OFFLINE) for name in names]
+    if settings.ML_FAST_MODEL_PATH:
+        paths.append(settings.ML_FAST_MODEL_PATH)
+    _preloaded_files = [
+        map_file(path) for path in paths if path and os.path.isfile(path) and os.path.getsize(path)
+    ]
+    logger.info(f"{len(_preloaded_files)} fichier(s) de poids préchargé(s) dans le maître")
+    return _preloaded_files
+
+
+def get_load_timings():
+    """Durées de construction et de préchauffage du dernier chargement du modèle"""
+    return dict(_load_timings)
+
+
+def peek_classifier():
+    """Renvoie le classifieur s'il est déjà construit, sans déclencher de chargement"""
+    return _classifier
+
+
+def uses_inference_server():
+    """Vrai si le modèle est servi par un processus séparé (``manage.py run_inference_server``)"""
+    return bool(settings.INFERENCE_SOCKET)
+
+
+def get_inference_client():
+    """Client (pool de connexions) du serveur d'inférence"""
+    global _inference_client
+    if _inference_client is None:
+        with _lock:
+            if _inference_client is None:
+                _inference_client = InferenceClient(
+                    settings.INFERENCE_SOCKET,
+                    pool_size=settings.INFERENCE_CLIENT_POOL_SIZE,
+                    timeout=settings.INFERENCE_CLIENT_TIMEOUT,
+                )
+    return _inference_client
+
+
+def get_preprocessor():
+    """Classifieur utilisé pour le prétraitement et les noms de races.
+
+    Avec un serveur d'inférence, c'est une instance sans modèle: le worker web
+    ne construit jamais ResNet50.
+    """
+    global _preprocessor
+    if not uses_inference_server():
+        return get_classifier()
+    if _preprocessor is None:
+        with _lock:
+            if _preprocessor is None:
+                _preprocessor = EnhancedDogBreedClassifier(
+                    input_shape=default_input_shape(),
+                    num_classes=70,
+                    resolutions=settings.ML_RESOLUTIONS,
+                    max_decode_pixels=settings.ML_MAX_DECODE_PIXELS,
+                )
+    return _preprocessor
+
+
+def get_predictor():
+    """Objet exposant ``predict_batch``: le classifieur local ou le client du serveur d'inférence"""
+    if uses_inference_server():
+        return get_inference_client()
+    return get_classifier()
+
+
+def default_input_shape():
+    return (settings.ML_DEFAULT_RESOLUTION, settings.ML_DEFAULT_RESOLUTION, 3)
+
+
+def resolve_resolution(resolution=None):
+    """Résolution servie correspondant à ``resolution`` (None: résolution par défaut)"""
+    if resolution is None:
+        return settings.ML_DEFAULT_RESOLUTION
+    if resolution not in settings.ML_RESOLUTIONS:
+        raise ValueError(f"Résolution non servie: {resolution} (disponibles: {settings.ML_RESOLUTIONS})")
+    return resolution
+
+
+def get_inference_queue(resolution=None):
+    """File d'inférence partagée par toutes les requêtes du processus, une par résolution"""
+    global _inference_queue
+    resolution = resolve_resolution(resolution)
+    inference_queue = _inference_queues.get(resolution)
+    if inference_queue is None:
+        get_idle_unloader()
+        with _lock:
+            inference_queue = _inference_queues.get(resolution)
+            if inference_queue is None:
+                inference_queue = _inference_queues[resolution] = InferenceQueue(
+                    _predict_batch,
+                    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+                    max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+                    max_bulk_wait_ms=settings.INFERENCE_MAX_BULK_WAIT_MS,
+                )
+                if resolution == settings.ML_DEFAULT_RESOLUTION:
+                    _inference_queue = inference_queue
+    return inference_queue
+
+
+def get_admission_controller(resolution=None):
+    """Contrôle d'admission devant la file d'inférence de la résolution"""
+    resolution = resolve_resolution(resolution)
+    controller = _admission_controllers.get(resolution)
+    if controller is None:
+        inference_queue = get_inference_queue(resolution)
+        with _lock:
+            controller = _admission_controllers.get(resolution)
+            if controller is None:
+                controller = _admission_controllers[resolution] = AdmissionController(
+                    inference_queue,
+                    wait_budget_seconds=settings.ADMISSION_WAIT_BUDGET_SECONDS,
+                    max_queue_depth=settings.ADMISSION_MAX_QUEUE_DEPTH or None,
+                )
+    return controller
+
+
+def get_single_flight():
+    """Regroupement des prédictions identiques en cours dans ce processus"""
+    return _single_flight
+
+
+def peek_inference_queue():
+    """Renvoie la file d'inférence de la résolution par défaut si elle existe déjà"""
+    return _inference_queue
+
+
+def peek_inference_queues():
+    """Files d'inférence déjà créées, par résolution"""
+    return dict(_inference_queues)
+
+
+def queue_depth(lane=None):
+    """Images en attente, toutes résolutions confondues (et file de l'ensemble).
+
+    Avec ``lane``, seules comptent les images servies avant une nouvelle image de cette voie.
+    """
+    inference_queues = list(_inference_queues.values()) + list(_variant_queues.values())
+    if _ensemble_queue is not None:
+        inference_queues.append(_ensemble_queue)
+    return sum(inference_queue.depth(lane) for inference_queue in inference_queues)
+
+
+def uses_ensemble():
+    return bool(settings.ML_ENSEMBLE_MEMBERS)
+
+
+def get_ensemble():
+    """Ensemble des modèles de ML_ENSEMBLE_MEMBERS, exécutés en parallèle sur chaque lot"""
+    global _ensemble
+    if _ensemble is None:
+        with _lock:
+            if _ensemble is None:
+                members = {}
+                for entry in settings.ML_ENSEMBLE_MEMBERS:
+                    name, _, socket_path = entry.partition('=')
+                    if socket_path:
+                        client = InferenceClient(
+                            socket_path,
+                            pool_size=settings.INFERENCE_CLIENT_POOL_SIZE,
+                            timeout=settings.INFERENCE_CLIENT_TIMEOUT,
+                        )
+                        members[name] = client.predict_batch
+                    elif name == 'resnet50':
+                        members[name] = _locked_member(lambda classifier, batch: classifier.predict_accurate(batch))
+                    elif name == 'mobilenet_v2':
+                        members[name] = _locked_member(lambda classifier, batch: classifier.predict_fast(batch))
+                    else:
+                        raise ImproperlyConfigured(f"Membre d'ensemble inconnu: {entry}")
+                _ensemble = EnsemblePredictor(members)
+    return _ensemble
+
+
+def _locked_member(predict):
+    """Membre local de l'ensemble: seul lui prend le verrou du modèle, pas les membres distants"""
+    def predict_locked(batch):
+        with _model_lock:
+            if _idle_unloader is not None:
+                _idle_unloader.touch()
+            return predict(get_classifier(), batch)
+    return predict_locked
+
+
+def _predict_ensemble(batch):
+    # Le filtre chien s'applique à l'ensemble comme au modèle seul: les non-chiens ont une ligne nulle
+    with _model_lock:
+        if _idle_unloader is not None:
+            _idle_unloader.touch()
+        classifier = get_classifier()
+        is_dog = classifier.dog_mask(batch)
+    if is_dog is None:
+        return get_ensemble().predict_batch(batch)
+    probabilities = np.zeros((len(batch), classifier.num_classes), dtype=np.float32)
+    if is_dog.any():
+        probabilities[is_dog] = get_ensemble().predict_batch(batch[is_dog])
+    return probabilities
+
+
+def get_ensemble_queue():
+    """File d'inférence de l'ensemble: les requêtes sont regroupées comme pour le modèle seul"""
+    global _ensemble_queue
+    if _ensemble_queue is None:
+        get_idle_unloader()
+        with _lock:
+            if _ensemble_queue is None:
+                _ensemble_queue = InferenceQueue(
+                    _predict_ensemble,
+                    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+                    max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+                    max_bulk_wait_ms=settings.INFERENCE_MAX_BULK_WAIT_MS,
+                )
+    return _ensemble_queue
+
+
+def get_ensemble_admission_controller():
+    global _ensemble_admission_controller
+    if _ensemble_admission_controller is None:
+        inference_queue = get_ensemble_queue()
+        with _lock:
+            if _ensemble_admission_controller is None:
+                _ensemble_admission_controller = AdmissionController(
+                    inference_queue,
+                    wait_budget_seconds=settings.ADMISSION_WAIT_BUDGET_SECONDS,
+                    max_queue_depth=settings.ADMISSION_MAX_QUEUE_DEPTH or None,
+                )
+    return _ensemble_admission_controller
+
+
+def peek_ensemble_queue():
+    return _ensemble_queue
+
+
+def start_warmup():
+    """Lance le chargement et le préchauffage du modèle en arrière-plan (sans bloquer l'appelant)"""
+    global _warmup_thread
+    if uses_inference_server() or (_classifier is not None and _classifier.is_warmed):
+        return
+    with _lock:
+        if _warmup_thread is not None and _warmup_thread.is_alive():
+            return
+        _warmup_thread = threading.Thread(target=ensure_warm, name='model-warmup', daemon=True)
+        _warmup_thread.start()
+
+
+def _write_uploads(records):
+    # Importé ici: runtime est chargé par gunicorn.conf.py avant que les applications Django soient prêtes
+    from django.db import Error as DatabaseError, close_old_connections, connection
+
+    from .models import UploadedImage
+
+    # Le thread d'écriture ne reçoit pas les signaux de fin de requête: il fait
+    # lui-même le ménage des connexions coupées ou trop anciennes
+    close_old_connections()
+    try:
+        try:
+            UploadedImage.objects.bulk_create(records)  # type: ignore[attr-defined]
+        except DatabaseError as e:
+            # Connexion probablement coupée (délai d'inactivité, redémarrage): un essai sur une connexion neuve
+            logger.warning(f"Écriture de {len(records)} envois impossible ({e}), nouvel essai")
+            metrics.incr('write_behind.retries')
+            connection.close()
+            UploadedImage.objects.bulk_create(records)  # type: ignore[attr-defined]
+    finally:
+        close_old_connections()
+
+
+def get_upload_writer():
+    """Tampon d'écriture différée des UploadedImage (None si UPLOAD_WRITE_BEHIND est désactivé)"""
+    global _upload_writer
+    if _upload_writer is None and settings.UPLOAD_WRITE_BEHIND:
+        with _lock:
+            if _upload_writer is None:
+                _upload_writer = WriteBehindBuffer(
+                    _write_uploads,
+                    batch_size=settings.UPLOAD_WRITE_BATCH_SIZE,
+                    max_delay=settings.UPLOAD_WRITE_MAX_DELAY_SECONDS,
+                    max_pending=settings.UPLOAD_WRITE_MAX_PENDING,
+                )
+                if settings.UPLOAD_FLUSH_ON_SHUTDOWN:
+                    atexit.register(flush_uploads)
+    return _upload_writer
+
+
+def record_upload(uploaded_image):
+    """Enregistre un UploadedImage, via le tampon d'écriture différée s'il est actif"""
+    writer = get_upload_writer()
+    if writer is None:
+        uploaded_image.save()
+    else:
+        writer.add(uploaded_image)
+
+
+def flush_uploads():
+    """Écrit les UploadedImage encore en attente (arrêt du worker); renvoie leur nombre"""
+    if _upload_writer is None:
+        return 0
+    written = _upload_writer.flush()
+    if written:
+        logger.info(f"{written} enregistrements d'envoi écrits à l'arrêt")
+    return written
+
+
+def explanations_available():
+    """Les explications Grad-CAM demandent le modèle TensorFlow dans ce processus"""
+    if uses_inference_server():
+        return False
+    classifier = peek_classifier()
+    if classifier is not None:
+        return classifier.is_tensorflow_available
+    return importlib.util.find_spec('tensorflow') is not None
+
+
+def _grad_cam(image):
+    # Même verrou que les prédictions: pas de passe Grad-CAM pendant un déchargement
+    with _model_lock:
+        if _idle_unloader is not None:
+            _idle_unloader.touch()
+        return get_classifier().grad_cam(image)
+
+
+def _compute_explanation(image_path, output_path):
+    if os.path.exists(output_path):
+        return
+    start = time.perf_counter()
+    image = get_classifier().preprocess_image(image_path)
+    # La passe Grad-CAM attend son tour dans la voie bulk de la file par défaut: les
+    # prédictions interactives passent devant et l'admission la compte dans la profondeur
+    result = get_inference_queue().submit_call(lambda: _grad_cam(image), lane=BULK).result()
+    if result is None:
+        raise RuntimeError("Modèle indisponible pour Grad-CAM")
+    heatmap, _ = result
+    png = encode_png(overlay(image, heatmap))
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    partial = f'{output_path}.{os.getpid()}.partial'
+    with open(partial, 'wb') as f:
+        f.write(png)
+    os.replace(partial, output_path)
+    metrics.observe('explanations.seconds', time.perf_counter() - start)
+
+
+def get_explanation_jobs():
+    """Calculs Grad-CAM en arrière-plan, hors du chemin des requêtes"""
+    global _explanation_jobs
+    if _explanation_jobs is None:
+        with _lock:
+            if _explanation_jobs is None:
+                _explanation_jobs = ExplanationJobs(
+                    _compute_explanation,
+                    max_workers=settings.EXPLANATION_WORKERS,
+                    max_pending=settings.EXPLANATION_MAX_PENDING,
+                    failure_ttl=settings.EXPLANATION_FAILURE_TTL_SECONDS,
+                )
+    return _explanation_jobs
+
+
+def variant_spec(name):
+    """Forme d'entrée et races d'une variante, lues dans les métadonnées écrites à côté du modèle.
+
+    Sans métadonnées, la variante prend la résolution par défaut et les races du modèle principal.
+    """
+    if name not in settings.ML_MODEL_VARIANTS:
+        raise ValueError(f"Variante inconnue: {name}")
+    spec = _variant_specs.get(name)
+    if spec is None:
+        metadata = read_model_metadata(settings.ML_MODEL_VARIANTS[name])
+        spec = _variant_specs[name] = (
+            tuple(metadata.get('input_shape') or default_input_shape()),
+            list(metadata.get('breeds') or get_preprocessor().breeds),
+        )
+    return spec
+
+
+def _load_variant(name):
+    input_shape, breeds = variant_spec(name)
+    classifier = EnhancedDogBreedClassifier(
+        input_shape=input_shape,
+        num_classes=len(breeds),
+        weights_dir=settings.ML_WEIGHTS_DIR,
+        allow_weight_download=not settings.ML_WEIGHTS_OFFLINE,
+        max_decode_pixels=settings.ML_MAX_DECODE_PIXELS,
+    )
+    classifier.breeds = breeds
+    if not classifier.load_model(settings.ML_MODEL_VARIANTS[name]):
+        raise RuntimeError(f"Impossible de charger la variante {name} ({settings.ML_MODEL_VARIANTS[name]})")
+    classifier.warmup()
+    return classifier
+
+
+def get_model_pool():
+    """Variantes de ML_MODEL_VARIANTS, chargées à la demande dans la limite de ML_MODEL_POOL_BUDGET_MB"""
+    global _model_pool
+    if _model_pool is None:
+        with _lock:
+            if _model_pool is None:
+                _model_pool = ModelPool(
+                    _load_variant,
+                    settings.ML_MODEL_POOL_BUDGET_MB * 2 ** 20,
+                    size_fn=lambda classifier: classifier.model_bytes(),
+                    # Références seulement: clear_session toucherait les modèles en train de prédire
+                    unload_fn=lambda classifier: classifier.unload(release_memory=False),
+                )
+    return _model_pool
+
+
+def peek_model_pool():
+    return _model_pool
+
+
+def peek_variant_queues():
+    return dict(_variant_queues)
+
+
+def get_variant_queue(name):
+    """File d'inférence d'une variante: ses lots passent par le pool de modèles"""
+    if name not in settings.ML_MODEL_VARIANTS:
+        raise ValueError(f"Variante inconnue: {name}")
+    inference_queue = _variant_queues.get(name)
+    if inference_queue is None:
+        with _lock:
+            inference_queue = _variant_queues.get(name)
+            if inference_queue is None:
+                inference_queue = _variant_queues[name] = InferenceQueue(
+                    lambda batch: _predict_variant(name, batch),
+                    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+                    max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+                    max_bulk_wait_ms=settings.INFERENCE_MAX_BULK_WAIT_MS,
+                )
+    return inference_queue
+
+
+def get_variant_admission_controller(name):
+    """Contrôle d'admission devant la file d'une variante (sa latence inclut les chargements du pool)"""
+    controller = _variant_admission_controllers.get(name)
+    if controller is None:
+        inference_queue = get_variant_queue(name)
+        with _lock:
+            controller = _variant_admission_controllers.get(name)
+            if controller is None:
+                controller = _variant_admission_controllers[name] = AdmissionController(
+                    inference_queue,
+                    wait_budget_seconds=settings.ADMISSION_WAIT_BUDGET_SECONDS,
+                    max_queue_depth=settings.ADMISSION_MAX_QUEUE_DEPTH or None,
+                )
+    return controller
+
+
+def _predict_variant(name, batch):
+    with get_model_pool().use(name) as classifier:
+        return classifier.predict_batch(batch)
@@ -1,9 +1,11 @@
 from django.urls import path
-from . import views
+from . import health, views
 
 urlpatterns = [
     path('', views.home, name='home'),
     path('upload/', views.upload_image, name='upload_image'),
+    path('predict/tensor/', views.predict_tensor, name='predict_tensor'),
+    path('explanation/<str:name>/', views.explanation, name='explanation'),
     path('about/', views.about, name='about'),
     path('train/', views.train_model, name='train_model'),
     path('advanced-train/', views.advanced_train_model, name='advanced_train_model'),
@@ -13,4 +15,7 @@ urlpatterns = [
     path('advanced-training-stats/', views.advanced_training_stats, name='advanced_training_stats'),
     path('auto-train-check/', views.auto_train_check, name='auto_train_check'),
     path('validate-dataset/', views.validate_dataset, name='validate_dataset'),
+    path('metrics/', views.serving_metrics, name='serving_metrics'),
+    path('healthz', health.healthz, name='healthz'),
+    path('readyz', health.readyz, name='readyz'),
 ]
\ No newline at end of file
@@ -1,51 +1,105 @@
 from django.shortcuts import render, redirect
 from django.core.files.storage import default_storage
-from django.http import JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.contrib import messages
+import hashlib
+import hmac
 import os
 import json
+import logging
+import time
+
+import numpy as np
 
 from .models import UploadedImage, DogBreed
-# Importer le nouveau classifieur amélioré
-from ml_models.enhanced_model import EnhancedDogBreedClassifier
-from ml_models.auto_trainer import AutoTrainer
-from ml_models.advanced_trainer import AdvancedTrainer  # Nouvel import
-from ml_models.data_manager import DataManager
+from . import runtime
+from ml_models.deadline import Deadline, DeadlineExceeded
+from ml_models.explanations import BUSY, FAILED
+from ml_models.image_guard import ImageRejected, inspect_image
+from ml_models.inference_queue import BULK, INTERACTIVE, LANES
+from ml_models.metrics import metrics
+from ml_models.tensor_codec import (
+    BINARY_CONTENT_TYPE, NPY_CONTENT_TYPE, TensorRejected, decode_tensor, encode_probabilities, parse_shape,
+)
+
+# Les entraîneurs (requests, PIL, numpy, collecteurs) sont importés dans les
+# vues qui les utilisent pour ne pas alourdir le démarrage des workers.
+
+logger = logging.getLogger(__name__)
 
-# Initialiser le classifieur amélioré
-classifier = EnhancedDogBreedClassifier(num_classes=70)  # Augmenter le nombre de classes
-classifier.build_model()
+# Le classifieur est chargé selon ML_MODEL_LOADING (voir classifier/runtime.py et /readyz)
+
+# Marge pour les en-têtes multipart autour du fichier dans Content-Length
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
 
 def home(request):
     return render(request, 'classifier/home.html')
 
 def upload_image(request):
+    # Un corps trop gros est refusé avant même d'analyser le multipart
+    if request.method == 'POST' and _content_length(request) > settings.UPLOAD_MAX_BYTES + MULTIPART_OVERHEAD_BYTES:
+        return _rejected_upload(ImageRejected("Fichier trop volumineux", status=413))
+
     if request.method == 'POST' and request.FILES.get('image'):
+        deadline = _request_deadline()
         image = request.FILES['image']
+        try:
+            resolution = _requested_resolution(request.POST.get('resolution'))
+        except ValueError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        # Format et dimensions lus dans l'en-tête: réponse 4xx sans rien décoder
+        try:
+            header = inspect_image(
+                image,
+                max_bytes=settings.UPLOAD_MAX_BYTES,
+                max_pixels=settings.UPLOAD_MAX_PIXELS,
+                allowed_formats=settings.UPLOAD_ALLOWED_FORMATS,
+            )
+            runtime.get_preprocessor().check_decode_budget(header.format, (header.width, header.height), resolution)
+        except ImageRejected as e:
+            return _rejected_upload(e)
+
+        # Refuser tout de suite si l'attente prévue dépasse le budget (contrôle d'admission)
+        admitted, retry_after = runtime.get_admission_controller(resolution).admit(lane=INTERACTIVE)
+        if not admitted:
+            metrics.incr('upload.shed')
+            response = JsonResponse(
+                {'error': 'Service temporairement surchargé, veuillez réessayer.', 'retry_after': retry_after},
+                status=503,
+            )
+            response['Retry-After'] = str(retry_after)
+            return response
+        metrics.incr('upload.admitted')
+
+        content_hash = _content_hash(image)
         
         # Save the uploaded image
         file_name = default_storage.save(f'dog_images/{image.name}', image)
         file_url = default_storage.url(file_name)
         
-        # Create a new UploadedImage instance
-        # Only set the required image field during creation
-        uploaded_image = UploadedImage.objects.create(  # type: ignore[attr-defined]
-            image=file_name
-        )
-        
-        # Set the optional fields after creation
-        uploaded_image.predicted_breed = None
-        uploaded_image.confidence_score = None
-        uploaded_image.second_breed = None
-        uploaded_image.second_confidence = None
-        uploaded_image.third_breed = None
-        uploaded_image.third_confidence = None
-        uploaded_image.save()
-        
         # Use our ML model to predict the breed
-        prediction_result = predict_dog_breed(file_name)
+        start = time.perf_counter()
+        uploaded_image = UploadedImage(image=file_name)
+        try:
+            prediction_result = predict_dog_breed(
+                file_name, content_hash=content_hash, deadline=deadline, resolution=resolution
+            )
+        except DeadlineExceeded as e:
+            runtime.record_upload(uploaded_image)
+            return _deadline_exceeded(e)
+        metrics.observe('upload.prediction_seconds', time.perf_counter() - start)
+
+        if prediction_result and prediction_result.get('not_a_dog'):
+            runtime.record_upload(uploaded_image)
+            return render(request, 'classifier/result.html', {
+                'uploaded_image': uploaded_image,
+                'file_url': file_url,
+                'prediction': None,
+                'not_a_dog': True,
+            })
         
         # Update the uploaded image with prediction results
         if prediction_result:
@@ -58,25 +112,152 @@ def upload_image(request):
                 uploaded_image.second_confidence = prediction_result['alternatives'][0]['confidence']
                 uploaded_image.third_breed = prediction_result['alternatives'][1]['breed']
                 uploaded_image.third_confidence = prediction_result['alternatives'][1]['confidence']
-            
-            uploaded_image.save()
+        
+        # Écriture différée: la réponse n'attend pas la base (voir runtime.record_upload)
+        runtime.record_upload(uploaded_image)
         
         context = {
             'uploaded_image': uploaded_image,
             'file_url': file_url,
-            'prediction': prediction_result
+            'prediction': prediction_result,
+            # Bouton « Why this breed? » seulement si ce serveur sait calculer Grad-CAM
+            'explanation_name': os.path.basename(file_name) if runtime.explanations_available() else None,
         }
         
         return render(request, 'classifier/result.html', context)
     
     return redirect('home')
 
-def predict_dog_breed(image_path):
+def _request_deadline():
+    """Échéance de la requête (None si PREDICTION_DEADLINE_SECONDS vaut 0)"""
+    if settings.PREDICTION_DEADLINE_SECONDS > 0:
+        return Deadline.after(settings.PREDICTION_DEADLINE_SECONDS)
+    return None
+
+def _requested_resolution(value):
+    """Résolution demandée par le client (None: résolution par défaut); ValueError si elle n'est pas servie"""
+    if not value:
+        return None
+    try:
+        resolution = int(value)
+    except ValueError:
+        raise ValueError(f"Résolution invalide: {value!r}")
+    return runtime.resolve_resolution(resolution)
+
+def _expected_latency(resolution):
+    """Attente prévue dans la file de la résolution et durée moyenne d'inférence d'une image"""
+    wait = runtime.get_admission_controller(resolution).predicted_wait(lane=INTERACTIVE)
+    item_seconds = runtime.get_inference_queue(resolution).ewma_item_seconds or 0.0
+    return wait, item_seconds
+
+def _deadline_exceeded(error):
+    """Réponse 503 quand la prédiction ne peut pas aboutir avant l'échéance"""
+    metrics.incr('predictions.deadline_exceeded')
+    logger.warning(f"Prédiction abandonnée: {error}")
+    response = JsonResponse({'error': 'Délai de traitement dépassé, veuillez réessayer.', 'retry_after': 1}, status=503)
+    response['Retry-After'] = '1'
+    return response
+
+def _content_length(request):
+    try:
+        return int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return 0
+
+def _rejected_upload(error):
+    """Réponse JSON pour une image refusée avant décodage"""
+    metrics.incr('upload.rejected')
+    logger.info(f"Image refusée ({error.status}): {error}")
+    return JsonResponse({'error': str(error)}, status=error.status)
+
+def _content_hash(uploaded_file):
+    """Empreinte SHA-256 du contenu d'un fichier envoyé"""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+def predict_probabilities(image_path, deadline=None, resolution=None):
+    """Prétraite l'image et renvoie ses probabilités via la file d'inférence partagée.
+
+    L'image est prétraitée à ``resolution`` (résolution par défaut si None) et
+    rejoint la file d'inférence de cette résolution.
+
+    Pour une animation, les images échantillonnées sont soumises ensemble
+    (elles partent dans le même lot) et leurs probabilités sont moyennées.
+
+    Avec une échéance (``deadline``), la prédiction échoue tout de suite
+    (DeadlineExceeded) si l'attente prévue dans la file dépasse le temps
+    restant, et le nombre d'images d'une animation est réduit à ce que le
+    temps restant permet. Si le temps manque à la résolution demandée, la
+    plus petite résolution servie est essayée avant d'abandonner. Renvoie
+    (probabilités, dégradations appliquées).
+    """
+    degraded = []
+    preprocessor = runtime.get_preprocessor()
+    resolution = runtime.resolve_resolution(resolution)
+    path = default_storage.path(image_path)
+
+    max_frames = settings.ML_MAX_FRAMES
+    if deadline is not None:
+        wait, item_seconds = _expected_latency(resolution)
+        smallest = settings.ML_RESOLUTIONS[0]
+        if deadline.remaining() < wait + item_seconds and smallest < resolution:
+            resolution = smallest
+            wait, item_seconds = _expected_latency(resolution)
+            degraded.append('lower_resolution')
+        deadline.check(wait + item_seconds)
+        if item_seconds:
+            max_frames = max(1, min(max_frames, int((deadline.remaining() - wait) // item_seconds)))
+
+    try:
+        frames = preprocessor.preprocess_frames(path, max_frames=max_frames, resolution=resolution)
+        if max_frames < settings.ML_MAX_FRAMES and preprocessor.frame_count(path) > len(frames):
+            degraded.append('frames_reduced')
+    except Exception as e:
+        logger.error(f"Impossible de prétraiter l'image {image_path}: {e}")
+        return None, degraded
+
+    if len(frames) > 1:
+        metrics.incr('predictions.multi_frame')
+        metrics.incr('predictions.frames', len(frames))
+    inference_queue = runtime.get_inference_queue(resolution)
+    futures = [inference_queue.submit(frame, deadline=deadline, lane=INTERACTIVE) for frame in frames]
+    try:
+        results = [future.result(timeout=deadline.remaining() if deadline else None) for future in futures]
+    except TimeoutError:
+        raise DeadlineExceeded("Échéance dépassée en attendant l'inférence")
+    probabilities = results[0] if len(results) == 1 else np.mean(results, axis=0)
+    return probabilities, degraded
+
+def predict_dog_breed(image_path, content_hash=None, deadline=None, resolution=None):
     """
     Function to predict dog breed using our enhanced machine learning model.
+
+    Les requêtes simultanées pour une même image (même ``content_hash``) à
+    la même résolution partagent une seule inférence. Le résultat liste sous ``degraded`` les
+    raccourcis pris faute de temps avant ``deadline``.
     """
-    # Utiliser le classifieur amélioré
-    predictions = classifier.predict_breed(image_path)
+    if content_hash:
+        (probabilities, degraded), shared = runtime.get_single_flight().do(
+            f'{content_hash}:{runtime.resolve_resolution(resolution)}',
+            lambda: predict_probabilities(image_path, deadline=deadline, resolution=resolution),
+        )
+        metrics.incr('predictions.coalesced' if shared else 'predictions.computed')
+    else:
+        probabilities, degraded = predict_probabilities(image_path, deadline=deadline, resolution=resolution)
+    if probabilities is None:
+        return None
+    if degraded:
+        metrics.incr('predictions.degraded')
+        for reason in degraded:
+            metrics.incr(f'predictions.degraded.{reason}')
+    if not np.any(probabilities):
+        # Écartée par le filtre chien: aucune race calculée, rien à chercher dans DogBreed
+        metrics.incr('predictions.not_a_dog')
+        return {'not_a_dog': True, 'degraded': degraded}
+    predictions = runtime.get_preprocessor().to_predictions(probabilities)
     
     if predictions:
         # Trier les prédictions par probabilité
@@ -119,7 +300,8 @@ def predict_dog_breed(image_path):
             'breed': breed,
             'confidence': top_prediction[1],
             'origin': breed.origin_country,
-            'alternatives': alternatives
+            'alternatives': alternatives,
+            'degraded': degraded
         }
     
     return None
@@ -134,6 +316,8 @@ def train_model(request):
     """Vue pour déclencher manuellement l'entraînement du modèle"""
     if request.method == 'POST':
         try:
+            from ml_models.auto_trainer import AutoTrainer
+
             # Initialiser l'entraîneur automatique
             trainer = AutoTrainer()
             
@@ -158,6 +342,8 @@ def advanced_train_model(request):
     """Vue pour déclencher l'entraînement avancé du modèle"""
     if request.method == 'POST':
         try:
+            from ml_models.advanced_trainer import AdvancedTrainer
+
             # Initialiser l'entraîneur avancé
             advanced_trainer = AdvancedTrainer()
             
@@ -178,6 +364,8 @@ def comprehensive_train_model(request):
     """Vue pour déclencher l'entraînement complet avec collecte automatique de toutes les races"""
     if request.method == 'POST':
         try:
+            from ml_models.advanced_trainer import AdvancedTrainer
+
             # Initialiser l'entraîneur avancé
             advanced_trainer = AdvancedTrainer()
             
@@ -203,6 +391,8 @@ def continuous_learning(request):
     """Vue pour déclencher l'apprentissage continu"""
     if request.method == 'POST':
         try:
+            from ml_models.advanced_trainer import AdvancedTrainer
+
             # Initialiser l'entraîneur avancé
             advanced_trainer = AdvancedTrainer()
             
@@ -222,6 +412,8 @@ def continuous_learning(request):
 def training_stats(request):
     """Vue pour afficher les statistiques d'entraînement"""
     try:
+        from ml_models.auto_trainer import AutoTrainer
+
         trainer = AutoTrainer()
         stats = trainer.get_training_stats()
         return JsonResponse(stats)
@@ -231,6 +423,8 @@ def training_stats(request):
 def advanced_training_stats(request):
     """Vue pour afficher les statistiques d'entraînement avancées"""
     try:
+        from ml_models.advanced_trainer import AdvancedTrainer
+
         advanced_trainer = AdvancedTrainer()
         stats = advanced_trainer.get_advanced_training_stats()
         return JsonResponse(stats)
@@ -240,6 +434,8 @@ def advanced_training_stats(request):
 def auto_train_check(request):
     """Vue pour vérifier si l'entraînement automatique est nécessaire"""
     try:
+        from ml_models.auto_trainer import AutoTrainer
+
         trainer = AutoTrainer()
         should_train = trainer.should_train()
         return JsonResponse({"should_train": should_train})
@@ -249,8 +445,224 @@ def auto_train_check(request):
 def validate_dataset(request):
     """Vue pour valider l'intégrité du dataset"""
     try:
+        from ml_models.data_manager import DataManager
+
         data_manager = DataManager()
         validation_report = data_manager.validate_dataset()
         return JsonResponse(validation_report)
     except Exception as e:
-        return JsonResponse({"error": str(e)})
\ No newline at end of file
+        return JsonResponse({"error": str(e)})
+
+@csrf_exempt
+def predict_tensor(request):
+    """Prédiction sur des images déjà décodées (uint8 H x W x 3 ou N x H x W x 3).
+
+    ``GET`` décrit les formes acceptées et l'ordre des races. ``POST`` accepte
+    un corps NPY ou binaire brut accompagné de ``X-Tensor-Shape``; la taille
+    des images choisit la résolution servie (et sa file d'inférence). La
+    réponse est en JSON, ou en float32 brut / NPY selon l'en-tête ``Accept``.
+
+    Avec ``?model=ensemble``, les images passent par l'ensemble de modèles
+    (ML_ENSEMBLE_MEMBERS), à la résolution par défaut uniquement; avec
+    ``?model=<variante>``, par une variante de ML_MODEL_VARIANTS, chargée à la
+    demande dans le pool de modèles, à sa propre résolution (``GET`` avec
+    ``?model=<variante>`` donne sa forme et ses races). Les images
+    entrent dans la voie ``bulk`` de la file, derrière les envois
+    interactifs, sauf avec ``?priority=interactive`` accompagné du jeton
+    TENSOR_INTERACTIVE_TOKEN (en-tête ``X-Priority-Token``).
+    """
+    preprocessor = runtime.get_preprocessor()
+    input_shape = tuple(preprocessor.input_shape)
+    input_shapes = [(resolution, resolution, input_shape[2]) for resolution in settings.ML_RESOLUTIONS]
+    model = request.GET.get('model')
+    if request.method == 'GET':
+        if model in settings.ML_MODEL_VARIANTS:
+            # Une variante a sa propre forme d'entrée et ses propres races
+            variant_shape, variant_breeds = runtime.variant_spec(model)
+            return JsonResponse({
+                'model': model,
+                'input_shape': list(variant_shape),
+                'dtype': 'uint8',
+                'max_images': settings.TENSOR_MAX_IMAGES,
+                'breeds': variant_breeds,
+            })
+        return JsonResponse({
+            'input_shape': list(input_shape),
+            'resolutions': list(settings.ML_RESOLUTIONS),
+            'ensemble': [entry.partition('=')[0] for entry in settings.ML_ENSEMBLE_MEMBERS],
+            'models': sorted(settings.ML_MODEL_VARIANTS),
+            'dtype': 'uint8',
+            'max_images': settings.TENSOR_MAX_IMAGES,
+            'breeds': preprocessor.breeds,
+        })
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Méthode non autorisée'}, status=405)
+
+    lane = request.GET.get('priority', BULK)
+    if lane not in LANES:
+        return _rejected_tensor(TensorRejected(f"Priorité inconnue: {lane!r} (attendu: {', '.join(LANES)})"))
+    if lane == INTERACTIVE and not _may_use_interactive_lane(request):
+        return _rejected_tensor(TensorRejected("Voie interactive réservée (en-tête X-Priority-Token)", status=403))
+    use_ensemble = model == 'ensemble'
+    if use_ensemble:
+        if not runtime.uses_ensemble():
+            return _rejected_tensor(TensorRejected("Aucun ensemble configuré (ML_ENSEMBLE_MEMBERS)", status=404))
+        input_shapes = [input_shape]
+    elif model is not None:
+        if model not in settings.ML_MODEL_VARIANTS:
+            return _rejected_tensor(TensorRejected(f"Modèle inconnu: {model!r}", status=404))
+        input_shapes = [runtime.variant_spec(model)[0]]
+
+    max_bytes = settings.TENSOR_MAX_IMAGES * int(np.prod(input_shapes[-1])) + 1024  # + en-tête NPY
+    deadline = _request_deadline()
+    if not request.META.get('CONTENT_LENGTH'):
+        # Corps envoyé par morceaux: sa taille ne peut pas être vérifiée avant lecture
+        return _rejected_tensor(TensorRejected("En-tête Content-Length requis", status=411))
+    if _content_length(request) > max_bytes:
+        return _rejected_tensor(TensorRejected("Corps trop volumineux", status=413))
+    try:
+        shape_header = request.headers.get('X-Tensor-Shape')
+        # Lu directement sur le flux: la limite est max_bytes, pas DATA_UPLOAD_MAX_MEMORY_SIZE
+        batch = decode_tensor(
+            request.read(max_bytes),
+            input_shapes,
+            shape=parse_shape(shape_header) if shape_header else None,
+            max_images=settings.TENSOR_MAX_IMAGES,
+        )
+    except TensorRejected as e:
+        return _rejected_tensor(e)
+
+    resolution = batch.shape[1]
+    if use_ensemble:
+        admission_controller = runtime.get_ensemble_admission_controller()
+        inference_queue = runtime.get_ensemble_queue()
+    elif model is not None:
+        admission_controller = runtime.get_variant_admission_controller(model)
+        inference_queue = runtime.get_variant_queue(model)
+    else:
+        admission_controller = runtime.get_admission_controller(resolution)
+        inference_queue = runtime.get_inference_queue(resolution)
+    admitted, retry_after = admission_controller.admit(lane=lane)
+    if not admitted:
+        metrics.incr('tensor.shed')
+        response = JsonResponse(
+            {'error': 'Service temporairement surchargé, veuillez réessayer.', 'retry_after': retry_after},
+            status=503,
+        )
+        response['Retry-After'] = str(retry_after)
+        return response
+
+    # Chaque image rejoint la file d'inférence partagée, regroupée avec les autres requêtes
+    start = time.perf_counter()
+    futures = [inference_queue.submit(image, deadline=deadline, lane=lane) for image in batch]
+    try:
+        probabilities = np.stack([
+            future.result(timeout=deadline.remaining() if deadline else None) for future in futures
+        ])
+    except TimeoutError as e:
+        return _deadline_exceeded(e)
+    except RuntimeError as e:
+        # Variante impossible à charger dans le pool
+        return _rejected_tensor(TensorRejected(str(e), status=503))
+    metrics.observe('tensor.prediction_seconds', time.perf_counter() - start)
+    metrics.incr('tensor.requests')
+    if use_ensemble:
+        metrics.incr('tensor.ensemble_requests')
+    metrics.incr('tensor.images', len(batch))
+
+    accept = request.headers.get('Accept', '')
+    for content_type in (NPY_CONTENT_TYPE, BINARY_CONTENT_TYPE):
+        if content_type in accept:
+            response = HttpResponse(encode_probabilities(probabilities, content_type), content_type=content_type)
+            response['X-Tensor-Shape'] = ','.join(map(str, probabilities.shape))
+            response['X-Tensor-Dtype'] = 'float32'
+            return response
+    body = {
+        'shape': list(probabilities.shape),
+        'probabilities': np.round(probabilities, 6).tolist(),
+    }
+    not_a_dog = [i for i, row in enumerate(probabilities) if not row.any()]
+    if not_a_dog:
+        body['not_a_dog'] = not_a_dog
+    return JsonResponse(body)
+
+def explanation(request, name):
+    """Carte Grad-CAM (PNG) de l'image envoyée ``name``, calculée en arrière-plan à la demande.
+
+    ``GET`` sert la carte depuis le cache, ou l'état du calcul (202 en cours,
+    404 jamais demandé). ``POST`` planifie le calcul, une passe avant et
+    arrière du modèle, après le contrôle d'admission: rien n'est jamais
+    calculé dans la requête ni sans que l'utilisateur l'ait demandé.
+    """
+    if request.method not in ('GET', 'POST'):
+        return JsonResponse({'error': 'Méthode non autorisée'}, status=405)
+    image_name = f'dog_images/{name}'
+    if not default_storage.exists(image_name):
+        return JsonResponse({'error': 'Image inconnue'}, status=404)
+
+    explanation_name = f'explanations/{name}.png'
+    if default_storage.exists(explanation_name):
+        metrics.incr('explanations.cache_hits')
+        response = FileResponse(default_storage.open(explanation_name, 'rb'), content_type='image/png')
+        response['Cache-Control'] = 'public, max-age=86400, immutable'
+        return response
+    if not runtime.explanations_available():
+        return JsonResponse({'error': 'Explications indisponibles sur ce serveur'}, status=404)
+
+    jobs = runtime.get_explanation_jobs()
+    if request.method == 'POST':
+        admitted, retry_after = runtime.get_admission_controller().admit(lane=BULK)
+        if admitted:
+            status = jobs.submit(name, default_storage.path(image_name), default_storage.path(explanation_name))
+        else:
+            status = BUSY
+    else:
+        status = jobs.status(name)
+        if status is None:
+            return JsonResponse({'error': 'Explication non demandée'}, status=404)
+    if status == FAILED:
+        return JsonResponse({'status': status, 'error': jobs.error(name)}, status=500)
+    if status == BUSY:
+        retry_after = max(retry_after, 5)
+    else:
+        retry_after = 1
+    response = JsonResponse({'status': status, 'retry_after': retry_after}, status=503 if status == BUSY else 202)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+def _may_use_interactive_lane(request):
+    """Sans TENSOR_INTERACTIVE_TOKEN, la voie interactive est réservée aux envois de /upload/"""
+    token = settings.TENSOR_INTERACTIVE_TOKEN
+    return bool(token) and hmac.compare_digest(request.headers.get('X-Priority-Token', ''), token)
+
+def _rejected_tensor(error):
+    metrics.incr('tensor.rejected')
+    return JsonResponse({'error': str(error)}, status=error.status)
+
+def serving_metrics(request):
+    """Vue exposant les métriques de service du processus (admission, file d'inférence...)"""
+    snapshot = metrics.snapshot()
+    cascade_items = snapshot['counters'].get('cascade.items', 0)
+    if cascade_items:
+        snapshot['cascade'] = {
+            'threshold': settings.ML_CASCADE_THRESHOLD,
+            'escalation_rate': snapshot['counters'].get('cascade.escalated', 0) / cascade_items,
+        }
+    inference_queue = runtime.peek_inference_queue()
+    if inference_queue is not None:
+        snapshot['inference_queue'] = inference_queue.stats()
+    inference_queues = runtime.peek_inference_queues()
+    if len(inference_queues) > 1:
+        snapshot['inference_queues'] = {
+            str(resolution): queue.stats() for resolution, queue in sorted(inference_queues.items())
+        }
+    ensemble_queue = runtime.peek_ensemble_queue()
+    if ensemble_queue is not None:
+        snapshot['ensemble_queue'] = ensemble_queue.stats()
+    model_pool = runtime.peek_model_pool()
+    if model_pool is not None:
+        snapshot['model_pool'] = model_pool.stats()
+        snapshot['model_pool']['queues'] = {
+            name: queue.stats() for name, queue in sorted(runtime.peek_variant_queues().items())
+        }
+    return JsonResponse(snapshot)
@@ -162,4 +162,139 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Inference queue (micro-batching of concurrent predictions)
+INFERENCE_MAX_BATCH_SIZE = int(config('INFERENCE_MAX_BATCH_SIZE', default=8))
+INFERENCE_MAX_WAIT_MS = float(config('INFERENCE_MAX_WAIT_MS', default=5))
+# Priority lanes: uploads are `interactive`, /predict/tensor/ is `bulk` unless
+# it asks otherwise. A bulk image waiting longer than this jumps ahead of the
+# interactive lane, so bulk work is never starved
+INFERENCE_MAX_BULK_WAIT_MS = float(config('INFERENCE_MAX_BULK_WAIT_MS', default=2000))
+
+# Health probes (/healthz, /readyz)
+HEALTH_CHECK_CACHE_SECONDS = float(config('HEALTH_CHECK_CACHE_SECONDS', default=5))
+HEALTH_CHECK_DB_TIMEOUT = float(config('HEALTH_CHECK_DB_TIMEOUT', default=1))
+HEALTH_CHECK_MAX_QUEUE_DEPTH = int(config('HEALTH_CHECK_MAX_QUEUE_DEPTH', default=64))
+
+# Pretrained weights store (filled at build time by `manage.py fetch_weights`)
+ML_WEIGHTS_DIR = config('ML_WEIGHTS_DIR', default=str(BASE_DIR / 'ml_models' / 'weights'))
+ML_WEIGHTS_OFFLINE = config('ML_WEIGHTS_OFFLINE', default=False, cast=bool)
+
+# When the classifier is built:
+#   lazy    - on the first /readyz probe or prediction (default for runserver and commands)
+#   worker  - by every gunicorn worker right after fork
+#   preload - weight files verified and mapped once in the gunicorn master,
+#             model built by every worker right after fork
+ML_MODEL_LOADING = config('ML_MODEL_LOADING', default='lazy')
+
+# Optional inference server (`manage.py run_inference_server`): when set, web
+# workers never build the model and send batches over this Unix socket instead
+INFERENCE_SOCKET = config('INFERENCE_SOCKET', default='')
+INFERENCE_SERVER_MAX_BATCH_SIZE = int(config('INFERENCE_SERVER_MAX_BATCH_SIZE', default=16))
+INFERENCE_CLIENT_POOL_SIZE = int(config('INFERENCE_CLIENT_POOL_SIZE', default=4))
+INFERENCE_CLIENT_TIMEOUT = float(config('INFERENCE_CLIENT_TIMEOUT', default=30))
+
+# Admission control on uploads: answer 503 + Retry-After when the predicted
+# wait in the inference queue exceeds the budget (0 disables the depth cap)
+ADMISSION_WAIT_BUDGET_SECONDS = float(config('ADMISSION_WAIT_BUDGET_SECONDS', default=2.0))
+ADMISSION_MAX_QUEUE_DEPTH = int(config('ADMISSION_MAX_QUEUE_DEPTH', default=32))
+
+# Upload limits, checked on the image header before anything is decoded
+UPLOAD_MAX_BYTES = int(config('UPLOAD_MAX_BYTES', default=10 * 1024 * 1024))
+UPLOAD_MAX_PIXELS = int(config('UPLOAD_MAX_PIXELS', default=64_000_000))
+UPLOAD_ALLOWED_FORMATS = tuple(
+    name.strip().upper() for name in str(config('UPLOAD_ALLOWED_FORMATS', default='JPEG,PNG,WEBP,GIF')).split(',')
+)
+# Decode budget: pixels actually produced when decoding an image for the model
+ML_MAX_DECODE_PIXELS = int(config('ML_MAX_DECODE_PIXELS', default=24_000_000))
+
+# Raw tensor endpoint (/predict/tensor/): maximum images per request
+TENSOR_MAX_IMAGES = int(config('TENSOR_MAX_IMAGES', default=32))
+# Shared secret (X-Priority-Token header) required to send tensor requests to
+# the interactive lane with ?priority=interactive; empty keeps it for uploads
+TENSOR_INTERACTIVE_TOKEN = config('TENSOR_INTERACTIVE_TOKEN', default='')
+
+# Animated uploads (GIF, WebP, APNG): frames sampled per prediction
+ML_MAX_FRAMES = int(config('ML_MAX_FRAMES', default=8))
+
+# `manage.py serve`: expected memory of one worker holding the model, used to
+# cap the number of workers under a cgroup memory limit
+SERVE_WORKER_MEMORY_MB = int(config('SERVE_WORKER_MEMORY_MB', default=700))
+
+# Time budget of one prediction request, carried through the serving stack:
+# fewer animation frames when short on time, 503 when it cannot be met (0 disables)
+PREDICTION_DEADLINE_SECONDS = float(config('PREDICTION_DEADLINE_SECONDS', default=5.0))
+
+# Release the model after this many idle seconds (0 keeps it loaded). It is
+# saved at each unload to a per-process file derived from ML_MODEL_ARTIFACT
+# (serving_model.<pid>.keras) and reloaded from it on the next prediction
+ML_IDLE_UNLOAD_SECONDS = float(config('ML_IDLE_UNLOAD_SECONDS', default=0))
+ML_MODEL_ARTIFACT = config('ML_MODEL_ARTIFACT', default=str(BASE_DIR / 'ml_models' / 'weights' / 'serving_model.keras'))
+
+# Cascade: MobileNetV2 answers alone when its top-1 confidence reaches this
+# threshold, otherwise ResNet50 decides (0 disables; tune with
+# scripts/tune_cascade_threshold.py)
+ML_CASCADE_THRESHOLD = float(config('ML_CASCADE_THRESHOLD', default=0))
+# Trained MobileNetV2 breed model used by the cascade and by the mobilenet_v2
+# ensemble member (scripts/train_fast_model.py); required by both
+ML_FAST_MODEL_PATH = config('ML_FAST_MODEL_PATH', default='')
+
+# Not-a-dog gate: images whose ImageNet dog-class probability (MobileNetV2)
+# is below this threshold skip the breed head (0 disables)
+ML_DOG_GATE_THRESHOLD = float(config('ML_DOG_GATE_THRESHOLD', default=0))
+
+# Served input resolutions (square side in pixels). Each one gets its own
+# compiled model signature and its own batching queue; uploads and tensor
+# requests pick one, and uploads fall back to the smallest under deadline pressure
+ML_DEFAULT_RESOLUTION = int(config('ML_DEFAULT_RESOLUTION', default=224))
+ML_RESOLUTIONS = tuple(sorted(
+    {int(value) for value in str(config('ML_RESOLUTIONS', default='224')).split(',') if value.strip()}
+    | {ML_DEFAULT_RESOLUTION}
+))
+
+# Ensemble for the premium tier (/predict/tensor/?model=ensemble): members run
+# concurrently on the same batch and their probabilities are averaged. Each
+# entry is `resnet50`, `mobilenet_v2` (local backbones) or `name=/path/to.sock`
+# (a `manage.py run_inference_server` process); empty disables the ensemble
+ML_ENSEMBLE_MEMBERS = tuple(
+    entry.strip() for entry in str(config('ML_ENSEMBLE_MEMBERS', default='')).split(',') if entry.strip()
+)
+
+# Worker recycling: a gunicorn worker whose resident memory exceeds this many
+# MB finishes its in-flight requests, exits and is replaced by the master
+# (0 disables). Works alongside GUNICORN_MAX_REQUESTS (see gunicorn.conf.py)
+WORKER_MAX_RSS_MB = int(config('WORKER_MAX_RSS_MB', default=0))
+WORKER_RSS_CHECK_SECONDS = float(config('WORKER_RSS_CHECK_SECONDS', default=10))
+
+# Write-behind of UploadedImage records: the upload response is rendered as
+# soon as inference finishes and records are written with bulk_create once
+# UPLOAD_WRITE_BATCH_SIZE are pending or after UPLOAD_WRITE_MAX_DELAY_SECONDS.
+# Past UPLOAD_WRITE_MAX_PENDING the request writes the buffer itself.
+# UPLOAD_FLUSH_ON_SHUTDOWN writes what is left when a worker exits; set
+# UPLOAD_WRITE_BEHIND=False to save every record before responding
+UPLOAD_WRITE_BEHIND = config('UPLOAD_WRITE_BEHIND', default=True, cast=bool)
+UPLOAD_WRITE_BATCH_SIZE = int(config('UPLOAD_WRITE_BATCH_SIZE', default=50))
+UPLOAD_WRITE_MAX_DELAY_SECONDS = float(config('UPLOAD_WRITE_MAX_DELAY_SECONDS', default=1.0))
+UPLOAD_WRITE_MAX_PENDING = int(config('UPLOAD_WRITE_MAX_PENDING', default=1000))
+UPLOAD_FLUSH_ON_SHUTDOWN = config('UPLOAD_FLUSH_ON_SHUTDOWN', default=True, cast=bool)
+
+# Grad-CAM explanations (/explanation/<image>/): computed in a background
+# pool, stored as PNG overlays under MEDIA_ROOT/explanations and served from
+# there afterwards. Computation starts only when the user asks for it (POST)
+# and goes through admission control. Requests beyond EXPLANATION_MAX_PENDING
+# get a 503; a failure is reported for EXPLANATION_FAILURE_TTL_SECONDS, then
+# may be retried
+EXPLANATION_WORKERS = int(config('EXPLANATION_WORKERS', default=1))
+EXPLANATION_MAX_PENDING = int(config('EXPLANATION_MAX_PENDING', default=32))
+EXPLANATION_FAILURE_TTL_SECONDS = float(config('EXPLANATION_FAILURE_TTL_SECONDS', default=60))
+
+# Model variants selectable per request (/predict/tensor/?model=<name>), as
+# `name=/path/to/model.keras` entries. They are loaded on demand into a pool
+# that keeps at most ML_MODEL_POOL_BUDGET_MB of weights resident and frees the
+# least recently used variant first
+ML_MODEL_VARIANTS = dict(
+    entry.strip().split('=', 1)
+    for entry in str(config('ML_MODEL_VARIANTS', default='')).split(',') if '=' in entry
+)
+ML_MODEL_POOL_BUDGET_MB = int(config('ML_MODEL_POOL_BUDGET_MB', default=1024))
@@ -13,4 +13,12 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# En mode préchargement, les fichiers de poids sont préparés ici, dans le processus maître de gunicorn
+from django.conf import settings  # noqa: E402
+
+if settings.ML_MODEL_LOADING == 'preload':
+    from classifier import runtime
+
+    runtime.preload()
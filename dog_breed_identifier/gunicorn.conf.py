@@ -0,0 +1,93 @@
+"""
+Configuration gunicorn du projet.
+
+``ML_MODEL_LOADING`` choisit quand le classifieur est construit:
+
+- ``worker`` (par défaut): chaque worker construit son propre modèle après le fork.
+- ``preload``: le maître importe l'application et prépare les fichiers de
+  poids (vérifiés et projetés en mémoire), sans construire le modèle: aucune
+  opération TensorFlow avant le fork. Chaque worker construit ensuite son
+  modèle en lisant ces pages partagées. ``gc.freeze()`` est appelé juste avant
+  chaque fork pour que le ramasse-miettes des workers ne modifie pas les objets
+  hérités, qui restent ainsi partagés en copie sur écriture.
+- ``lazy``: chargement à la première sonde /readyz ou prédiction.
+
+Un worker est recyclé (fin des requêtes en cours, puis sortie et
+remplacement par le maître) après ``GUNICORN_MAX_REQUESTS`` requêtes, ou dès
+que sa mémoire résidente dépasse ``WORKER_MAX_RSS_MB``. La raison de chaque
+recyclage est écrite dans les logs.
+"""
+
+import gc
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+os.environ.setdefault('ML_MODEL_LOADING', 'worker')
+model_loading = os.environ['ML_MODEL_LOADING']
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+preload_app = model_loading == 'preload'
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+
+if preload_app:
+    # Éviter les « trous » dans les pages mémoire du maître pendant le chargement
+    gc.disable()
+
+
+def when_ready(server):
+    if preload_app:
+        # Le maître a fini de charger l'application: il reprend le ramasse-miettes
+        gc.enable()
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    if preload_app:
+        gc.enable()
+    if model_loading in ('worker', 'preload'):
+        # Construction (mode worker) et préchauffage en arrière-plan; /readyz reste à 503 d'ici là
+        from classifier import runtime
+
+        runtime.start_warmup()
+    start_memory_watchdog(worker)
+
+
+def start_memory_watchdog(worker):
+    from django.conf import settings
+
+    if settings.WORKER_MAX_RSS_MB <= 0:
+        return
+    from ml_models.memory_watchdog import MemoryWatchdog
+
+    def recycle(reason):
+        # Comme max_requests: le worker finit ses requêtes en cours puis sort
+        worker.recycle_reason = reason
+        worker.alive = False
+
+    worker.memory_watchdog = MemoryWatchdog(
+        settings.WORKER_MAX_RSS_MB * 2 ** 20,
+        recycle,
+        check_interval=settings.WORKER_RSS_CHECK_SECONDS,
+    )
+    worker.memory_watchdog.start()
+
+
+def worker_exit(server, worker):
+    from django.conf import settings
+
+    if settings.UPLOAD_FLUSH_ON_SHUTDOWN:
+        # Les enregistrements d'envoi encore dans le tampon d'écriture différée
+        from classifier import runtime
+
+        runtime.flush_uploads()
+    reason = getattr(worker, 'recycle_reason', None)
+    if reason is None and worker.max_requests and worker.nr >= worker.max_requests:
+        reason = f"{worker.nr} requêtes servies (max_requests)"
+    if reason is not None:
+        server.log.info(f"Worker {worker.pid} recyclé: {reason}")
@@ -0,0 +1,45 @@
+import math
+
+
+class AdmissionController:
+    """Contrôle d'admission devant la file d'inférence.
+
+    L'attente prévue pour une nouvelle requête est estimée à partir de la
+    profondeur de la file et de la durée récente (moyenne mobile) d'un lot:
+    ``ceil((profondeur + 1) / taille_max_lot) * durée_lot``. Au-delà du budget
+    (ou de la profondeur maximale), la requête est refusée immédiatement
+    avec un délai de nouvelle tentative, au lieu d'attendre indéfiniment.
+    Avec une voie de priorité (``lane``), seules comptent les images servies
+    avant elle.
+    """
+
+    def __init__(self, inference_queue, wait_budget_seconds=2.0, max_queue_depth=None):
+        self.inference_queue = inference_queue
+        self.wait_budget_seconds = wait_budget_seconds
+        self.max_queue_depth = max_queue_depth
+
+    def _depth(self, lane):
+        if lane is None:
+            return self.inference_queue.depth()
+        return self.inference_queue.depth(lane)
+
+    def predicted_wait(self, depth=None, lane=None):
+        """Attente estimée (secondes) avant qu'une nouvelle image soit servie"""
+        if depth is None:
+            depth = self._depth(lane)
+        batch_seconds = self.inference_queue.ewma_batch_seconds
+        if not batch_seconds:
+            return 0.0  # Aucune mesure récente: on admet
+        batches_ahead = math.ceil((depth + 1) / self.inference_queue.max_batch_size)
+        return batches_ahead * batch_seconds
+
+    def admit(self, lane=None):
+        """Renvoie (admis, délai de nouvelle tentative en secondes)"""
+        depth = self._depth(lane)
+        wait = self.predicted_wait(depth)
+        over_depth = self.max_queue_depth is not None and depth >= self.max_queue_depth
+        if wait <= self.wait_budget_seconds and not over_depth:
+            return True, 0
+        # Le temps nécessaire pour que la file redescende sous le budget
+        retry_after = max(1, math.ceil(wait - self.wait_budget_seconds))
+        return False, retry_after
@@ -0,0 +1,62 @@
+"""
+Réglage hors ligne du seuil de la cascade MobileNetV2 -> ResNet50.
+
+Le modèle rapide répond seul quand sa confiance top-1 atteint le seuil;
+sinon l'image est reclassée par le modèle précis. Ces fonctions rejouent la
+cascade sur des probabilités déjà calculées pour un jeu de validation.
+"""
+
+import os
+
+import numpy as np
+
+DEFAULT_THRESHOLDS = tuple(round(t, 2) for t in np.arange(0.30, 1.00, 0.05))
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def load_labelled_images(data_dir, breeds):
+    """Liste (chemin, indice de race) des images rangées un dossier par race (``Labrador_Retriever/photo.jpg``)"""
+    index = {breed: i for i, breed in enumerate(breeds)}
+    samples = []
+    for folder in sorted(os.listdir(data_dir)):
+        label = index.get(folder.replace('_', ' '))
+        folder_path = os.path.join(data_dir, folder)
+        if label is None or not os.path.isdir(folder_path):
+            continue
+        for name in sorted(os.listdir(folder_path)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                samples.append((os.path.join(folder_path, name), label))
+    return samples
+
+
+def cascade_outcome(fast_probabilities, accurate_probabilities, labels, threshold):
+    """Précision et taux d'escalade de la cascade pour un seuil donné"""
+    fast_probabilities = np.asarray(fast_probabilities)
+    accurate_probabilities = np.asarray(accurate_probabilities)
+    labels = np.asarray(labels)
+
+    escalate = fast_probabilities.max(axis=1) < threshold
+    predicted = np.where(escalate, accurate_probabilities.argmax(axis=1), fast_probabilities.argmax(axis=1))
+    return {
+        'threshold': float(threshold),
+        'accuracy': float((predicted == labels).mean()),
+        'escalation_rate': float(escalate.mean()),
+    }
+
+
+def tune_threshold(fast_probabilities, accurate_probabilities, labels, max_accuracy_drop=0.01,
+                   thresholds=DEFAULT_THRESHOLDS):
+    """Seuil le plus bas dont la précision reste à ``max_accuracy_drop`` de ResNet50 seul.
+
+    Le seuil le plus bas est celui qui escalade le moins. Renvoie le seuil
+    retenu (None si aucun ne convient), la précision de référence et le
+    tableau complet des seuils essayés.
+    """
+    reference = float((np.asarray(accurate_probabilities).argmax(axis=1) == np.asarray(labels)).mean())
+    table = [cascade_outcome(fast_probabilities, accurate_probabilities, labels, t) for t in sorted(thresholds)]
+    eligible = [row for row in table if row['accuracy'] >= reference - max_accuracy_drop]
+    return {
+        'threshold': eligible[0]['threshold'] if eligible else None,
+        'reference_accuracy': reference,
+        'table': table,
+    }
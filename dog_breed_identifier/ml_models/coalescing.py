@@ -0,0 +1,39 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Regroupe les appels identiques simultanés (« single flight »).
+
+    Tant qu'un calcul est en cours pour une clé, les appels suivants avec la
+    même clé attendent le même ``Future`` au lieu de relancer le calcul.
+    La clé est retirée dès que le calcul se termine: il n'y a pas de cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def do(self, key, fn):
+        """Exécute ``fn`` (ou attend l'exécution en cours) et renvoie (résultat, partagé)"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if leader:
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    del self._in_flight[key]
+
+        return future.result(), not leader
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._in_flight)
@@ -1,8 +1,6 @@
+import importlib.util
 import os
-import requests
-from PIL import Image
 from io import BytesIO
-import numpy as np
 import logging
 
 # Configuration du logging
@@ -17,14 +15,12 @@ class DataAugmenter:
         self.datagen = None
         
     def _check_tensorflow(self):
-        """Vérifie si TensorFlow est disponible"""
-        try:
-            import tensorflow as tf
+        """Vérifie si TensorFlow est disponible (sans l'importer)"""
+        if importlib.util.find_spec('tensorflow') is not None:
             logger.info("TensorFlow trouvé")
             return True
-        except ImportError:
-            logger.warning("TensorFlow non trouvé - certaines fonctionnalités seront désactivées")
-            return False
+        logger.warning("TensorFlow non trouvé - certaines fonctionnalités seront désactivées")
+        return False
     
     def augment_images(self, image_path, save_dir, num_augmented=5):
         """Augmente les images existantes"""
@@ -40,6 +36,9 @@ class DataAugmenter:
             
     def download_breed_images(self, breed_name, num_images=10):
         """Télécharge des images pour une race spécifique"""
+        import requests
+        from PIL import Image
+
         try:
             # Créer le dossier pour la race
             breed_dir = os.path.join(self.data_dir, breed_name)
@@ -0,0 +1,33 @@
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Plus assez de temps pour servir la prédiction avant l'échéance"""
+
+
+class Deadline:
+    """Échéance d'une requête, transmise à chaque étape du service.
+
+    Chaque étape consulte le temps restant pour choisir un chemin moins
+    coûteux, ou abandonner tôt plutôt que de calculer un résultat que le
+    client n'attendra plus.
+    """
+
+    def __init__(self, expires_at, clock=time.monotonic):
+        self.expires_at = expires_at
+        self.clock = clock
+
+    @classmethod
+    def after(cls, seconds, clock=time.monotonic):
+        return cls(clock() + seconds, clock)
+
+    def remaining(self):
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self):
+        return self.clock() >= self.expires_at
+
+    def check(self, needed=0.0):
+        """Lève DeadlineExceeded s'il reste moins de ``needed`` secondes"""
+        if self.remaining() < needed or self.expired():
+            raise DeadlineExceeded(f"Échéance dépassée ({needed:.3f} s nécessaires, {self.remaining():.3f} s restantes)")
@@ -1,30 +1,73 @@
+import ctypes
+import gc
+import importlib.util
+import json
 import logging
 import numpy as np
 from typing import Optional, Any
 import os
+import time
+
+from .image_guard import ImageRejected
+from .metrics import metrics
+from .weight_store import WeightStore
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Classes ImageNet des chiens (de 151 « Chihuahua » à 268 « Mexican hairless »)
+IMAGENET_DOG_CLASSES = slice(151, 269)
+
+# Moyenne ImageNet (BGR) soustraite par la normalisation ResNet50 (mode « caffe »)
+RESNET_MEAN_BGR = (103.939, 116.779, 123.68)
+
+def read_model_metadata(filepath):
+    """Forme d'entrée et races d'un modèle sauvegardé (``<modèle>.json``, écrit par save_model), ou {}"""
+    try:
+        with open(filepath + '.json') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def sample_frame_indices(n_frames, max_frames):
+    """Indices de ``max_frames`` images au plus, réparties régulièrement sur l'animation"""
+    if n_frames <= max_frames:
+        return list(range(n_frames))
+    return sorted({round(i * (n_frames - 1) / (max_frames - 1)) for i in range(max_frames)}) if max_frames > 1 else [0]
+
+
 class EnhancedDogBreedClassifier:
-    def __init__(self, input_shape=(224, 224, 3), num_classes=30):
+    def __init__(self, input_shape=(224, 224, 3), num_classes=30, weights_dir=None, allow_weight_download=True,
+                 max_decode_pixels=None, cascade_threshold=None, dog_gate_threshold=None, resolutions=None):
         self.input_shape = input_shape
+        # Résolutions servies (côté de l'image carrée); ``input_shape`` est la résolution par défaut
+        self.resolutions = tuple(sorted(set(resolutions or ()) | {input_shape[0]}))
+        self._serving_functions = {}
+        self._grad_cam_models = {}
         self.num_classes = num_classes
+        self.max_decode_pixels = max_decode_pixels
+        # Cascade: le modèle rapide répond seul au-delà de ce seuil de confiance top-1
+        self.cascade_threshold = cascade_threshold
+        self.fast_model = None
+        # Filtre « est-ce un chien ? »: probabilité ImageNet cumulée des classes de chiens
+        self.dog_gate_threshold = dog_gate_threshold
+        self.gate_model = None
+        self.weight_store = WeightStore(weights_dir)
+        self.allow_weight_download = allow_weight_download
         self.model = None
         self.history = None
+        self.is_warmed = False
         self.is_tensorflow_available = self._check_tensorflow()
         self.breeds = self._load_breeds()
         
     def _check_tensorflow(self):
-        """Vérifie si TensorFlow est disponible"""
-        try:
-            import tensorflow as tf
+        """Vérifie si TensorFlow est disponible (sans l'importer)"""
+        if importlib.util.find_spec('tensorflow') is not None:
             logger.info("TensorFlow trouvé")
             return True
-        except ImportError:
-            logger.warning("TensorFlow non trouvé - certaines fonctionnalités seront désactivées")
-            return False
+        logger.warning("TensorFlow non trouvé - certaines fonctionnalités seront désactivées")
+        return False
     
     def _load_breeds(self):
         """Charge la liste étendue des races de chiens"""
@@ -86,10 +129,20 @@ class EnhancedDogBreedClassifier:
                 logger.error("ResNet50 non disponible dans applications")
                 return None
                 
+            # Poids ImageNet lus depuis le stockage local (vérifié par empreinte)
+            weights_path = self.weight_store.resolve('resnet50_notop', allow_download=self.allow_weight_download)
+            if weights_path is None:
+                logger.error("Poids ImageNet de ResNet50 indisponibles")
+                return None
+
+            # Plusieurs résolutions: dimensions spatiales libres, une signature compilée par résolution
+            base_input_shape = self.input_shape
+            if len(self.resolutions) > 1:
+                base_input_shape = (None, None, self.input_shape[2])
             base_model = ResNet50(
-                weights='imagenet',
+                weights=weights_path,
                 include_top=False,
-                input_shape=self.input_shape
+                input_shape=base_input_shape
             )
             
             # Geler les couches du modèle de base
@@ -138,6 +191,7 @@ class EnhancedDogBreedClassifier:
             # Créer le modèle séquentiel
             if Sequential is not None:
                 self.model = Sequential()
+                self.is_warmed = False
             else:
                 logger.error("Sequential non disponible")
                 return None
@@ -172,6 +226,127 @@ class EnhancedDogBreedClassifier:
             logger.error(f"Erreur lors de la construction du modèle: {e}")
             return None
     
+    def build_fast_model(self):
+        """Construit le modèle rapide (MobileNetV2 + tête des races), à entraîner par ``train_fast_model``.
+
+        La tête des races est initialisée au hasard: le service charge un modèle
+        rapide entraîné (``load_fast_model``), jamais celui-ci tel quel.
+        """
+        if not self.is_tensorflow_available:
+            logger.warning("TensorFlow non disponible - pas de modèle rapide")
+            return None
+
+        try:
+            import tensorflow as tf
+            keras = tf.keras
+
+            weights_path = self.weight_store.resolve('mobilenet_v2_notop', allow_download=self.allow_weight_download)
+            if weights_path is None:
+                logger.error("Poids ImageNet de MobileNetV2 indisponibles")
+                return None
+
+            base_model = keras.applications.MobileNetV2(
+                weights=weights_path,
+                include_top=False,
+                input_shape=self.input_shape
+            )
+            base_model.trainable = False
+
+            self.fast_model = keras.models.Sequential([
+                base_model,
+                keras.layers.GlobalAveragePooling2D(),
+                keras.layers.Dropout(0.2),
+                keras.layers.Dense(self.num_classes, activation='softmax'),
+            ])
+            self.fast_model.compile(
+                optimizer=keras.optimizers.Adam(learning_rate=0.001),
+                loss='categorical_crossentropy',
+                metrics=['accuracy']
+            )
+            self.is_warmed = False
+            logger.info("Modèle rapide (MobileNetV2) construit avec succès")
+            return self.fast_model
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la construction du modèle rapide: {e}")
+            return None
+
+    def train_fast_model(self, images, labels, epochs=20, batch_size=32, validation_split=0.2):
+        """Entraîne la tête des races du modèle rapide (images uint8 N x H x W x 3, indices de race)"""
+        if not self.is_tensorflow_available:
+            logger.warning("TensorFlow non disponible - pas d'entraînement du modèle rapide")
+            return None
+        if self.fast_model is None and self.build_fast_model() is None:
+            return None
+        import tensorflow as tf
+
+        # Même normalisation que predict_fast
+        inputs = np.asarray(images).astype(np.float32) / 127.5 - 1.0
+        targets = tf.keras.utils.to_categorical(labels, self.num_classes)
+        early_stopping = tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=5, restore_best_weights=True)
+        history = self.fast_model.fit(
+            inputs, targets,
+            epochs=epochs,
+            batch_size=batch_size,
+            validation_split=validation_split,
+            shuffle=True,
+            callbacks=[early_stopping],
+        )
+        logger.info("Modèle rapide entraîné")
+        return history
+
+    def save_fast_model(self, filepath):
+        """Sauvegarde le modèle rapide entraîné (chargé par ``load_fast_model``)"""
+        if not self.is_tensorflow_available or self.fast_model is None:
+            logger.warning("Modèle rapide non disponible pour la sauvegarde")
+            return False
+        self.fast_model.save(filepath)
+        logger.info(f"Modèle rapide sauvegardé dans {filepath}")
+        return True
+
+    def load_fast_model(self, filepath):
+        """Charge le modèle rapide entraîné de la cascade et de l'ensemble"""
+        if not self.is_tensorflow_available:
+            # Comme load_model: seul le fichier de simulation compte
+            return os.path.exists(filepath + ".sim")
+        try:
+            import tensorflow as tf
+
+            self.fast_model = tf.keras.models.load_model(filepath)
+            self.is_warmed = False
+            logger.info(f"Modèle rapide chargé depuis {filepath}")
+            return True
+        except Exception as e:
+            logger.error(f"Erreur lors du chargement du modèle rapide: {e}")
+            return False
+
+    def build_gate_model(self):
+        """Construit le filtre « est-ce un chien ? » (MobileNetV2 ImageNet complet, 1000 classes)"""
+        if not self.is_tensorflow_available:
+            logger.warning("TensorFlow non disponible - pas de filtre chien")
+            return None
+
+        try:
+            import tensorflow as tf
+
+            weights_path = self.weight_store.resolve('mobilenet_v2', allow_download=self.allow_weight_download)
+            if weights_path is None:
+                logger.error("Poids ImageNet complets de MobileNetV2 indisponibles")
+                return None
+
+            self.gate_model = tf.keras.applications.MobileNetV2(
+                weights=weights_path,
+                include_top=True,
+                input_shape=self.input_shape
+            )
+            self.is_warmed = False
+            logger.info("Filtre chien (MobileNetV2 ImageNet) construit avec succès")
+            return self.gate_model
+
+        except Exception as e:
+            logger.error(f"Erreur lors de la construction du filtre chien: {e}")
+            return None
+
     def train_model(self, train_data, validation_data, epochs=50):
         """Entraîne le modèle avec des callbacks"""
         if not self.is_tensorflow_available or self.model is None:
@@ -365,8 +540,387 @@ class EnhancedDogBreedClassifier:
             logger.error(f"Erreur lors de la prédiction: {e}")
             return None
     
-    def save_model(self, filepath):
-        """Sauvegarde le modèle"""
+    def target_size(self, resolution=None):
+        """Taille (largeur, hauteur) des images prétraitées pour ``resolution``"""
+        if resolution is None or resolution == self.input_shape[0]:
+            return self.input_shape[1], self.input_shape[0]
+        if resolution not in self.resolutions:
+            raise ValueError(f"Résolution non servie: {resolution} (disponibles: {self.resolutions})")
+        return resolution, resolution
+
+    def draft_scale(self, image_format, size, resolution=None):
+        """Facteur de réduction appliqué au décodage (1, 2, 4 ou 8).
+
+        Le décodeur JPEG sait produire directement l'image à 1/2, 1/4 ou 1/8
+        de sa taille (``Image.draft``); on prend la plus forte réduction qui
+        reste au moins aussi grande que l'entrée du modèle. Les autres formats
+        sont décodés en entier.
+        """
+        if image_format != 'JPEG':
+            return 1
+        width, height = self.target_size(resolution)
+        scale = min(size[0] // width, size[1] // height)
+        for factor in (8, 4, 2):
+            if scale >= factor:
+                return factor
+        return 1
+
+    def decode_pixels(self, image_format, size, resolution=None):
+        """Nombre de pixels que le décodage de l'image produira, d'après son en-tête"""
+        factor = self.draft_scale(image_format, size, resolution)
+        return -(-size[0] // factor) * -(-size[1] // factor)
+
+    def check_decode_budget(self, image_format, size, resolution=None):
+        """Lève ImageRejected (413) si le décodage dépasse ``max_decode_pixels``"""
+        if self.max_decode_pixels and self.decode_pixels(image_format, size, resolution) > self.max_decode_pixels:
+            raise ImageRejected(
+                f"Image trop coûteuse à décoder ({size[0]}x{size[1]}, maximum {self.max_decode_pixels} pixels)",
+                status=413,
+            )
+
+    def preprocess_image(self, image_path, resolution=None):
+        """Charge une image et la redimensionne à la taille d'entrée du modèle (uint8 HxWx3)"""
+        from PIL import Image
+
+        width, height = self.target_size(resolution)
+        with Image.open(image_path) as img:
+            # L'en-tête est déjà lu: vérifier le budget avant de décoder les pixels
+            self.check_decode_budget(img.format, img.size, resolution)
+            if img.format == 'JPEG':
+                # Décodage JPEG directement à l'échelle 1/2, 1/4 ou 1/8
+                img.draft('RGB', (width, height))
+            # reducing_gap: réduction entière rapide (Image.reduce) avant le rééchantillonnage final
+            img = img.convert('RGB').resize((width, height), reducing_gap=2.0)
+            return np.asarray(img, dtype=np.uint8)
+
+    def preprocess_frames(self, image_path, max_frames=8, resolution=None):
+        """Prétraite jusqu'à ``max_frames`` images d'une animation (GIF, WebP, APNG).
+
+        Les images sont choisies à intervalles réguliers. Atteindre l'image i
+        d'un GIF oblige à décoder toutes les précédentes: l'échantillonnage est
+        donc limité au début de l'animation qui tient dans ``max_decode_pixels``.
+        Renvoie un tableau uint8 K x H x W x 3 (K = 1 pour une image fixe).
+        """
+        from PIL import Image
+
+        width, height = self.target_size(resolution)
+        with Image.open(image_path) as img:
+            n_frames = getattr(img, 'n_frames', 1)
+            if n_frames <= 1:
+                return self.preprocess_image(image_path, resolution)[np.newaxis]
+
+            self.check_decode_budget(img.format, img.size, resolution)
+            span = n_frames
+            if self.max_decode_pixels:
+                span = min(n_frames, max(1, self.max_decode_pixels // self.decode_pixels(img.format, img.size)))
+
+            frames = []
+            for index in sample_frame_indices(span, max_frames):
+                img.seek(index)
+                frames.append(np.asarray(img.convert('RGB').resize((width, height), reducing_gap=2.0), dtype=np.uint8))
+            return np.stack(frames)
+
+    def frame_count(self, image_path):
+        """Nombre d'images de l'animation (1 pour une image fixe)"""
+        from PIL import Image
+
+        with Image.open(image_path) as img:
+            return getattr(img, 'n_frames', 1)
+
+    def predict_batch(self, batch):
+        """Prédit les probabilités pour un lot d'images prétraitées (N x H x W x 3, uint8).
+
+        Avec le filtre chien, les images qui ne sont pas des chiens ne passent
+        pas par la tête des races: leur ligne de probabilités est nulle.
+        """
+        batch = np.asarray(batch)
+        uses_cascade = self.fast_model is not None and self.cascade_threshold and self.model is not None
+        # Le filtre chien et le modèle rapide ont une entrée fixe: ils voient l'image à la résolution par défaut
+        default_batch = self.at_default_resolution(batch) if self.uses_gate or uses_cascade else batch
+        is_dog = self.dog_mask(default_batch)
+        if is_dog is not None:
+            probabilities = np.zeros((len(batch), self.num_classes), dtype=np.float32)
+            if is_dog.any():
+                probabilities[is_dog] = self._predict_breeds(batch[is_dog], default_batch[is_dog])
+            return probabilities
+        return self._predict_breeds(batch, default_batch)
+
+    @property
+    def uses_gate(self):
+        return bool(self.gate_model is not None and self.dog_gate_threshold and self.model is not None)
+
+    def dog_mask(self, batch):
+        """Images que le filtre chien laisse passer vers la tête des races (None sans filtre)"""
+        if not self.uses_gate:
+            return None
+        is_dog = self.dog_scores(self.at_default_resolution(batch)) >= self.dog_gate_threshold
+        metrics.incr('gate.items', len(batch))
+        metrics.incr('gate.rejected', int((~is_dog).sum()))
+        return is_dog
+
+    def _predict_breeds(self, batch, default_batch):
+        if self.fast_model is not None and self.cascade_threshold and self.model is not None:
+            return self.predict_cascade(batch, default_batch)
+        return self.predict_accurate(batch)
+
+    def at_default_resolution(self, batch):
+        """Lot redimensionné (bicubique) à la résolution par défaut, inchangé s'il y est déjà"""
+        from PIL import Image
+
+        batch = np.asarray(batch)
+        width, height = self.target_size()
+        if batch.shape[1:3] == (height, width):
+            return batch
+        return np.stack([
+            np.asarray(Image.fromarray(image).resize((width, height), Image.BICUBIC), dtype=np.uint8)
+            for image in batch
+        ])
+
+    def dog_scores(self, batch):
+        """Probabilité ImageNet cumulée des classes de chiens, par image"""
+        start = time.perf_counter()
+        inputs = np.asarray(batch).astype(np.float32) / 127.5 - 1.0
+        probabilities = np.asarray(self.gate_model(inputs, training=False))
+        metrics.observe('gate.seconds', time.perf_counter() - start)
+        return probabilities[:, IMAGENET_DOG_CLASSES].sum(axis=1)
+
+    def predict_accurate(self, batch):
+        """Probabilités du modèle ResNet50"""
+        batch = np.asarray(batch)
+        if not self.is_tensorflow_available or self.model is None:
+            # Mode simulation: probabilités aléatoires normalisées par image
+            probabilities = np.random.rand(len(batch), len(self.breeds)).astype(np.float32)
+            return probabilities / probabilities.sum(axis=1, keepdims=True)
+
+        inputs = self._resnet_inputs(batch)
+        if len(self.resolutions) > 1:
+            return np.asarray(self.serving_function(inputs.shape[1])(inputs))
+        return np.asarray(self.model(inputs, training=False))
+
+    @staticmethod
+    def _resnet_inputs(batch):
+        # Normalisation ResNet50 (mode "caffe"): RGB -> BGR puis soustraction de la moyenne ImageNet
+        return np.asarray(batch)[..., ::-1].astype(np.float32) - np.array(RESNET_MEAN_BGR, dtype=np.float32)
+
+    def grad_cam(self, image, class_index=None, layer_name='conv5_block3_out'):
+        """Carte Grad-CAM d'une image uint8 H x W x 3 pour ``class_index`` (race prédite par défaut).
+
+        Renvoie (carte h x w dans [0, 1] à la résolution de ``layer_name``,
+        indice de la race expliquée), ou None sans modèle TensorFlow.
+        """
+        if not self.is_tensorflow_available or self.model is None:
+            return None
+        import tensorflow as tf
+
+        head = self.model.layers[1:]
+        features_model = self._grad_cam_model(layer_name)
+        inputs = tf.convert_to_tensor(self._resnet_inputs(np.asarray(image)[np.newaxis]))
+        with tf.GradientTape() as tape:
+            activations, outputs = features_model(inputs, training=False)
+            for layer in head:
+                outputs = layer(outputs, training=False)
+            if class_index is None:
+                class_index = int(tf.argmax(outputs[0]))
+            score = outputs[:, class_index]
+        gradients = tape.gradient(score, activations)
+
+        # Poids de chaque canal: gradient moyen sur l'espace; seules les contributions positives comptent
+        weights = tf.reduce_mean(gradients, axis=(0, 1, 2))
+        heatmap = tf.nn.relu(tf.reduce_sum(activations[0] * weights, axis=-1)).numpy()
+        peak = heatmap.max()
+        return (heatmap / peak if peak > 0 else heatmap), class_index
+
+    def _grad_cam_model(self, layer_name):
+        # Construit une seule fois par modèle chargé: un tf.keras.Model par appel ferait grossir le graphe
+        entry = self._grad_cam_models.get(layer_name)
+        if entry is None or entry[0] is not self.model:
+            import tensorflow as tf
+
+            base_model = self.model.layers[0]
+            features_model = tf.keras.Model(
+                base_model.inputs, [base_model.get_layer(layer_name).output, base_model.output]
+            )
+            entry = self._grad_cam_models[layer_name] = (self.model, features_model)
+        return entry[1]
+
+    def serving_function(self, resolution):
+        """Fonction TensorFlow compilée pour une résolution (signature d'entrée fixe, pas de retraçage)"""
+        entry = self._serving_functions.get(resolution)
+        if entry is None or entry[0] is not self.model:
+            import tensorflow as tf
+
+            model = self.model
+            function = tf.function(
+                lambda inputs: model(inputs, training=False),
+                input_signature=[tf.TensorSpec((None, resolution, resolution, self.input_shape[2]), tf.float32)],
+            )
+            entry = self._serving_functions[resolution] = (model, function)
+        return entry[1]
+
+    def serving_module(self, resolution=None):
+        """Module TensorFlow exportable dont les signatures incluent le prétraitement.
+
+        ``serving_default`` prend un lot d'images encodées (JPEG, PNG, GIF,
+        BMP; chaîne d'octets par image) et fait dans le graphe le décodage, le
+        redimensionnement bicubique à ``resolution`` et la normalisation
+        ResNet50. ``predict_pixels`` prend des images déjà décodées (uint8
+        N x H x W x 3) et ne fait que la normalisation. Les deux renvoient
+        ``probabilities`` (N x nombre de races).
+        """
+        import tensorflow as tf
+
+        width, height = self.target_size(resolution)
+        channels = self.input_shape[2]
+        model = self.model
+        mean = tf.constant(RESNET_MEAN_BGR, dtype=tf.float32)
+
+        def normalize(pixels):
+            return tf.reverse(tf.cast(pixels, tf.float32), axis=[-1]) - mean
+
+        def decode(data):
+            image = tf.io.decode_image(data, channels=channels, expand_animations=False)
+            image.set_shape((None, None, channels))
+            # Comme preprocess_image: bicubique, puis arrondi sur 8 bits
+            image = tf.image.resize(image, (height, width), method='bicubic', antialias=True)
+            return tf.cast(tf.round(tf.clip_by_value(image, 0.0, 255.0)), tf.uint8)
+
+        module = tf.Module()
+        module.model = model
+
+        @tf.function(input_signature=[tf.TensorSpec((None,), tf.string, name='images')])
+        def predict_images(images):
+            pixels = tf.map_fn(decode, images, fn_output_signature=tf.TensorSpec((height, width, channels), tf.uint8))
+            return {'probabilities': model(normalize(pixels), training=False)}
+
+        @tf.function(input_signature=[tf.TensorSpec((None, height, width, channels), tf.uint8, name='pixels')])
+        def predict_pixels(pixels):
+            return {'probabilities': model(normalize(pixels), training=False)}
+
+        module.predict_images = predict_images
+        module.predict_pixels = predict_pixels
+        return module
+
+    def export_serving(self, export_dir, resolution=None):
+        """Exporte le modèle au format SavedModel avec les signatures de ``serving_module``"""
+        if not self.is_tensorflow_available or self.model is None:
+            logger.warning("Modèle non disponible pour l'export - création d'un fichier de simulation")
+            with open(export_dir + ".sim", "w") as f:
+                f.write("Fichier de simulation - TensorFlow non disponible")
+            return False
+        import tensorflow as tf
+
+        module = self.serving_module(resolution)
+        tf.saved_model.save(module, export_dir, signatures={
+            'serving_default': module.predict_images,
+            'predict_pixels': module.predict_pixels,
+        })
+        with open(os.path.join(export_dir, 'breeds.txt'), 'w') as f:
+            f.write('\n'.join(self.breeds[:self.num_classes]) + '\n')
+        logger.info(f"Modèle exporté pour le service dans {export_dir}")
+        return True
+
+    def predict_fast(self, batch):
+        """Probabilités du modèle rapide MobileNetV2 (entrées ramenées dans [-1, 1])"""
+        if not self.is_tensorflow_available or self.fast_model is None:
+            # Mode simulation, comme predict_accurate
+            probabilities = np.random.rand(len(batch), len(self.breeds)).astype(np.float32)
+            return probabilities / probabilities.sum(axis=1, keepdims=True)
+        inputs = np.asarray(batch).astype(np.float32) / 127.5 - 1.0
+        return np.asarray(self.fast_model(inputs, training=False))
+
+    def predict_cascade(self, batch, fast_batch=None):
+        """Modèle rapide d'abord; les images sous ``cascade_threshold`` passent par ResNet50.
+
+        ``fast_batch`` est le même lot à la résolution par défaut, pour le modèle
+        rapide, quand ``batch`` est à une autre résolution.
+        """
+        start = time.perf_counter()
+        probabilities = np.array(self.predict_fast(batch if fast_batch is None else fast_batch))
+        metrics.observe('cascade.fast_seconds', time.perf_counter() - start)
+        metrics.incr('cascade.items', len(batch))
+
+        escalate = probabilities.max(axis=1) < self.cascade_threshold
+        if escalate.any():
+            start = time.perf_counter()
+            probabilities[escalate] = self.predict_accurate(batch[escalate])
+            metrics.observe('cascade.accurate_seconds', time.perf_counter() - start)
+            metrics.incr('cascade.escalated', int(escalate.sum()))
+        return probabilities
+
+    def to_predictions(self, probabilities):
+        """Associe un vecteur de probabilités aux noms de races"""
+        return list(zip(self.breeds, probabilities))
+
+    def warmup(self):
+        """Exécute une inférence à blanc pour initialiser les graphes et les allocateurs"""
+        try:
+            dummy = np.zeros((1,) + tuple(self.input_shape), dtype=np.uint8)
+            for resolution in self.resolutions:
+                self.predict_accurate(np.zeros((1, resolution, resolution, self.input_shape[2]), dtype=np.uint8))
+            if self.fast_model is not None:
+                self.predict_fast(dummy)
+            if self.gate_model is not None:
+                self.dog_scores(dummy)
+            self.is_warmed = True
+            logger.info("Modèle préchauffé")
+        except Exception as e:
+            logger.error(f"Erreur lors du préchauffage du modèle: {e}")
+        return self.is_warmed
+
+    def unload(self, release_memory=True):
+        """Libère le modèle et la mémoire de TensorFlow; renvoie True si un modèle était chargé.
+
+        ``clear_session``, ``gc.collect`` et ``malloc_trim`` touchent tout le
+        processus: avec ``release_memory=False``, seules les références aux
+        modèles sont lâchées, pour décharger un modèle pendant que d'autres prédisent.
+        """
+        if self.model is None:
+            return False
+        self.model = None
+        self.fast_model = None
+        self.gate_model = None
+        self._serving_functions.clear()
+        self._grad_cam_models.clear()
+        self.is_warmed = False
+        if not release_memory:
+            logger.info("Modèle déchargé (références seulement)")
+            return True
+        try:
+            import tensorflow as tf
+            tf.keras.backend.clear_session()
+        except Exception as e:
+            logger.warning(f"Impossible de réinitialiser la session Keras: {e}")
+        gc.collect()
+        try:
+            # Rendre au système les pages libérées par l'allocateur de la glibc
+            ctypes.CDLL('libc.so.6').malloc_trim(0)
+        except (OSError, AttributeError):
+            pass
+        logger.info("Modèle déchargé")
+        return True
+
+    def model_bytes(self):
+        """Taille estimée des poids chargés (float32), en octets"""
+        return sum(model.count_params() * 4 for model in (self.model, self.fast_model, self.gate_model) if model is not None)
+
+    @property
+    def is_loaded(self):
+        """Indique si le modèle est prêt à servir (ou si le mode simulation est actif)"""
+        return self.model is not None or not self.is_tensorflow_available
+
+    def save_model(self, filepath, serving_dir=None):
+        """Sauvegarde le modèle; avec ``serving_dir``, l'exporte aussi pour le service (``export_serving``)"""
+        if serving_dir:
+            try:
+                self.export_serving(serving_dir)
+            except Exception as e:
+                logger.error(f"Erreur lors de l'export du modèle pour le service: {e}")
+        try:
+            # Lu par le service pour les variantes (résolution et races propres au modèle)
+            with open(filepath + '.json', 'w') as f:
+                json.dump({'input_shape': list(self.input_shape), 'breeds': self.breeds[:self.num_classes]}, f)
+        except OSError as e:
+            logger.error(f"Erreur lors de l'écriture des métadonnées du modèle: {e}")
         if not self.is_tensorflow_available or self.model is None:
             logger.warning("Modèle non disponible pour la sauvegarde - création d'un fichier de simulation")
             # Créer un fichier de simulation
@@ -412,6 +966,7 @@ class EnhancedDogBreedClassifier:
                 return False
             
             self.model = load_model(filepath)
+            self.is_warmed = False
             logger.info(f"Modèle chargé depuis {filepath}")
             return True
         except Exception as e:
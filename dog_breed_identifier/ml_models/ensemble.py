@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .metrics import metrics
+
+
+class EnsemblePredictor:
+    """Moyenne des probabilités de plusieurs modèles, exécutés en parallèle.
+
+    ``members`` associe un nom à une fonction ``lot -> probabilités`` (par
+    exemple ``classifier.predict_accurate`` ou le ``predict_batch`` d'un
+    ``InferenceClient`` vers un autre processus). Chaque membre a son propre
+    exécuteur: un membre lent n'occupe jamais le thread d'un autre, et la
+    latence de l'ensemble est celle du membre le plus lent, pas leur somme.
+    """
+
+    def __init__(self, members, weights=None):
+        if not members:
+            raise ValueError("Un ensemble a besoin d'au moins un membre")
+        self.members = dict(members)
+        weights = weights or {}
+        self.weights = {name: float(weights.get(name, 1.0)) for name in self.members}
+        self._executors = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _executor(self, name):
+        # Les threads ne survivent pas à un fork: nouveaux exécuteurs dans chaque processus
+        with self._lock:
+            if self._pid != os.getpid():
+                self._executors = {}
+                self._pid = os.getpid()
+            executor = self._executors.get(name)
+            if executor is None:
+                executor = self._executors[name] = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=f'ensemble-{name}'
+                )
+            return executor
+
+    def _timed(self, name, batch):
+        start = time.perf_counter()
+        probabilities = np.asarray(self.members[name](batch), dtype=np.float32)
+        return probabilities, time.perf_counter() - start
+
+    def predict_with_timings(self, batch):
+        """Renvoie (probabilités moyennes, durées en secondes par membre et pour l'ensemble)"""
+        start = time.perf_counter()
+        futures = {name: self._executor(name).submit(self._timed, name, batch) for name in self.members}
+        outputs = {name: future.result() for name, future in futures.items()}
+
+        shapes = {name: probabilities.shape for name, (probabilities, _) in outputs.items()}
+        if len(set(shapes.values())) > 1:
+            raise ValueError(f"Les membres de l'ensemble ne renvoient pas la même forme: {shapes}")
+
+        total_weight = sum(self.weights.values())
+        probabilities = sum(self.weights[name] * outputs[name][0] for name in self.members) / total_weight
+        timings = {name: seconds for name, (_, seconds) in outputs.items()}
+        timings['ensemble'] = time.perf_counter() - start
+
+        metrics.incr('ensemble.batches')
+        metrics.incr('ensemble.items', len(batch))
+        metrics.observe('ensemble.seconds', timings['ensemble'])
+        for name in self.members:
+            metrics.observe(f'ensemble.member.{name}.seconds', timings[name])
+        return probabilities, timings
+
+    def predict_batch(self, batch):
+        return self.predict_with_timings(batch)[0]
+
+    def shutdown(self):
+        with self._lock:
+            for executor in self._executors.values():
+                executor.shutdown(wait=False)
+            self._executors = {}
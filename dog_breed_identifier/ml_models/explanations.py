@@ -0,0 +1,142 @@
+"""
+Explications Grad-CAM calculées en arrière-plan et mises en cache en PNG.
+
+La carte Grad-CAM est calculée par ``EnhancedDogBreedClassifier.grad_cam``;
+ce module la superpose à l'image, l'encode en PNG compressé et exécute les
+calculs hors du chemin de la requête.
+"""
+
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+BUSY = 'busy'
+FAILED = 'failed'
+
+# Palette « jet » simplifiée: bleu (faible) -> cyan -> jaune -> rouge (fort)
+_STOPS = np.array([0.0, 0.35, 0.65, 1.0])
+_COLORS = np.array([[0, 0, 160], [0, 220, 255], [255, 230, 0], [220, 0, 0]], dtype=np.float32)
+
+
+def colorize(heatmap):
+    """Carte H x W dans [0, 1] -> image RGB uint8 H x W x 3"""
+    heatmap = np.clip(np.asarray(heatmap, dtype=np.float32), 0.0, 1.0)
+    channels = [np.interp(heatmap, _STOPS, _COLORS[:, c]) for c in range(3)]
+    return np.stack(channels, axis=-1).astype(np.uint8)
+
+
+def overlay(image, heatmap, alpha=0.45):
+    """Superpose la carte (redimensionnée à l'image) à une image RGB uint8; renvoie une image PIL"""
+    from PIL import Image
+
+    image = np.asarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+    resized = Image.fromarray((np.clip(heatmap, 0.0, 1.0) * 255).astype(np.uint8)).resize(
+        (width, height), Image.BILINEAR
+    )
+    colors = colorize(np.asarray(resized, dtype=np.float32) / 255.0)
+    blended = (1 - alpha) * image.astype(np.float32) + alpha * colors.astype(np.float32)
+    return Image.fromarray(blended.astype(np.uint8))
+
+
+def encode_png(image):
+    """Encode une image PIL en PNG compressé au maximum"""
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+class ExplanationJobs:
+    """Exécute les calculs d'explication dans un pool dédié, une seule fois par clé.
+
+    ``compute_fn(*args)`` écrit l'explication (le cache); ``submit`` rend la
+    main tout de suite. Au-delà de ``max_pending`` calculs en attente, la
+    demande est refusée (``BUSY``) plutôt que d'allonger la file. Un échec est
+    rappelé pendant ``failure_ttl`` secondes, puis le calcul peut être retenté
+    (l'échec venait peut-être d'un modèle en cours de rechargement).
+    """
+
+    def __init__(self, compute_fn, max_workers=1, max_pending=32, failure_ttl=60.0):
+        self.compute_fn = compute_fn
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.failure_ttl = failure_ttl
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._in_flight = {}
+        self._failed = {}
+
+    def _get_executor(self):
+        # Les threads ne survivent pas à un fork: nouveau pool dans chaque processus
+        if self._pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='explanation')
+            self._in_flight = {}
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, key, *args):
+        """Planifie le calcul pour ``key``; renvoie PENDING, BUSY ou FAILED (voir ``error``)"""
+        with self._lock:
+            executor = self._get_executor()
+            if self._failure_locked(key) is not None:
+                return FAILED
+            if key in self._in_flight:
+                return PENDING
+            if len(self._in_flight) >= self.max_pending:
+                metrics.incr('explanations.busy')
+                return BUSY
+            self._in_flight[key] = executor.submit(self._run, key, args)
+            metrics.incr('explanations.submitted')
+            return PENDING
+
+    def status(self, key):
+        """PENDING, FAILED ou None (rien de demandé), sans rien planifier"""
+        with self._lock:
+            if self._failure_locked(key) is not None:
+                return FAILED
+            if self._pid == os.getpid() and key in self._in_flight:
+                return PENDING
+            return None
+
+    def error(self, key):
+        with self._lock:
+            return self._failure_locked(key)
+
+    def _failure_locked(self, key):
+        failure = self._failed.get(key)
+        if failure is None:
+            return None
+        failed_at, message = failure
+        if time.monotonic() - failed_at >= self.failure_ttl:
+            del self._failed[key]
+            return None
+        return message
+
+    def pending(self):
+        return len(self._in_flight)
+
+    def _run(self, key, args):
+        try:
+            self.compute_fn(*args)
+            metrics.incr('explanations.computed')
+        except Exception as e:
+            logger.error(f"Explication impossible pour {key}: {e}")
+            metrics.incr('explanations.failed')
+            with self._lock:
+                if len(self._failed) >= 1024:
+                    self._failed.pop(next(iter(self._failed)))
+                self._failed[key] = (time.monotonic(), str(e))
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
@@ -0,0 +1,61 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class IdleUnloader:
+    """Appelle ``unload_fn`` quand le modèle n'a pas servi depuis ``idle_seconds``.
+
+    Chaque utilisation appelle ``touch``. Un thread de surveillance (recréé
+    après un fork, au premier ``touch`` du nouveau processus) vérifie
+    périodiquement l'inactivité; ``busy_fn`` permet de ne jamais décharger
+    pendant qu'un lot est en attente.
+    """
+
+    def __init__(self, unload_fn, idle_seconds, busy_fn=None, check_interval=None, clock=time.monotonic):
+        self.unload_fn = unload_fn
+        self.idle_seconds = idle_seconds
+        self.busy_fn = busy_fn
+        self.check_interval = check_interval or max(1.0, min(30.0, idle_seconds / 4))
+        self.clock = clock
+        self.last_used = clock()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def touch(self):
+        self.last_used = self.clock()
+        self._ensure_thread()
+
+    def idle_for(self):
+        return self.clock() - self.last_used
+
+    def check(self):
+        """Décharge si le délai d'inactivité est dépassé; renvoie True si ``unload_fn`` a été appelé"""
+        if self.idle_for() < self.idle_seconds:
+            return False
+        if self.busy_fn is not None and self.busy_fn():
+            return False
+        return bool(self.unload_fn())
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+                return
+            self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='idle-unloader', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.check_interval)
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Erreur lors du déchargement du modèle inactif: {e}")
@@ -0,0 +1,59 @@
+from collections import namedtuple
+
+DEFAULT_ALLOWED_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+
+# Informations lues dans l'en-tête, sans décoder les pixels
+ImageHeader = namedtuple('ImageHeader', ['format', 'width', 'height', 'size_bytes'])
+
+
+class ImageRejected(ValueError):
+    """Image refusée avant décodage; ``status`` est le code HTTP à renvoyer"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _size_of(fileobj):
+    size = getattr(fileobj, 'size', None)
+    if size is None:
+        position = fileobj.tell()
+        fileobj.seek(0, 2)
+        size = fileobj.tell()
+        fileobj.seek(position)
+    return size
+
+
+def inspect_image(fileobj, max_bytes=None, max_pixels=None, allowed_formats=DEFAULT_ALLOWED_FORMATS):
+    """Lit uniquement l'en-tête de l'image et applique les limites de taille.
+
+    ``Image.open`` est paresseux: seuls le format et les dimensions sont lus,
+    les pixels ne sont décodés qu'au ``load()``. Les bombes de décompression
+    (petit fichier, dimensions énormes) sont donc refusées sans rien décoder.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    size_bytes = _size_of(fileobj)
+    if max_bytes and size_bytes > max_bytes:
+        raise ImageRejected(f"Fichier trop volumineux ({size_bytes} octets, maximum {max_bytes})", status=413)
+
+    fileobj.seek(0)
+    try:
+        with Image.open(fileobj) as img:
+            header = ImageHeader(img.format, img.size[0], img.size[1], size_bytes)
+    except Image.DecompressionBombError:
+        raise ImageRejected("Dimensions de l'image trop grandes", status=413)
+    except (UnidentifiedImageError, OSError, SyntaxError):
+        raise ImageRejected("Fichier image invalide ou format non reconnu", status=415)
+    finally:
+        fileobj.seek(0)
+
+    if allowed_formats and header.format not in allowed_formats:
+        raise ImageRejected(f"Format non pris en charge: {header.format}", status=415)
+    if header.width <= 0 or header.height <= 0:
+        raise ImageRejected("Dimensions de l'image invalides")
+    if max_pixels and header.width * header.height > max_pixels:
+        raise ImageRejected(
+            f"Image trop grande ({header.width}x{header.height}, maximum {max_pixels} pixels)", status=413
+        )
+    return header
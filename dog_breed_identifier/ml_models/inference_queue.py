@@ -0,0 +1,238 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from .deadline import DeadlineExceeded
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Voies de priorité, de la plus prioritaire à la moins prioritaire
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+LANES = (INTERACTIVE, BULK)
+
+
+class InferenceQueue:
+    """File d'attente d'inférence qui regroupe les requêtes concurrentes en lots.
+
+    Chaque appel à ``submit`` dépose une image prétraitée (uint8 HxWx3) et
+    renvoie un ``Future``. Un thread de travail unique par processus collecte
+    jusqu'à ``max_batch_size`` images (en attendant au plus ``max_wait_ms``)
+    puis appelle ``predict_fn`` une seule fois pour tout le lot. Une image
+    dont l'échéance est passée quand son lot part est retirée du lot et son
+    ``Future`` échoue avec ``DeadlineExceeded``.
+
+    Chaque image entre dans une voie (``interactive`` ou ``bulk``): un lot
+    prend d'abord les images interactives, puis complète les places libres
+    avec les images en masse. Contre la famine, une image en masse qui attend
+    depuis plus de ``max_bulk_wait_ms`` passe devant les images interactives.
+
+    ``submit_call`` fait passer un autre travail sur le modèle (Grad-CAM) par
+    la même file: il attend son tour dans sa voie, compte dans la profondeur
+    vue par le contrôle d'admission et s'exécute sur le thread de travail,
+    jamais en même temps qu'un lot.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=8, max_wait_ms=5, max_bulk_wait_ms=2000):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms) / 1000.0)
+        self.max_bulk_wait = max(0.0, float(max_bulk_wait_ms) / 1000.0)
+        self._lock = threading.Lock()
+        self._ready = None
+        self._lanes = {lane: deque() for lane in LANES}
+        self._worker = None
+        self._pid = None
+        self._in_flight = 0
+        self.batches = 0
+        self.items = 0
+        self.expired = 0
+        self.ewma_batch_seconds = None
+        self.ewma_item_seconds = None
+        self.lane_stats = {lane: self._new_lane_stats() for lane in LANES}
+
+    @staticmethod
+    def _new_lane_stats():
+        return {'items': 0, 'promoted': 0, 'ewma_wait_seconds': None, 'max_wait_seconds': 0.0}
+
+    def _ensure_worker(self):
+        """Démarre le thread de travail (à nouveau après un fork)"""
+        pid = os.getpid()
+        if self._worker is not None and self._worker.is_alive() and self._pid == pid:
+            return
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive() and self._pid == pid:
+                return
+            if self._pid != pid:
+                # Les verrous hérités du processus parent ne sont pas fiables après un fork
+                self._ready = threading.Condition()
+                self._lanes = {lane: deque() for lane in LANES}
+                self._in_flight = 0
+                self._pid = pid
+            self._worker = threading.Thread(target=self._run, name='inference-queue', daemon=True)
+            self._worker.start()
+
+    def submit(self, image_array, deadline=None, lane=INTERACTIVE):
+        """Ajoute une image à la voie ``lane`` et renvoie un Future résolu avec ses probabilités"""
+        if lane not in LANES:
+            raise ValueError(f"Voie inconnue: {lane!r} (attendu: {', '.join(LANES)})")
+        self._ensure_worker()
+        future = Future()
+        with self._ready:
+            self._lanes[lane].append((np.asarray(image_array), future, deadline, lane, time.monotonic()))
+            self._ready.notify()
+        return future
+
+    def submit_call(self, fn, lane=BULK):
+        """Ajoute l'appel ``fn()`` à la voie ``lane`` et renvoie un Future résolu avec son résultat"""
+        if lane not in LANES:
+            raise ValueError(f"Voie inconnue: {lane!r} (attendu: {', '.join(LANES)})")
+        self._ensure_worker()
+        future = Future()
+        with self._ready:
+            self._lanes[lane].append((fn, future, None, lane, time.monotonic()))
+            self._ready.notify()
+        return future
+
+    def predict(self, image_array, timeout=None, deadline=None, lane=INTERACTIVE):
+        """Version bloquante de ``submit``"""
+        return self.submit(image_array, deadline=deadline, lane=lane).result(timeout=timeout)
+
+    def lane_depth(self, lane):
+        """Nombre d'images en attente dans une voie"""
+        return len(self._lanes[lane])
+
+    def depth(self, lane=None):
+        """Nombre d'images en attente ou en cours d'inférence.
+
+        Avec ``lane``, seules comptent les images servies avant une nouvelle
+        image de cette voie: pour ``interactive``, les images en masse en
+        attente ne sont pas devant elle.
+        """
+        lanes = LANES if lane is None else LANES[:LANES.index(lane) + 1]
+        return sum(len(self._lanes[name]) for name in lanes) + self._in_flight
+
+    def stats(self):
+        """Statistiques de la file pour la supervision"""
+        lanes = {}
+        for lane in LANES:
+            lanes[lane] = dict(self.lane_stats[lane], depth=self.lane_depth(lane))
+        return {
+            'depth': self.depth(),
+            'lanes': lanes,
+            'batches': self.batches,
+            'items': self.items,
+            'expired': self.expired,
+            'max_batch_size': self.max_batch_size,
+            'ewma_batch_seconds': self.ewma_batch_seconds,
+            'ewma_item_seconds': self.ewma_item_seconds,
+        }
+
+    def _pending(self):
+        return any(self._lanes.values())
+
+    def _next_item(self, now):
+        """Image suivante par ordre de priorité (à appeler avec ``_ready`` tenu)"""
+        bulk = self._lanes[BULK]
+        if bulk and now - bulk[0][4] >= self.max_bulk_wait:
+            # Protection contre la famine: l'image en masse la plus ancienne passe devant
+            self.lane_stats[BULK]['promoted'] += 1
+            return bulk.popleft()
+        for lane in LANES:
+            if self._lanes[lane]:
+                return self._lanes[lane].popleft()
+        return None
+
+    def _collect_batch(self):
+        """Attend un premier élément puis complète le lot pendant ``max_wait``"""
+        with self._ready:
+            while not self._pending():
+                self._ready.wait()
+            end = time.monotonic() + self.max_wait
+            batch = []
+            while len(batch) < self.max_batch_size:
+                now = time.monotonic()
+                item = self._next_item(now)
+                if item is not None:
+                    batch.append(item)
+                    continue
+                if now >= end:
+                    break
+                self._ready.wait(end - now)
+            # Compté en cours d'inférence avant de relâcher le verrou: ``depth`` reste exact
+            self._in_flight = len(batch)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            try:
+                self._record_waits(batch)
+                self._process(batch)
+            finally:
+                self._in_flight = 0
+
+    def _record_waits(self, batch, alpha=0.2):
+        now = time.monotonic()
+        for _, _, _, lane, enqueued_at in batch:
+            wait = now - enqueued_at
+            stats = self.lane_stats[lane]
+            stats['items'] += 1
+            stats['max_wait_seconds'] = max(stats['max_wait_seconds'], wait)
+            if stats['ewma_wait_seconds'] is None:
+                stats['ewma_wait_seconds'] = wait
+            else:
+                stats['ewma_wait_seconds'] = alpha * wait + (1 - alpha) * stats['ewma_wait_seconds']
+
+    def _process(self, batch):
+        # Regrouper par forme pour pouvoir empiler les tableaux
+        groups = {}
+        calls = []
+        for image_array, future, deadline, _, _ in batch:
+            if deadline is not None and deadline.expired():
+                self.expired += 1
+                future.set_exception(DeadlineExceeded("Échéance dépassée dans la file d'inférence"))
+                continue
+            if callable(image_array):
+                calls.append((image_array, future))
+                continue
+            groups.setdefault(image_array.shape, []).append((image_array, future))
+
+        for items in groups.values():
+            start = time.perf_counter()
+            try:
+                probabilities = self.predict_fn(np.stack([image_array for image_array, _ in items]))
+            except Exception as e:
+                logger.error(f"Erreur lors de l'inférence par lot: {e}")
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            self._record(time.perf_counter() - start, len(items))
+            for (_, future), row in zip(items, probabilities):
+                future.set_result(row)
+
+        # Après les images du lot; leur durée n'entre pas dans la moyenne mobile des lots
+        for fn, future in calls:
+            try:
+                future.set_result(fn())
+            except Exception as e:
+                logger.error(f"Erreur d'un appel dans la file d'inférence: {e}")
+                future.set_exception(e)
+
+    def _record(self, elapsed, count, alpha=0.2):
+        self.batches += 1
+        self.items += count
+        per_item = elapsed / count
+        if self.ewma_batch_seconds is None:
+            self.ewma_batch_seconds = elapsed
+            self.ewma_item_seconds = per_item
+        else:
+            self.ewma_batch_seconds = alpha * elapsed + (1 - alpha) * self.ewma_batch_seconds
+            self.ewma_item_seconds = alpha * per_item + (1 - alpha) * self.ewma_item_seconds
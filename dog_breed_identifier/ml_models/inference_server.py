@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+
+import numpy as np
+
+from .inference_queue import InferenceQueue
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Protocole binaire (big-endian), plusieurs trames par connexion:
+#   requête : magic, version, op, nombre d'images, hauteur, largeur, canaux
+#             puis nombre * hauteur * largeur * canaux octets (uint8)
+#   réponse : magic, version, statut, nombre d'images, nombre de classes
+#             puis nombre * classes float32 (ou, si statut != 0, un message UTF-8
+#             dont la longueur est dans le champ « classes »)
+MAGIC = b'DB'
+VERSION = 1
+OP_PREDICT = 1
+OP_STATUS = 2
+STATUS_OK = 0
+STATUS_ERROR = 1
+REQUEST_HEADER = struct.Struct('!2sBBHHHH')
+RESPONSE_HEADER = struct.Struct('!2sBBHH')
+PROBABILITY_DTYPE = np.dtype('>f4')
+
+
+class InferenceServerError(RuntimeError):
+    """Erreur renvoyée par le serveur d'inférence"""
+
+
+class PeerClosedError(ConnectionError):
+    """Connexion fermée par le pair avant la fin d'une trame (``received`` octets déjà lus)"""
+
+    def __init__(self, received):
+        super().__init__('Connexion fermée par le pair')
+        self.received = received
+
+
+def recv_exact(sock, size):
+    """Lit exactement ``size`` octets (ou lève PeerClosedError si la connexion se ferme)"""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise PeerClosedError(received)
+        received += count
+    return bytes(buffer)
+
+
+def _error_frame(message):
+    payload = message.encode('utf-8')[:65535]
+    return RESPONSE_HEADER.pack(MAGIC, VERSION, STATUS_ERROR, 0, len(payload)) + payload
+
+
+class _InferenceRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                header = recv_exact(self.request, REQUEST_HEADER.size)
+            except ConnectionError:
+                return
+            magic, version, op, count, height, width, channels = REQUEST_HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                self.request.sendall(_error_frame('Trame invalide'))
+                return
+
+            try:
+                payload = recv_exact(self.request, count * height * width * channels)
+            except ConnectionError:
+                return
+
+            try:
+                if op == OP_STATUS:
+                    body = json.dumps(server.status()).encode('utf-8')
+                    response = RESPONSE_HEADER.pack(MAGIC, VERSION, STATUS_OK, 0, len(body)) + body
+                elif op == OP_PREDICT:
+                    images = np.frombuffer(payload, dtype=np.uint8).reshape(count, height, width, channels)
+                    inference_queue = server.queue_for(height)
+                    futures = [inference_queue.submit(image) for image in images]
+                    probabilities = np.stack([future.result() for future in futures]).astype(PROBABILITY_DTYPE)
+                    response = RESPONSE_HEADER.pack(
+                        MAGIC, VERSION, STATUS_OK, count, probabilities.shape[1]
+                    ) + probabilities.tobytes()
+                else:
+                    response = _error_frame(f'Opération inconnue: {op}')
+            except Exception as e:
+                logger.error(f"Erreur lors de l'inférence: {e}")
+                response = _error_frame(str(e))
+            self.request.sendall(response)
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serveur d'inférence sur socket Unix: seul propriétaire du modèle.
+
+    Les requêtes de toutes les connexions passent par la même ``InferenceQueue``
+    et sont donc regroupées en lots entre les workers web. Chaque résolution
+    a sa propre file: un lot ne mélange jamais deux tailles d'image.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, classifier, max_batch_size=16, max_wait_ms=5):
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        self.socket_path = socket_path
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queues_lock = threading.Lock()
+        self.inference_queues = {}
+        super().__init__(socket_path, _InferenceRequestHandler)
+
+    def queue_for(self, resolution):
+        """File d'inférence des images de côté ``resolution`` (créée à la première requête)"""
+        inference_queue = self.inference_queues.get(resolution)
+        if inference_queue is None:
+            with self._queues_lock:
+                inference_queue = self.inference_queues.get(resolution)
+                if inference_queue is None:
+                    inference_queue = self.inference_queues[resolution] = InferenceQueue(
+                        self.classifier.predict_batch, max_batch_size=self.max_batch_size, max_wait_ms=self.max_wait_ms
+                    )
+        return inference_queue
+
+    def status(self):
+        return {
+            'loaded': self.classifier.is_loaded,
+            'warmed': self.classifier.is_warmed,
+            'simulated': not self.classifier.is_tensorflow_available,
+            'inference_queues': {
+                str(resolution): inference_queue.stats()
+                for resolution, inference_queue in sorted(self.inference_queues.items())
+            },
+        }
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class InferenceClient:
+    """Client du serveur d'inférence avec un petit pool de connexions persistantes"""
+
+    def __init__(self, socket_path, pool_size=4, timeout=30):
+        self.socket_path = socket_path
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def _check_fork(self):
+        # Les sockets hérités d'un processus parent ne doivent pas être partagés
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._pool = queue.LifoQueue(maxsize=self.pool_size)
+                    self._pid = os.getpid()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        return sock
+
+    def _acquire(self, fresh=False):
+        """Renvoie ``(socket, réutilisé)``: une connexion du pool, ou une nouvelle"""
+        self._check_fork()
+        if not fresh:
+            try:
+                return self._pool.get_nowait(), True
+            except queue.Empty:
+                pass
+        return self._connect(), False
+
+    def _release(self, sock):
+        try:
+            self._pool.put_nowait(sock)
+        except queue.Full:
+            sock.close()
+
+    def _request(self, op, batch):
+        batch = np.ascontiguousarray(batch, dtype=np.uint8)
+        count, height, width, channels = batch.shape
+        frame = REQUEST_HEADER.pack(MAGIC, VERSION, op, count, height, width, channels) + batch.tobytes()
+
+        for attempt in range(2):
+            sock, reused = self._acquire(fresh=attempt > 0)
+            header = None
+            try:
+                sock.sendall(frame)
+                header = recv_exact(sock, RESPONSE_HEADER.size)
+                magic, version, status, rows, size = RESPONSE_HEADER.unpack(header)
+                if magic != MAGIC or version != VERSION:
+                    raise InferenceServerError(f'Réponse invalide (magic={magic!r}, version={version})')
+                if status == STATUS_OK and op == OP_PREDICT:
+                    body_size = rows * size * PROBABILITY_DTYPE.itemsize
+                else:
+                    body_size = size
+                body = recv_exact(sock, body_size)
+            except (BrokenPipeError, ConnectionResetError, PeerClosedError) as e:
+                sock.close()
+                # Seule une connexion du pool que le serveur a fermée avant tout octet de
+                # réponse est réessayée (sur une nouvelle connexion): la requête n'a pas été
+                # traitée. Ailleurs, la renvoyer ferait calculer le lot deux fois.
+                if reused and not attempt and header is None and getattr(e, 'received', 0) == 0:
+                    continue
+                raise
+            except BaseException:
+                # Délai dépassé ou trame invalide: la réponse en attente rendrait le socket inutilisable
+                sock.close()
+                raise
+            self._release(sock)
+            if status != STATUS_OK:
+                raise InferenceServerError(body.decode('utf-8', 'replace'))
+            return rows, size, body
+
+    def predict_batch(self, batch):
+        """Envoie un lot uint8 (N x H x W x 3) et renvoie les probabilités (N x classes)"""
+        rows, classes, body = self._request(OP_PREDICT, batch)
+        return np.frombuffer(body, dtype=PROBABILITY_DTYPE).reshape(rows, classes).astype(np.float32)
+
+    def status(self):
+        """État du modèle côté serveur"""
+        _, _, body = self._request(OP_STATUS, np.zeros((0, 0, 0, 0), dtype=np.uint8))
+        return json.loads(body)
@@ -0,0 +1,70 @@
+import logging
+import os
+import threading
+import time
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def read_rss_bytes(pid='self'):
+    """Mémoire résidente (RSS) d'un processus, lue dans /proc/<pid>/statm (None hors Linux)"""
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class MemoryWatchdog:
+    """Demande le recyclage du worker quand sa mémoire résidente dépasse ``max_rss_bytes``.
+
+    L'allocateur de TensorFlow se fragmente et les graphes mis en cache
+    s'accumulent: la RSS d'un worker de longue durée ne fait que monter. Un
+    thread échantillonne la RSS toutes les ``check_interval`` secondes; au
+    premier dépassement, ``recycle_fn(raison)`` est appelé une seule fois. Il
+    doit arrêter le worker proprement (fin des requêtes en cours, puis sortie),
+    comme ``max_requests`` de gunicorn.
+    """
+
+    def __init__(self, max_rss_bytes, recycle_fn, check_interval=10.0, rss_fn=read_rss_bytes):
+        self.max_rss_bytes = max_rss_bytes
+        self.recycle_fn = recycle_fn
+        self.check_interval = check_interval
+        self.rss_fn = rss_fn
+        self.peak_rss_bytes = 0
+        self.recycle_reason = None
+        self._thread = None
+
+    def check(self):
+        """Échantillonne la RSS; renvoie True si le recyclage vient d'être demandé"""
+        rss = self.rss_fn()
+        if rss is None or self.recycle_reason is not None:
+            return False
+        self.peak_rss_bytes = max(self.peak_rss_bytes, rss)
+        metrics.set_gauge('worker.rss_bytes', rss)
+        metrics.set_gauge('worker.peak_rss_bytes', self.peak_rss_bytes)
+        if rss < self.max_rss_bytes:
+            return False
+        self.recycle_reason = (
+            f"RSS {rss / 2 ** 20:.0f} Mo au-delà de la limite de {self.max_rss_bytes / 2 ** 20:.0f} Mo"
+        )
+        logger.warning(f"Recyclage du worker {os.getpid()} demandé: {self.recycle_reason}")
+        self.recycle_fn(self.recycle_reason)
+        return True
+
+    def start(self):
+        """Lance la surveillance dans un thread (à appeler dans le worker, après le fork)"""
+        self._thread = threading.Thread(target=self._run, name='memory-watchdog', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self.recycle_reason is None:
+            time.sleep(self.check_interval)
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Erreur de la surveillance mémoire: {e}")
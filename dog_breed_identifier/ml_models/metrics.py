@@ -0,0 +1,58 @@
+import threading
+
+
+class Metrics:
+    """Compteurs, jauges et durées en mémoire pour le processus courant.
+
+    Exposés en JSON par la vue ``/metrics/``. Chaque worker a ses propres
+    valeurs: elles sont remises à zéro au redémarrage du processus.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timings = {}
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, seconds):
+        """Enregistre une durée (nombre, total, maximum et dernière valeur)"""
+        with self._lock:
+            timing = self._timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0})
+            timing['count'] += 1
+            timing['total'] += seconds
+            timing['max'] = max(timing['max'], seconds)
+            timing['last'] = seconds
+
+    def counter(self, name):
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def snapshot(self):
+        with self._lock:
+            timings = {
+                name: dict(timing, mean=timing['total'] / timing['count'] if timing['count'] else 0.0)
+                for name, timing in self._timings.items()
+            }
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'timings': timings,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+# Instance partagée par tout le processus
+metrics = Metrics()
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ModelPool:
+    """Modèles chargés à la demande, gardés en mémoire dans la limite d'un budget.
+
+    ``load_fn(nom)`` charge un modèle, ``size_fn(modèle)`` estime sa taille en
+    octets et ``unload_fn(modèle)`` le libère. Quand un chargement fait
+    dépasser ``memory_budget_bytes``, les modèles les moins récemment utilisés
+    sont libérés, sauf ceux en cours d'utilisation (``use``): le budget peut
+    alors être dépassé le temps que leurs prédictions se terminent.
+    """
+
+    def __init__(self, load_fn, memory_budget_bytes, size_fn, unload_fn=None):
+        self.load_fn = load_fn
+        self.memory_budget_bytes = memory_budget_bytes
+        self.size_fn = size_fn
+        self.unload_fn = unload_fn
+        self._lock = threading.Lock()
+        self._resident = OrderedDict()  # nom -> [modèle, taille, utilisations en cours]
+        self._loading = {}  # nom -> verrou du chargement en cours
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @contextmanager
+    def use(self, name):
+        """Donne le modèle ``name`` (chargé au besoin), protégé de l'éviction pendant le bloc"""
+        entry = self._acquire(name)
+        try:
+            yield entry[0]
+        finally:
+            with self._lock:
+                entry[2] -= 1
+
+    def _acquire(self, name):
+        with self._lock:
+            entry = self._resident.get(name)
+            if entry is not None:
+                self._resident.move_to_end(name)
+                entry[2] += 1
+                self.hits += 1
+                metrics.incr('model_pool.hits')
+                return entry
+            loading = self._loading.setdefault(name, threading.Lock())
+
+        # Un seul chargement par modèle; les autres demandes attendent son résultat
+        with loading:
+            with self._lock:
+                entry = self._resident.get(name)
+                if entry is not None:
+                    self._resident.move_to_end(name)
+                    entry[2] += 1
+                    self.hits += 1
+                    metrics.incr('model_pool.hits')
+                    return entry
+                self.misses += 1
+            metrics.incr('model_pool.misses')
+            start = time.perf_counter()
+            model = self.load_fn(name)
+            elapsed = time.perf_counter() - start
+            metrics.observe('model_pool.load_seconds', elapsed)
+            size = self.size_fn(model)
+            logger.info(f"Modèle {name} chargé en {elapsed:.2f}s ({size / 2 ** 20:.0f} Mo)")
+            with self._lock:
+                entry = self._resident[name] = [model, size, 1]
+                self._loading.pop(name, None)
+                evicted = self._evict_locked()
+        for evicted_name, evicted_model in evicted:
+            logger.info(f"Modèle {evicted_name} libéré (budget mémoire du pool)")
+            if self.unload_fn is not None:
+                self.unload_fn(evicted_model)
+        return entry
+
+    def _evict_locked(self):
+        evicted = []
+        for name in list(self._resident):
+            if self.used_bytes() <= self.memory_budget_bytes:
+                break
+            model, _, in_use = self._resident[name]
+            if in_use:
+                continue
+            del self._resident[name]
+            evicted.append((name, model))
+            self.evictions += 1
+            metrics.incr('model_pool.evictions')
+        return evicted
+
+    def used_bytes(self):
+        return sum(entry[1] for entry in self._resident.values())
+
+    def resident(self):
+        """Noms des modèles chargés, du moins au plus récemment utilisé"""
+        return list(self._resident)
+
+    def stats(self):
+        with self._lock:
+            resident = {name: entry[1] for name, entry in self._resident.items()}
+        requests = self.hits + self.misses
+        return {
+            'resident': resident,
+            'used_bytes': sum(resident.values()),
+            'memory_budget_bytes': self.memory_budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else None,
+            'evictions': self.evictions,
+        }
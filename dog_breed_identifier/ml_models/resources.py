@@ -0,0 +1,108 @@
+"""
+Ressources réellement disponibles pour le processus (quota CPU et limite
+mémoire des cgroups) et plan de service gunicorn/TensorFlow qui en découle.
+"""
+
+import math
+import os
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Au-delà, la « limite » cgroup v1 signifie en fait « pas de limite »
+UNLIMITED_MEMORY = 1 << 60
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def available_cpus():
+    """Nombre de processeurs sur lesquels le processus peut s'exécuter"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def read_cpu_quota(root=CGROUP_ROOT):
+    """Quota CPU du cgroup en nombre de processeurs (fractionnaire), ou None"""
+    # cgroup v2: « max 100000 » ou « 200000 100000 »
+    value = _read(os.path.join(root, 'cpu.max'))
+    if value:
+        quota, _, period = value.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+        return None
+    # cgroup v1
+    quota = _read(os.path.join(root, 'cpu', 'cpu.cfs_quota_us')) or _read(os.path.join(root, 'cpu.cfs_quota_us'))
+    period = _read(os.path.join(root, 'cpu', 'cpu.cfs_period_us')) or _read(os.path.join(root, 'cpu.cfs_period_us'))
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def read_memory_limit(root=CGROUP_ROOT):
+    """Limite mémoire du cgroup en octets, ou None"""
+    value = _read(os.path.join(root, 'memory.max'))
+    if value is None:
+        value = _read(os.path.join(root, 'memory', 'memory.limit_in_bytes')) or _read(
+            os.path.join(root, 'memory.limit_in_bytes')
+        )
+    if not value or value == 'max':
+        return None
+    limit = int(value)
+    return limit if limit < UNLIMITED_MEMORY else None
+
+
+def plan_serving(cpu_quota=None, memory_limit=None, cpu_count=None, worker_memory_mb=700,
+                 uses_inference_server=False, threads_per_worker=8, overrides=None):
+    """Choisit workers, classe de worker et threads TensorFlow/OpenMP.
+
+    - Avec un serveur d'inférence, les workers web ne portent pas le modèle:
+      ``2 x CPU + 1`` workers, un seul thread TensorFlow.
+    - Sinon chaque worker porte son modèle: un worker pour deux CPU (au plus
+      ce que la mémoire permet), et les CPU sont répartis entre les pools
+      ``intra_op`` des workers pour ne pas les sursouscrire.
+    - Les workers sont ``gthread`` pour que les requêtes concurrentes d'un
+      même worker remplissent les lots de la file d'inférence.
+
+    ``overrides`` remplace n'importe quelle valeur calculée. Renvoie le plan
+    et, pour chaque valeur, son origine.
+    """
+    cpu_count = cpu_count or available_cpus()
+    cpus = max(1, min(cpu_count, math.floor(cpu_quota))) if cpu_quota else cpu_count
+
+    memory_cap = None
+    if memory_limit:
+        memory_cap = max(1, int(memory_limit // (worker_memory_mb * 1024 * 1024)))
+
+    if uses_inference_server:
+        workers = 2 * cpus + 1
+    else:
+        workers = max(1, cpus // 2)
+    if memory_cap is not None:
+        workers = min(workers, memory_cap)
+
+    intra_op = 1 if uses_inference_server else max(1, cpus // workers)
+    plan = {
+        'workers': workers,
+        'worker_class': 'gthread',
+        'threads': threads_per_worker,
+        'intra_op_threads': intra_op,
+        'inter_op_threads': 1,
+        'omp_threads': intra_op,
+    }
+    sources = {name: 'computed' for name in plan}
+    for name, value in (overrides or {}).items():
+        if value is not None:
+            plan[name] = value
+            sources[name] = 'override'
+    if (overrides or {}).get('intra_op_threads') is not None and (overrides or {}).get('omp_threads') is None:
+        plan['omp_threads'] = plan['intra_op_threads']
+
+    plan['cpus'] = cpus
+    plan['memory_limit_mb'] = round(memory_limit / (1024 * 1024)) if memory_limit else None
+    return plan, sources
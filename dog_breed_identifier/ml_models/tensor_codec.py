@@ -0,0 +1,73 @@
+import io
+
+import numpy as np
+
+NPY_MAGIC = b'\x93NUMPY'
+NPY_CONTENT_TYPE = 'application/x-npy'
+BINARY_CONTENT_TYPE = 'application/octet-stream'
+
+
+class TensorRejected(ValueError):
+    """Tenseur refusé avant l'inférence; ``status`` est le code HTTP à renvoyer"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_shape(value):
+    """Lit un en-tête de forme ``224,224,3`` ou ``4x224x224x3``"""
+    try:
+        return tuple(int(dim) for dim in value.replace('x', ',').split(',') if dim.strip())
+    except ValueError:
+        raise TensorRejected(f"Forme invalide: {value!r}")
+
+
+def decode_tensor(body, input_shape, shape=None, max_images=32):
+    """Décode un corps NPY ou binaire brut en lot uint8 N x H x W x 3.
+
+    Un corps NPY est reconnu à son préfixe; sinon ``shape`` (issue de
+    l'en-tête ``X-Tensor-Shape``) est obligatoire et la taille du corps doit
+    lui correspondre exactement. Une image seule (H x W x 3) devient un lot
+    de taille 1. ``input_shape`` est une forme d'image ou une liste de formes
+    acceptées (une par résolution servie).
+    """
+    if input_shape and isinstance(input_shape[0], int):
+        input_shape = [input_shape]
+    accepted = [tuple(candidate) for candidate in input_shape]
+    ndim = len(accepted[0])
+    if body[:len(NPY_MAGIC)] == NPY_MAGIC:
+        try:
+            array = np.load(io.BytesIO(body), allow_pickle=False)
+        except ValueError as e:
+            raise TensorRejected(f"Fichier NPY invalide: {e}")
+        if shape is not None and tuple(array.shape) != tuple(shape):
+            raise TensorRejected(f"Forme annoncée {tuple(shape)} différente du contenu {array.shape}")
+    else:
+        if shape is None:
+            raise TensorRejected("Corps binaire sans en-tête de forme (X-Tensor-Shape)")
+        expected = int(np.prod(shape)) if shape else 0
+        if expected <= 0 or len(body) != expected:
+            raise TensorRejected(f"Taille du corps ({len(body)} octets) incompatible avec la forme {tuple(shape)}")
+        array = np.frombuffer(body, dtype=np.uint8).reshape(shape)
+
+    if array.dtype != np.uint8:
+        raise TensorRejected(f"Type {array.dtype} non pris en charge: uint8 attendu", status=415)
+    if array.ndim == ndim:
+        array = array[np.newaxis]
+    if array.ndim != ndim + 1 or tuple(array.shape[1:]) not in accepted:
+        expected = ', '.join(' x '.join(map(str, candidate)) for candidate in accepted)
+        raise TensorRejected(f"Forme {array.shape} incompatible: N x ({expected}) attendue", status=422)
+    if not 1 <= len(array) <= max_images:
+        raise TensorRejected(f"Lot de {len(array)} images: entre 1 et {max_images} attendues", status=413)
+    return array
+
+
+def encode_probabilities(probabilities, content_type):
+    """Sérialise un lot de probabilités (N x classes) en NPY ou float32 little-endian brut"""
+    probabilities = np.asarray(probabilities, dtype='<f4')
+    if content_type == NPY_CONTENT_TYPE:
+        buffer = io.BytesIO()
+        np.save(buffer, probabilities, allow_pickle=False)
+        return buffer.getvalue()
+    return probabilities.tobytes()
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEIGHTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weights')
+
+# Poids pré-entraînés connus (URL et empreinte publiées par keras.applications).
+# Sans empreinte publiée, celle du premier téléchargement est mémorisée puis vérifiée.
+KNOWN_WEIGHTS = {
+    'resnet50_notop': {
+        'filename': 'resnet50_weights_tf_dim_ordering_tf_kernels_notop.h5',
+        'url': 'https://storage.googleapis.com/tensorflow/keras-applications/resnet/'
+               'resnet50_weights_tf_dim_ordering_tf_kernels_notop.h5',
+        'md5': '4d473c1dd8becc155b73f8504c6f6626',
+    },
+    'mobilenet_v2': {
+        'filename': 'mobilenet_v2_weights_tf_dim_ordering_tf_kernels_1.0_224.h5',
+        'url': 'https://storage.googleapis.com/tensorflow/keras-applications/mobilenet_v2/'
+               'mobilenet_v2_weights_tf_dim_ordering_tf_kernels_1.0_224.h5',
+    },
+    'mobilenet_v2_notop': {
+        'filename': 'mobilenet_v2_weights_tf_dim_ordering_tf_kernels_1.0_224_no_top.h5',
+        'url': 'https://storage.googleapis.com/tensorflow/keras-applications/mobilenet_v2/'
+               'mobilenet_v2_weights_tf_dim_ordering_tf_kernels_1.0_224_no_top.h5',
+    },
+}
+
+
+def map_file(path):
+    """Projette un fichier en lecture seule et demande au noyau de le lire d'avance.
+
+    Les pages projetées sont celles du cache du système: les processus qui
+    lisent ensuite le fichier (les workers, après le fork) les partagent.
+    """
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_WILLNEED'):
+        mapping.madvise(mmap.MADV_WILLNEED)
+    return mapping
+
+
+class WeightStore:
+    """Stockage local des poids pré-entraînés, vérifiés par empreinte.
+
+    Les fichiers sont téléchargés une fois (étape de build ou commande
+    ``manage.py fetch_weights``) puis chargés directement par ``build_model``.
+    Un fichier ``.verified`` mémorise la taille et la date du fichier vérifié
+    pour éviter de recalculer l'empreinte à chaque démarrage.
+    """
+
+    def __init__(self, root=None, known_weights=None):
+        self.root = root or os.environ.get('ML_WEIGHTS_DIR') or DEFAULT_WEIGHTS_DIR
+        self.known_weights = known_weights or KNOWN_WEIGHTS
+
+    def _spec(self, name):
+        if name not in self.known_weights:
+            raise KeyError(f"Poids inconnus: {name}")
+        return self.known_weights[name]
+
+    def path_for(self, name):
+        return os.path.join(str(self.root), self._spec(name)['filename'])
+
+    def _stamp_path(self, name):
+        return self.path_for(name) + '.verified'
+
+    @staticmethod
+    def file_digest(path, algorithm, chunk_size=1024 * 1024):
+        digest = hashlib.new(algorithm)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _read_stamp(self, name):
+        try:
+            with open(self._stamp_path(name)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _expected(self, name):
+        """Algorithme et empreinte attendue (publiée, sinon mémorisée au premier téléchargement)"""
+        spec = self._spec(name)
+        if spec.get('sha256'):
+            return 'sha256', spec['sha256']
+        if spec.get('md5'):
+            return 'md5', spec['md5']
+        return 'sha256', self._read_stamp(name).get('sha256')
+
+    def _write_stamp(self, name, digest=None):
+        stat = os.stat(self.path_for(name))
+        algorithm, expected = self._expected(name)
+        with open(self._stamp_path(name), 'w') as f:
+            json.dump({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, algorithm: expected or digest}, f)
+
+    def verify(self, name):
+        """Recalcule l'empreinte du fichier local et la compare à la valeur attendue"""
+        path = self.path_for(name)
+        if not os.path.exists(path):
+            return False
+        algorithm, expected = self._expected(name)
+        digest = self.file_digest(path, algorithm)
+        if expected is None:
+            logger.warning(f"Aucune empreinte publiée pour {name}: celle de {path} est mémorisée")
+        elif digest != expected:
+            logger.error(f"Empreinte invalide pour {path}")
+            return False
+        self._write_stamp(name, digest)
+        return True
+
+    def is_available(self, name):
+        """Vrai si le fichier existe et correspond à sa dernière vérification"""
+        path = self.path_for(name)
+        if not os.path.exists(path):
+            return False
+        stamp = self._read_stamp(name)
+        stat = os.stat(path)
+        algorithm, expected = self._expected(name)
+        if (expected and stamp.get('size') == stat.st_size and stamp.get('mtime_ns') == stat.st_mtime_ns
+                and stamp.get(algorithm) == expected):
+            return True
+        return self.verify(name)
+
+    def fetch(self, name, force=False, timeout=60):
+        """Télécharge les poids dans le stockage local (écriture atomique, empreinte vérifiée)"""
+        if not force and self.is_available(name):
+            return self.path_for(name)
+
+        import requests
+
+        spec = self._spec(name)
+        path = self.path_for(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        algorithm, expected = self._expected(name)
+        if force and not any(spec.get(key) for key in ('sha256', 'md5')):
+            expected = None  # Nouveau téléchargement: l'empreinte mémorisée est remplacée
+        digest = hashlib.new(algorithm)
+        tmp_path = f"{path}.part{os.getpid()}"
+
+        logger.info(f"Téléchargement des poids {name} depuis {spec['url']}")
+        try:
+            with requests.get(spec['url'], stream=True, timeout=timeout) as response:
+                response.raise_for_status()
+                with open(tmp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        digest.update(chunk)
+                        f.write(chunk)
+            if expected is not None and digest.hexdigest() != expected:
+                raise ValueError(f"Empreinte invalide pour {name}: {digest.hexdigest()} != {expected}")
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        if expected is None and os.path.exists(self._stamp_path(name)):
+            os.remove(self._stamp_path(name))
+        self._write_stamp(name, digest.hexdigest())
+        logger.info(f"Poids {name} enregistrés dans {path}")
+        return path
+
+    def resolve(self, name, allow_download=True):
+        """Chemin local des poids, téléchargés si nécessaire et autorisé; None sinon"""
+        if self.is_available(name):
+            return self.path_for(name)
+        if not allow_download:
+            logger.error(f"Poids {name} absents de {self.root} et téléchargement désactivé")
+            return None
+        try:
+            return self.fetch(name)
+        except Exception as e:
+            logger.error(f"Impossible de télécharger les poids {name}: {e}")
+            return None
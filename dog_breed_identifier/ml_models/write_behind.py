@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+import time
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Tampon d'écriture différée: les enregistrements sont écrits par lots en arrière-plan.
+
+    ``add`` rend la main tout de suite; un thread appelle ``flush_fn(lot)``
+    dès que ``batch_size`` enregistrements attendent, ou au plus tard
+    ``max_delay`` secondes après le plus ancien. Le tampon est borné: au-delà
+    de ``max_pending`` enregistrements, ``add`` écrit lui-même le tampon
+    (retour à l'écriture synchrone plutôt que perte ou croissance sans fin).
+    Un lot que ``flush_fn`` n'a pas pu écrire revient en tête du tampon et
+    sera réessayé après ``max_delay``; seuls les enregistrements au-delà de
+    ``max_pending`` sont perdus. ``flush`` vide le tampon de façon synchrone,
+    par exemple à l'arrêt du processus.
+    """
+
+    def __init__(self, flush_fn, batch_size=50, max_delay=1.0, max_pending=1000):
+        self.flush_fn = flush_fn
+        self.batch_size = max(1, int(batch_size))
+        self.max_delay = max_delay
+        self.max_pending = max(self.batch_size, int(max_pending))
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = []
+        self._oldest = None
+        self._thread = None
+        self._pid = None
+
+    def add(self, record):
+        self._ensure_thread()
+        with self._lock:
+            self._pending.append(record)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            pending = len(self._pending)
+        metrics.incr('write_behind.added')
+        if pending >= self.max_pending:
+            # Tampon plein: l'appelant paie l'écriture
+            metrics.incr('write_behind.inline_flushes')
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wake.set()
+
+    def pending(self):
+        return len(self._pending)
+
+    def flush(self):
+        """Écrit tout ce qui attend; renvoie le nombre d'enregistrements écrits"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                    self._oldest = time.monotonic() if self._pending else None
+                if not batch:
+                    return written
+                start = time.perf_counter()
+                try:
+                    self.flush_fn(batch)
+                except Exception as e:
+                    logger.error(f"Écriture différée de {len(batch)} enregistrements impossible: {e}")
+                    self._requeue(batch)
+                    return written
+                metrics.observe('write_behind.flush_seconds', time.perf_counter() - start)
+                metrics.incr('write_behind.written', len(batch))
+                written += len(batch)
+
+    def _requeue(self, batch):
+        """Remet un lot non écrit en tête du tampon, dans la limite de ``max_pending``"""
+        with self._lock:
+            pending = batch + self._pending
+            overflow = max(0, len(pending) - self.max_pending)
+            self._pending = pending[overflow:]
+            # Prochain essai dans max_delay: pas de boucle serrée contre une base indisponible
+            self._oldest = time.monotonic()
+        metrics.incr('write_behind.requeued', len(batch))
+        if overflow:
+            metrics.incr('write_behind.dropped', overflow)
+            logger.error(f"Tampon d'écriture différée plein: {overflow} enregistrements perdus")
+
+    def _ensure_thread(self):
+        pid = os.getpid()
+        if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == pid:
+                return
+            if self._pid != pid:
+                # Les enregistrements hérités du parent sont écrits par le parent
+                self._pending = []
+                self._oldest = None
+                self._flush_lock = threading.Lock()
+                self._pid = pid
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            oldest = self._oldest
+            timeout = None if oldest is None else max(0.0, oldest + self.max_delay - time.monotonic())
+            # Sans rien en attente, on se réveille quand même pour voir arriver le premier enregistrement
+            self._wake.wait(timeout if timeout is not None else self.max_delay)
+            self._wake.clear()
+            oldest = self._oldest
+            if len(self._pending) >= self.batch_size or (
+                oldest is not None and time.monotonic() - oldest >= self.max_delay
+            ):
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"Erreur de l'écriture différée: {e}")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark du décodage JPEG lors du prétraitement.
+
+Compare, pour des tailles typiques de photos de téléphone:
+
+- ``full``: décodage complet puis redimensionnement en 224x224
+- ``draft``: ``EnhancedDogBreedClassifier.preprocess_image``, qui décode
+  directement à l'échelle 1/2, 1/4 ou 1/8 (``Image.draft``) puis termine
+  par un redimensionnement rapide
+
+Les images sont générées (bruit + dégradé) et encodées en JPEG qualité 90.
+
+Usage:
+    python scripts/decode_benchmark.py --runs 10
+    python scripts/decode_benchmark.py --sizes 4032x3024,8064x6048 --json decode.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_models.enhanced_model import EnhancedDogBreedClassifier  # noqa: E402
+
+# 2, 8, 12 et 48 mégapixels
+DEFAULT_SIZES = '1920x1080,3264x2448,4032x3024,8064x6048'
+
+
+def make_jpeg(path, width, height):
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    noise = rng.normal(0, 6, (height, width, 3)).astype(np.float32)
+    pixels = np.clip(gradient + noise, 0, 255).astype(np.uint8)
+    Image.fromarray(pixels).save(path, format='JPEG', quality=90)
+
+
+def full_decode(path, size):
+    with Image.open(path) as img:
+        return np.asarray(img.convert('RGB').resize(size), dtype=np.uint8)
+
+
+def measure(fn, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': round(statistics.median(samples), 2), 'min_ms': round(min(samples), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du décodage JPEG réduit')
+    parser.add_argument('--runs', type=int, default=5, help='Nombre de répétitions par mesure')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Tailles LARGEURxHAUTEUR séparées par des virgules')
+    parser.add_argument('--json', dest='json_file', help='Écrit le rapport dans ce fichier')
+    args = parser.parse_args()
+
+    classifier = EnhancedDogBreedClassifier()
+    target = (classifier.input_shape[1], classifier.input_shape[0])
+
+    report = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for spec in args.sizes.split(','):
+            width, height = (int(v) for v in spec.lower().split('x'))
+            path = os.path.join(tmp, f'{width}x{height}.jpg')
+            make_jpeg(path, width, height)
+
+            full = measure(lambda: full_decode(path, target), args.runs)
+            draft = measure(lambda: classifier.preprocess_image(path), args.runs)
+            report.append({
+                'size': f'{width}x{height}',
+                'megapixels': round(width * height / 1e6, 1),
+                'file_kb': round(os.path.getsize(path) / 1024),
+                'draft_scale': classifier.draft_scale('JPEG', (width, height)),
+                'full': full,
+                'draft': draft,
+                'speedup': round(full['median_ms'] / draft['median_ms'], 1),
+            })
+
+    print(f"{'taille':<12}{'Mpx':>6}{'Ko':>8}{'échelle':>9}{'complet':>10}{'draft':>10}{'gain':>7}  (ms, médiane)")
+    for row in report:
+        print(f"{row['size']:<12}{row['megapixels']:>6}{row['file_kb']:>8}{'1/' + str(row['draft_scale']):>9}"
+              f"{row['full']['median_ms']:>10}{row['draft']['median_ms']:>10}{row['speedup']:>6}x")
+
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRapport écrit dans {args.json_file}")
+
+
+if __name__ == '__main__':
+    main()
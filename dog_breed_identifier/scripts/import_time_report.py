@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Rapport de temps d'import au démarrage (basé sur ``python -X importtime``).
+
+Lance chaque cible dans un interpréteur neuf et affiche les modules les plus
+coûteux (temps cumulé et temps propre), pour surveiller le démarrage à froid
+de ``manage.py`` et du point d'entrée WSGI.
+
+Usage:
+    python scripts/import_time_report.py
+    python scripts/import_time_report.py --target wsgi --top 30
+    python scripts/import_time_report.py --json rapport.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    # manage.py sans commande: chargement de Django et des paramètres uniquement
+    'manage': [os.path.join(PROJECT_DIR, 'manage.py'), 'help'],
+    'wsgi': ['-c', 'import dog_identifier.wsgi'],
+    # WSGI + résolution d'URL: importe les vues comme le ferait la première requête
+    'wsgi+views': ['-c', "import dog_identifier.wsgi; from django.urls import resolve; resolve('/')"],
+}
+
+
+def parse_importtime(stderr):
+    """Extrait les lignes ``import time:`` en une liste de dicts (microsecondes)."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # ligne d'en-tête
+        name = fields[2].rstrip()
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_us': int(fields[0]),
+            'cumulative_us': int(fields[1]),
+        })
+    return modules
+
+
+def run_importtime(args, env=None):
+    """Exécute une commande Python avec ``-X importtime`` et renvoie les modules importés."""
+    process_env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    process_env.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    if env:
+        process_env.update(env)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + list(args),
+        cwd=PROJECT_DIR,
+        env=process_env,
+        capture_output=True,
+        text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def summarize(modules, top=20):
+    """Temps total (modules de premier niveau) et modules les plus lents."""
+    total_us = sum(m['cumulative_us'] for m in modules if m['depth'] == 0)
+    return {
+        'total_ms': round(total_us / 1000, 1),
+        'module_count': len(modules),
+        'top_cumulative': [
+            {'module': m['module'], 'ms': round(m['cumulative_us'] / 1000, 1)}
+            for m in sorted(modules, key=lambda m: m['cumulative_us'], reverse=True)[:top]
+        ],
+        'top_self': [
+            {'module': m['module'], 'ms': round(m['self_us'] / 1000, 1)}
+            for m in sorted(modules, key=lambda m: m['self_us'], reverse=True)[:top]
+        ],
+    }
+
+
+def print_summary(name, summary):
+    print(f"\n=== {name}: {summary['total_ms']} ms, {summary['module_count']} modules ===")
+    print(f"{'cumulé (ms)':>12}  module")
+    for entry in summary['top_cumulative']:
+        print(f"{entry['ms']:>12.1f}  {entry['module']}")
+    print(f"\n{'propre (ms)':>12}  module")
+    for entry in summary['top_self']:
+        print(f"{entry['ms']:>12.1f}  {entry['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rapport de temps d'import au démarrage")
+    parser.add_argument('--target', choices=sorted(TARGETS), action='append',
+                        help='Cible à mesurer (par défaut: toutes)')
+    parser.add_argument('--top', type=int, default=20, help='Nombre de modules affichés')
+    parser.add_argument('--json', dest='json_file', help='Écrit le rapport complet dans ce fichier')
+    args = parser.parse_args()
+
+    report = {}
+    for name in args.target or sorted(TARGETS):
+        summary = summarize(run_importtime(TARGETS[name]), top=args.top)
+        report[name] = summary
+        print_summary(name, summary)
+
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRapport écrit dans {args.json_file}")
+
+
+if __name__ == '__main__':
+    main()
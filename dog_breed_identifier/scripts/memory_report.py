@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Rapport mémoire des workers gunicorn (RSS, PSS et USS par processus).
+
+L'USS (unique set size) est la mémoire privée d'un processus: c'est ce que
+libérerait son arrêt. Avec ``ML_MODEL_LOADING=preload``, les fichiers de poids
+et les objets Python importés par le maître sont partagés entre les workers.
+
+Usage:
+    # Processus gunicorn existant
+    python scripts/memory_report.py --pid <pid du maître>
+
+    # Lance gunicorn en mode worker puis preload et compare l'USS par worker
+    python scripts/memory_report.py --compare --workers 3
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_memory(pid):
+    """Lit /proc/<pid>/smaps_rollup et renvoie RSS, PSS, USS et partagé (kB)."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    uss = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    return {
+        'pid': pid,
+        'rss_kb': fields.get('Rss', 0),
+        'pss_kb': fields.get('Pss', 0),
+        'uss_kb': uss,
+        'shared_kb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def child_pids(parent_pid):
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # Le nom du processus peut contenir des espaces: on repart après ')'
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent_pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def report(master_pid):
+    workers = [read_memory(pid) for pid in child_pids(master_pid)]
+    result = {'master': read_memory(master_pid), 'workers': workers}
+    if workers:
+        result['mean_worker_uss_kb'] = sum(w['uss_kb'] for w in workers) // len(workers)
+        result['total_pss_kb'] = result['master']['pss_kb'] + sum(w['pss_kb'] for w in workers)
+    return result
+
+
+def print_report(title, result):
+    print(f"\n=== {title} ===")
+    print(f"{'rôle':<8}{'pid':>8}{'RSS (MB)':>12}{'PSS (MB)':>12}{'USS (MB)':>12}{'partagé (MB)':>14}")
+    rows = [('maître', result['master'])] + [('worker', w) for w in result['workers']]
+    for role, mem in rows:
+        print(f"{role:<8}{mem['pid']:>8}{mem['rss_kb'] / 1024:>12.1f}{mem['pss_kb'] / 1024:>12.1f}"
+              f"{mem['uss_kb'] / 1024:>12.1f}{mem['shared_kb'] / 1024:>14.1f}")
+    if result['workers']:
+        print(f"USS moyen par worker: {result['mean_worker_uss_kb'] / 1024:.1f} MB, "
+              f"PSS total: {result['total_pss_kb'] / 1024:.1f} MB")
+
+
+def wait_until_ready(port, workers, timeout):
+    """Attend que /readyz réponde 200 plusieurs fois d'affilée (chaque worker préchauffé)."""
+    deadline = time.monotonic() + timeout
+    consecutive = 0
+    while time.monotonic() < deadline and consecutive < 3 * workers:
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/readyz', timeout=5) as response:
+                consecutive = consecutive + 1 if response.status == 200 else 0
+        except Exception:
+            consecutive = 0
+            time.sleep(0.5)
+    return consecutive >= 3 * workers
+
+
+def run_mode(mode, workers, port, timeout, settle):
+    env = dict(os.environ, ML_MODEL_LOADING=mode, WEB_CONCURRENCY=str(workers), PORT=str(port))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'dog_identifier.wsgi:application'],
+        cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_until_ready(port, workers, timeout):
+            print(f"Avertissement: {mode}: /readyz n'est pas stable après {timeout}s")
+        time.sleep(settle)
+        return report(process.pid)
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rapport mémoire des workers gunicorn')
+    parser.add_argument('--pid', type=int, help='PID du maître gunicorn à inspecter')
+    parser.add_argument('--compare', action='store_true', help='Compare les modes worker et preload')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--timeout', type=float, default=300, help='Attente maximale du préchauffage (s)')
+    parser.add_argument('--settle', type=float, default=2, help='Attente avant la mesure (s)')
+    parser.add_argument('--json', dest='json_file', help='Écrit le rapport dans ce fichier')
+    args = parser.parse_args()
+
+    results = {}
+    if args.pid:
+        results['pid'] = report(args.pid)
+        print_report(f'gunicorn {args.pid}', results['pid'])
+    if args.compare:
+        for mode in ('worker', 'preload'):
+            results[mode] = run_mode(mode, args.workers, args.port, args.timeout, args.settle)
+            print_report(f'ML_MODEL_LOADING={mode}', results[mode])
+        before = results['worker'].get('mean_worker_uss_kb')
+        after = results['preload'].get('mean_worker_uss_kb')
+        if before and after:
+            print(f"\nUSS par worker: {before / 1024:.1f} MB -> {after / 1024:.1f} MB "
+                  f"({(after - before) / before:+.0%})")
+    if not results:
+        parser.error('--pid ou --compare est requis')
+
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
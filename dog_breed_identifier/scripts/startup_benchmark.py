@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage à froid des workers WSGI et des commandes de gestion.
+
+Chaque mesure est prise dans un interpréteur neuf, répétée ``--runs`` fois:
+
+- ``wsgi_import``: import de ``dog_identifier.wsgi:application``
+- ``first_request``: première requête WSGI (``GET /``) après l'import
+- ``model_load``: construction + préchauffage du classifieur
+- ``manage_help`` et ``manage_validate_dataset``: durée totale du processus
+
+Une exécution supplémentaire sous ``-X importtime`` détaille le coût par module.
+
+Usage:
+    python scripts/startup_benchmark.py --runs 5
+    python scripts/startup_benchmark.py --runs 10 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from import_time_report import PROJECT_DIR, run_importtime, summarize  # noqa: E402
+
+# Exécuté dans un interpréteur neuf; affiche les durées en JSON sur la dernière ligne
+WSGI_PROBE = """
+import json, time
+start = time.perf_counter()
+from dog_identifier.wsgi import application
+imported = time.perf_counter()
+
+from wsgiref.util import setup_testing_defaults
+environ = {}
+setup_testing_defaults(environ)
+environ['PATH_INFO'] = '/'
+statuses = []
+b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+responded = time.perf_counter()
+
+from classifier import runtime
+runtime.get_classifier()
+loaded = time.perf_counter()
+
+print(json.dumps({
+    'wsgi_import': imported - start,
+    'first_request': responded - imported,
+    'first_request_status': statuses[0] if statuses else None,
+    'model_load': loaded - responded,
+    'model_build': runtime.get_load_timings().get('build_seconds'),
+    'model_warmup': runtime.get_load_timings().get('warmup_seconds'),
+}))
+"""
+
+COMMANDS = {
+    'manage_help': [os.path.join(PROJECT_DIR, 'manage.py'), 'help'],
+    'manage_validate_dataset': [os.path.join(PROJECT_DIR, 'manage.py'), 'validate_dataset'],
+}
+
+
+def _env():
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    return env
+
+
+def measure_wsgi():
+    """Une mesure WSGI dans un interpréteur neuf."""
+    result = subprocess.run(
+        [sys.executable, '-c', WSGI_PROBE],
+        cwd=PROJECT_DIR, env=_env(), capture_output=True, text=True,
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"Échec de la sonde WSGI: {result.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def measure_command(args):
+    """Durée totale (horloge murale) d'une commande dans un interpréteur neuf.
+
+    Renvoie None si la commande échoue: un plantage à l'import n'est pas un démarrage rapide.
+    """
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable] + args, cwd=PROJECT_DIR, env=_env(), capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        print(f"Échec de {' '.join(args)} (code {result.returncode}): {result.stderr[-2000:]}", file=sys.stderr)
+        return None
+    return elapsed
+
+
+def describe(samples):
+    samples = [s for s in samples if s is not None]
+    if not samples:
+        return None
+    return {
+        'min_ms': round(min(samples) * 1000, 1),
+        'median_ms': round(statistics.median(samples) * 1000, 1),
+        'mean_ms': round(statistics.mean(samples) * 1000, 1),
+        'max_ms': round(max(samples) * 1000, 1),
+        'runs': len(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du démarrage à froid')
+    parser.add_argument('--runs', type=int, default=5, help='Nombre de répétitions par mesure')
+    parser.add_argument('--top', type=int, default=15, help='Nombre de modules dans la répartition')
+    parser.add_argument('--skip-commands', action='store_true', help='Ne mesure que le worker WSGI')
+    parser.add_argument('--json', dest='json_file', help='Écrit le rapport complet dans ce fichier')
+    args = parser.parse_args()
+
+    samples = {}
+    for _ in range(args.runs):
+        for key, value in measure_wsgi().items():
+            if isinstance(value, (int, float)):
+                samples.setdefault(key, []).append(value)
+        if not args.skip_commands:
+            for name, command in COMMANDS.items():
+                samples.setdefault(name, []).append(measure_command(command))
+
+    report = {'timings': {name: describe(values) for name, values in samples.items()}}
+
+    # Répartition par module (exécution séparée pour ne pas fausser les mesures)
+    report['modules'] = {
+        'wsgi+first_request': summarize(run_importtime(['-c', WSGI_PROBE]), top=args.top),
+    }
+    if not args.skip_commands:
+        for name, command in COMMANDS.items():
+            report['modules'][name] = summarize(run_importtime(command), top=args.top)
+
+    print(f"{'mesure':<26}{'min':>10}{'médiane':>10}{'moyenne':>10}{'max':>10}  (ms)")
+    for name, timing in report['timings'].items():
+        if timing:
+            print(f"{name:<26}{timing['min_ms']:>10}{timing['median_ms']:>10}"
+                  f"{timing['mean_ms']:>10}{timing['max_ms']:>10}")
+
+    for name, summary in report['modules'].items():
+        print(f"\n--- imports {name}: {summary['total_ms']} ms ---")
+        for entry in summary['top_cumulative']:
+            print(f"{entry['ms']:>10.1f}  {entry['module']}")
+
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRapport écrit dans {args.json_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Entraînement du modèle rapide de la cascade (MobileNetV2 + tête des races).
+
+Les images d'entraînement sont rangées par race, un dossier par race
+(``Labrador_Retriever/photo.jpg``), comme dans ``ml_models/dataset``. Seule la
+tête des races est entraînée, MobileNetV2 restant figé. Le modèle écrit est
+celui que le service charge (ML_FAST_MODEL_PATH) et sur lequel
+``scripts/tune_cascade_threshold.py`` règle le seuil.
+
+Usage:
+    python scripts/train_fast_model.py --data-dir ml_models/dataset --output ml_models/weights/fast_model.keras
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_models.cascade import load_labelled_images  # noqa: E402
+from ml_models.enhanced_model import EnhancedDogBreedClassifier  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Entraînement du modèle rapide de la cascade')
+    parser.add_argument('--data-dir', required=True, help="Images d'entraînement, un dossier par race")
+    parser.add_argument('--output', required=True, help='Fichier .keras du modèle rapide entraîné')
+    parser.add_argument('--epochs', type=int, default=20)
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    classifier = EnhancedDogBreedClassifier(num_classes=70)
+    if not classifier.is_tensorflow_available:
+        sys.exit("TensorFlow est nécessaire pour entraîner le modèle rapide")
+    if classifier.build_fast_model() is None:
+        sys.exit("Impossible de construire le modèle MobileNetV2")
+
+    samples = load_labelled_images(args.data_dir, classifier.breeds[:classifier.num_classes])
+    if not samples:
+        sys.exit(f"Aucune image d'entraînement dans {args.data_dir}")
+    images = np.stack([classifier.preprocess_image(path) for path, _ in samples])
+    labels = np.array([label for _, label in samples])
+    print(f"{len(samples)} images, {len(set(labels))} races")
+
+    history = classifier.train_fast_model(images, labels, epochs=args.epochs, batch_size=args.batch_size)
+    if history is None:
+        sys.exit("Échec de l'entraînement du modèle rapide")
+    print(f"Précision de validation: {max(history.history['val_accuracy']):.3f}")
+
+    if not classifier.save_fast_model(args.output):
+        sys.exit(f"Impossible d'écrire {args.output}")
+    print(f"Modèle rapide écrit dans {args.output} (ML_FAST_MODEL_PATH={args.output})")
+
+
+if __name__ == '__main__':
+    main()
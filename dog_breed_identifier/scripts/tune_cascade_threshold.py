@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Réglage hors ligne du seuil de la cascade MobileNetV2 -> ResNet50.
+
+Les images de validation sont rangées par race, un dossier par race
+(``Labrador_Retriever/photo.jpg``), comme dans ``ml_models/dataset``. Les deux
+modèles prédisent chaque image une seule fois, puis la cascade est rejouée
+pour chaque seuil: on retient le plus bas (le moins d'escalades) dont la
+précision reste à ``--max-accuracy-drop`` de ResNet50 seul. Le modèle rapide
+est celui que le service charge (ML_FAST_MODEL_PATH), entraîné par
+``scripts/train_fast_model.py``.
+
+Usage:
+    python scripts/tune_cascade_threshold.py --data-dir ml_models/validation --fast-model fast.keras
+    python scripts/tune_cascade_threshold.py --data-dir ml_models/validation --fast-model fast.keras --model trained.keras --json cascade.json
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ml_models.cascade import load_labelled_images, tune_threshold  # noqa: E402
+from ml_models.enhanced_model import EnhancedDogBreedClassifier  # noqa: E402
+
+
+def predict_all(classifier, samples, batch_size):
+    fast, accurate = [], []
+    for start in range(0, len(samples), batch_size):
+        batch = np.stack([classifier.preprocess_image(path) for path, _ in samples[start:start + batch_size]])
+        fast.append(classifier.predict_fast(batch))
+        accurate.append(classifier.predict_accurate(batch))
+    return np.concatenate(fast), np.concatenate(accurate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Réglage du seuil de la cascade')
+    parser.add_argument('--data-dir', required=True, help='Images de validation, un dossier par race')
+    parser.add_argument('--model', help='Modèle ResNet50 entraîné à charger (sinon construit)')
+    parser.add_argument('--fast-model', default=os.environ.get('ML_FAST_MODEL_PATH'),
+                        help='Modèle rapide entraîné (défaut: ML_FAST_MODEL_PATH)')
+    parser.add_argument('--max-accuracy-drop', type=float, default=0.01,
+                        help='Perte de précision tolérée par rapport à ResNet50 seul')
+    parser.add_argument('--batch-size', type=int, default=16)
+    parser.add_argument('--json', dest='json_file', help='Écrit le rapport dans ce fichier')
+    args = parser.parse_args()
+
+    classifier = EnhancedDogBreedClassifier(num_classes=70)
+    if not classifier.is_tensorflow_available:
+        sys.exit("TensorFlow est nécessaire pour régler la cascade")
+    if not (args.model and classifier.load_model(args.model)) and classifier.build_model() is None:
+        sys.exit("Impossible de construire le modèle ResNet50")
+    if not args.fast_model:
+        sys.exit("--fast-model (ou ML_FAST_MODEL_PATH) est nécessaire: le seuil se règle sur le modèle rapide servi")
+    if not classifier.load_fast_model(args.fast_model):
+        sys.exit(f"Impossible de charger le modèle rapide {args.fast_model}")
+
+    samples = load_labelled_images(args.data_dir, classifier.breeds)
+    if not samples:
+        sys.exit(f"Aucune image de validation dans {args.data_dir}")
+
+    fast, accurate = predict_all(classifier, samples, args.batch_size)
+    labels = np.array([label for _, label in samples])
+    report = tune_threshold(fast, accurate, labels, max_accuracy_drop=args.max_accuracy_drop)
+    report['images'] = len(samples)
+
+    print(f"{len(samples)} images, précision ResNet50 seul: {report['reference_accuracy']:.3f}")
+    print(f"{'seuil':>7}{'précision':>12}{'escalade':>11}")
+    for row in report['table']:
+        print(f"{row['threshold']:>7.2f}{row['accuracy']:>12.3f}{row['escalation_rate']:>10.1%}")
+    if report['threshold'] is None:
+        print("\nAucun seuil ne respecte la perte de précision tolérée: cascade déconseillée")
+    else:
+        print(f"\nSeuil recommandé: ML_CASCADE_THRESHOLD={report['threshold']}")
+
+    if args.json_file:
+        with open(args.json_file, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Rapport écrit dans {args.json_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,56 +1,52 @@
 #!/usr/bin/env python3
 """
 Script de vérification de la santé de l'application.
+
+Interroge les sondes intégrées à l'application (/readyz, ou /healthz avec
+``--live``) au lieu d'initialiser Django à chaque appel.
 """
 
+import json
 import os
 import sys
-import django
-from django.core.management import execute_from_command_line
+import urllib.error
+import urllib.request
 
-# Configuration de Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
-django.setup()
 
-def check_database():
-    """Vérifie la connexion à la base de données."""
+def probe(url, timeout):
+    """Interroge une sonde et renvoie (code HTTP, corps JSON décodé)."""
     try:
-        from django.db import connection
-        connection.ensure_connection()
-        return True
-    except Exception as e:
-        print(f"Erreur de connexion à la base de données: {e}")
-        return False
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return response.status, json.loads(response.read() or b'{}')
+    except urllib.error.HTTPError as e:
+        try:
+            body = json.loads(e.read() or b'{}')
+        except ValueError:
+            body = {}
+        return e.code, body
 
-def check_ml_model():
-    """Vérifie que le modèle ML est disponible."""
-    try:
-        # Ajoutez ici la vérification de votre modèle ML
-        # Par exemple, vérifier que le fichier du modèle existe
-        model_path = os.path.join(os.path.dirname(__file__), 'ml_models', 'dog_breed_model.h5')
-        return os.path.exists(model_path)
-    except Exception as e:
-        print(f"Erreur avec le modèle ML: {e}")
-        return False
 
 def main():
     """Point d'entrée principal."""
-    print("Vérification de la santé de l'application...")
-    
-    # Vérifier la base de données
-    if not check_database():
-        print("❌ Échec de la vérification de la base de données")
+    live = '--live' in sys.argv[1:]
+    base_url = os.environ.get('HEALTH_CHECK_BASE_URL', f"http://127.0.0.1:{os.environ.get('PORT', '8000')}")
+    url = base_url.rstrip('/') + ('/healthz' if live else '/readyz')
+    timeout = float(os.environ.get('HEALTH_CHECK_TIMEOUT', '5'))
+
+    print(f"Vérification de la santé de l'application ({url})...")
+    try:
+        status, body = probe(url, timeout)
+    except Exception as e:
+        print(f"❌ Application injoignable: {e}")
         sys.exit(1)
-    
-    print("✅ Base de données OK")
-    
-    # Vérifier le modèle ML
-    if not check_ml_model():
-        print("❌ Échec de la vérification du modèle ML")
+
+    if status != 200:
+        print(f"❌ Application non disponible (HTTP {status}): {json.dumps(body)}")
         sys.exit(1)
-    
-    print("✅ Modèle ML OK")
+
+    print(f"✅ {json.dumps(body)}")
     print("✅ Tous les systèmes sont opérationnels")
 
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -14,7 +14,8 @@ python manage.py collectstatic --noinput --verbosity=0
 
 # Démarrer l'application avec Gunicorn sur le port fourni par Render
 echo "Starting application on port $PORT..."
-exec gunicorn --bind 0.0.0.0:$PORT --chdir /app/dog_breed_identifier dog_identifier.wsgi:application
+# Workers et threads TensorFlow dimensionnés selon les ressources du conteneur
+exec python manage.py serve --bind 0.0.0.0:$PORT
 
 # Exit on any error
 set -e
@@ -45,4 +46,4 @@ python dog_breed_identifier/manage.py migrate
 
 # Start the application
 echo "Starting application..."
-exec gunicorn --bind 0.0.0.0:$PORT --chdir /app/dog_breed_identifier dog_identifier.wsgi:application
\ No newline at end of file
+exec python dog_breed_identifier/manage.py serve --bind 0.0.0.0:$PORT
\ No newline at end of file
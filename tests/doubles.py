@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Doublures partagées par les tests (importées directement: ``from doubles import FakeClock``).
+"""
+
+import numpy as np
+
+
+class FakeClock:
+    """Horloge monotone que le test avance lui-même (``clock.now += 2.0``)"""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FixedModel:
+    """Modèle Keras factice: renvoie les premières lignes de ``probabilities`` et note ses appels"""
+
+    def __init__(self, probabilities):
+        self.probabilities = np.asarray(probabilities, dtype=np.float32)
+        self.calls = []
+        self.shapes = []
+
+    def __call__(self, inputs, training=False):
+        self.calls.append(len(inputs))
+        self.shapes.append(tuple(np.shape(inputs)[1:3]))
+        return self.probabilities[:len(inputs)]
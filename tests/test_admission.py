@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Tests du contrôle d'admission devant la file d'inférence.
+"""
+
+from ml_models.admission import AdmissionController
+
+
+class FakeQueue:
+    def __init__(self, depth, ewma_batch_seconds, max_batch_size=8):
+        self._depth = depth
+        self.ewma_batch_seconds = ewma_batch_seconds
+        self.max_batch_size = max_batch_size
+
+    def depth(self):
+        return self._depth
+
+
+def test_admits_without_latency_history():
+    controller = AdmissionController(FakeQueue(depth=100, ewma_batch_seconds=None))
+    assert controller.admit() == (True, 0)
+
+
+def test_admits_when_predicted_wait_is_within_budget():
+    # 9 images devant => 2 lots de 0,5 s
+    controller = AdmissionController(FakeQueue(depth=9, ewma_batch_seconds=0.5), wait_budget_seconds=2)
+    assert controller.predicted_wait() == 1.0
+    assert controller.admit() == (True, 0)
+
+
+def test_sheds_with_retry_after_when_over_budget():
+    # 40 images devant => 6 lots de 1 s
+    controller = AdmissionController(FakeQueue(depth=40, ewma_batch_seconds=1.0), wait_budget_seconds=2)
+    assert controller.admit() == (False, 4)
+
+
+def test_sheds_over_max_depth():
+    controller = AdmissionController(FakeQueue(depth=32, ewma_batch_seconds=0.01), max_queue_depth=32)
+    admitted, retry_after = controller.admit()
+    assert not admitted and retry_after >= 1
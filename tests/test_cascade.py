@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests de la cascade MobileNetV2 -> ResNet50 et du réglage de son seuil.
+"""
+
+import numpy as np
+
+from ml_models.cascade import cascade_outcome, tune_threshold
+from ml_models.enhanced_model import EnhancedDogBreedClassifier
+from ml_models.metrics import metrics
+
+from doubles import FixedModel
+
+
+def test_only_unconfident_images_escalate():
+    classifier = EnhancedDogBreedClassifier(cascade_threshold=0.8)
+    classifier.is_tensorflow_available = True
+    classifier.fast_model = FixedModel([[0.9, 0.1], [0.6, 0.4], [0.95, 0.05]])
+    classifier.model = FixedModel([[0.2, 0.8]])
+    metrics.reset()
+
+    probabilities = classifier.predict_batch(np.zeros((3, 4, 4, 3), dtype=np.uint8))
+
+    assert classifier.model.calls == [1]
+    np.testing.assert_allclose(probabilities, [[0.9, 0.1], [0.2, 0.8], [0.95, 0.05]])
+    counters = metrics.snapshot()['counters']
+    assert counters['cascade.items'] == 3
+    assert counters['cascade.escalated'] == 1
+
+
+def test_cascade_outcome():
+    fast = [[0.9, 0.1], [0.55, 0.45]]
+    accurate = [[0.8, 0.2], [0.1, 0.9]]
+    outcome = cascade_outcome(fast, accurate, labels=[0, 1], threshold=0.6)
+    assert outcome == {'threshold': 0.6, 'accuracy': 1.0, 'escalation_rate': 0.5}
+
+
+def test_tune_threshold_picks_the_lowest_accurate_enough():
+    fast = [[0.9, 0.1], [0.7, 0.3], [0.6, 0.4]]
+    accurate = [[0.9, 0.1], [0.2, 0.8], [0.3, 0.7]]
+    labels = [0, 1, 1]
+    report = tune_threshold(fast, accurate, labels, max_accuracy_drop=0.0, thresholds=(0.5, 0.65, 0.75, 0.95))
+    assert report['reference_accuracy'] == 1.0
+    assert report['threshold'] == 0.75
+
+
+def test_cascade_requires_a_trained_fast_model(tmp_path, monkeypatch):
+    import os
+
+    import django
+    import pytest
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.conf import settings
+    from django.core.exceptions import ImproperlyConfigured
+
+    from classifier import runtime
+
+    classifier = EnhancedDogBreedClassifier(cascade_threshold=0.8)
+    monkeypatch.setattr(settings, 'ML_FAST_MODEL_PATH', '')
+    with pytest.raises(ImproperlyConfigured):
+        runtime.build_auxiliary_models(classifier)
+
+    fast_model = str(tmp_path / 'fast_model.keras')
+    monkeypatch.setattr(settings, 'ML_FAST_MODEL_PATH', fast_model)
+    with pytest.raises(ImproperlyConfigured):
+        runtime.build_auxiliary_models(classifier)
+
+    # Mode simulation: le fichier de simulation tient lieu de modèle entraîné
+    open(fast_model + '.sim', 'w').close()
+    runtime.build_auxiliary_models(classifier)
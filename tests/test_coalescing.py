@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests du regroupement des prédictions identiques simultanées.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ml_models.coalescing import SingleFlight
+
+
+def test_concurrent_calls_share_one_computation():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return 'labrador'
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(single_flight.do, 'hash', compute)
+        started.wait(timeout=5)
+        followers = [executor.submit(single_flight.do, 'hash', compute) for _ in range(3)]
+        # Laisser aux suivants le temps de rejoindre le calcul en cours
+        time.sleep(0.2)
+        release.set()
+        results = [leader.result(timeout=5)] + [f.result(timeout=5) for f in followers]
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ['labrador'] * 4
+    assert [shared for _, shared in results] == [False, True, True, True]
+    assert single_flight.in_flight() == 0
+
+
+def test_key_is_released_after_completion_and_errors():
+    single_flight = SingleFlight()
+    assert single_flight.do('a', lambda: 1) == (1, False)
+    assert single_flight.do('a', lambda: 2) == (2, False)
+
+    def fail():
+        raise ValueError('illisible')
+
+    try:
+        single_flight.do('b', fail)
+    except ValueError:
+        pass
+    assert single_flight.in_flight() == 0
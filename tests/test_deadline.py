@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Tests des échéances transmises à la file d'inférence.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from ml_models.deadline import Deadline, DeadlineExceeded
+from ml_models.inference_queue import InferenceQueue
+
+from doubles import FakeClock
+
+
+def test_remaining_and_check():
+    clock = FakeClock()
+    deadline = Deadline.after(2.0, clock=clock)
+    assert deadline.remaining() == 2.0
+    deadline.check(1.5)
+    clock.now += 1.0
+    with pytest.raises(DeadlineExceeded):
+        deadline.check(1.5)
+    clock.now += 5.0
+    assert deadline.expired() and deadline.remaining() == 0.0
+
+
+def test_expired_items_skip_inference():
+    release = threading.Event()
+    seen = []
+
+    def predict_fn(batch):
+        release.wait(timeout=5)
+        seen.append(len(batch))
+        return np.zeros((len(batch), 2), dtype=np.float32)
+
+    clock = FakeClock()
+    inference_queue = InferenceQueue(predict_fn, max_batch_size=1)
+    blocker = inference_queue.submit(np.zeros((1, 1, 1), dtype=np.uint8))
+    late = inference_queue.submit(np.zeros((1, 1, 1), dtype=np.uint8), deadline=Deadline.after(1.0, clock=clock))
+    clock.now += 2.0  # l'échéance passe pendant que le premier lot bloque la file
+    release.set()
+
+    blocker.result(timeout=5)
+    with pytest.raises(DeadlineExceeded):
+        late.result(timeout=5)
+    assert seen == [1]
+    assert inference_queue.stats()['expired'] == 1
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests du filtre « est-ce un chien ? » placé avant la tête des races.
+"""
+
+import numpy as np
+
+from ml_models.enhanced_model import EnhancedDogBreedClassifier
+from ml_models.metrics import metrics
+
+from doubles import FixedModel
+
+
+def imagenet_probabilities(dog_mass):
+    row = np.full(1000, (1 - dog_mass) / (1000 - 118), dtype=np.float32)
+    row[151:269] = dog_mass / 118
+    return row
+
+
+def test_non_dogs_skip_the_breed_head():
+    classifier = EnhancedDogBreedClassifier(num_classes=3, dog_gate_threshold=0.5)
+    classifier.is_tensorflow_available = True
+    # Image 0: un chat; image 1: un chien
+    classifier.gate_model = FixedModel([imagenet_probabilities(0.05), imagenet_probabilities(0.9)])
+    classifier.model = FixedModel([[0.7, 0.2, 0.1]])
+    metrics.reset()
+
+    probabilities = classifier.predict_batch(np.zeros((2, 4, 4, 3), dtype=np.uint8))
+
+    assert classifier.model.calls == [1]
+    assert not probabilities[0].any()
+    np.testing.assert_allclose(probabilities[1], [0.7, 0.2, 0.1])
+    counters = metrics.snapshot()['counters']
+    assert counters['gate.items'] == 2
+    assert counters['gate.rejected'] == 1
+
+
+def test_gate_disabled_by_default():
+    classifier = EnhancedDogBreedClassifier(num_classes=3)
+    classifier.is_tensorflow_available = True
+    classifier.model = FixedModel([[0.7, 0.2, 0.1]])
+    classifier.gate_model = FixedModel([imagenet_probabilities(0.0)])
+    assert classifier.predict_batch(np.zeros((1, 4, 4, 3), dtype=np.uint8)).any()
+    assert classifier.gate_model.calls == []
+
+
+def test_gate_also_filters_lower_resolution_batches():
+    classifier = EnhancedDogBreedClassifier(num_classes=3, dog_gate_threshold=0.5, resolutions=(160,))
+    classifier.is_tensorflow_available = True
+    classifier.gate_model = FixedModel([imagenet_probabilities(0.05), imagenet_probabilities(0.9)])
+    classifier.model = FixedModel([[0.7, 0.2, 0.1]])
+    classifier.serving_function = lambda resolution: classifier.model
+
+    probabilities = classifier.predict_batch(np.zeros((2, 160, 160, 3), dtype=np.uint8))
+
+    # Le filtre voit l'image à sa résolution d'entrée, la tête des races à celle demandée
+    assert classifier.gate_model.shapes == [(224, 224)]
+    assert classifier.model.shapes == [(160, 160)]
+    assert not probabilities[0].any()
+    np.testing.assert_allclose(probabilities[1], [0.7, 0.2, 0.1])
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests de l'ensemble de modèles exécutés en parallèle.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from ml_models.ensemble import EnsemblePredictor
+from ml_models.metrics import metrics
+
+
+def slow_member(probabilities, seconds):
+    def predict(batch):
+        time.sleep(seconds)
+        return np.tile(np.asarray(probabilities, dtype=np.float32), (len(batch), 1))
+    return predict
+
+
+def test_members_run_concurrently():
+    ensemble = EnsemblePredictor({
+        'a': slow_member([1.0, 0.0], 0.2),
+        'b': slow_member([0.0, 1.0], 0.2),
+    })
+    metrics.reset()
+    start = time.perf_counter()
+    probabilities, timings = ensemble.predict_with_timings(np.zeros((3, 4, 4, 3), dtype=np.uint8))
+    elapsed = time.perf_counter() - start
+
+    np.testing.assert_allclose(probabilities, [[0.5, 0.5]] * 3)
+    # Le plus lent des membres, pas la somme
+    assert elapsed < 0.35
+    assert timings['a'] >= 0.2 and timings['b'] >= 0.2
+    assert timings['ensemble'] < timings['a'] + timings['b']
+
+    timing_names = metrics.snapshot()['timings']
+    assert {'ensemble.seconds', 'ensemble.member.a.seconds', 'ensemble.member.b.seconds'} <= set(timing_names)
+    ensemble.shutdown()
+
+
+def test_weighted_average():
+    ensemble = EnsemblePredictor(
+        {'a': slow_member([1.0, 0.0], 0), 'b': slow_member([0.0, 1.0], 0)},
+        weights={'a': 3},
+    )
+    np.testing.assert_allclose(ensemble.predict_batch(np.zeros((1, 2))), [[0.75, 0.25]])
+
+
+def test_each_member_has_its_own_thread():
+    seen = {}
+
+    def member(name):
+        def predict(batch):
+            seen[name] = threading.current_thread().name
+            return np.ones((len(batch), 2), dtype=np.float32)
+        return predict
+
+    EnsemblePredictor({'a': member('a'), 'b': member('b')}).predict_batch(np.zeros((1, 2)))
+    assert seen['a'].startswith('ensemble-a') and seen['b'].startswith('ensemble-b')
+
+
+def test_mismatched_members_are_refused():
+    ensemble = EnsemblePredictor({'a': slow_member([1.0, 0.0], 0), 'b': slow_member([1.0, 0.0, 0.0], 0)})
+    with pytest.raises(ValueError):
+        ensemble.predict_batch(np.zeros((1, 2)))
+
+
+def _runtime():
+    import os
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from classifier import runtime
+    return runtime
+
+
+def test_remote_members_do_not_hold_the_model_lock(monkeypatch):
+    runtime = _runtime()
+    remote_started = threading.Event()
+    lock_was_free = []
+
+    def remote(batch):
+        remote_started.set()
+        # Un membre distant lent ne doit pas bloquer les files locales
+        lock_was_free.append(runtime._model_lock.acquire(timeout=1))
+        runtime._model_lock.release()
+        return np.ones((len(batch), 2), dtype=np.float32)
+
+    monkeypatch.setattr(runtime, '_ensemble', EnsemblePredictor({'distant': remote}))
+    runtime._predict_ensemble(np.zeros((1, 4, 4, 3), dtype=np.uint8))
+    assert remote_started.is_set() and lock_was_free == [True]
+
+
+def test_ensemble_applies_the_dog_gate(monkeypatch):
+    from ml_models.enhanced_model import EnhancedDogBreedClassifier
+
+    runtime = _runtime()
+    classifier = EnhancedDogBreedClassifier(input_shape=(4, 4, 3), num_classes=2, dog_gate_threshold=0.5)
+    classifier.model = object()
+    dog, cat = np.zeros(1000, dtype=np.float32), np.zeros(1000, dtype=np.float32)
+    dog[151], cat[281] = 1.0, 1.0
+    classifier.gate_model = lambda inputs, training=False: np.stack([cat, dog])[:len(inputs)]
+    seen = []
+
+    def member(batch):
+        seen.append(len(batch))
+        return np.tile(np.array([0.9, 0.1], dtype=np.float32), (len(batch), 1))
+
+    monkeypatch.setattr(runtime, 'get_classifier', lambda warmup=True: classifier)
+    monkeypatch.setattr(runtime, '_ensemble', EnsemblePredictor({'distant': member}))
+    probabilities = runtime._predict_ensemble(np.zeros((2, 4, 4, 3), dtype=np.uint8))
+
+    # Image 0: un chat, jamais envoyé aux membres
+    assert seen == [1]
+    np.testing.assert_allclose(probabilities, [[0.0, 0.0], [0.9, 0.1]])
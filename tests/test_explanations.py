@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests des explications Grad-CAM (superposition PNG et calculs en arrière-plan).
+"""
+
+import io
+import threading
+
+import numpy as np
+from PIL import Image
+
+from ml_models.explanations import BUSY, FAILED, PENDING, ExplanationJobs, colorize, encode_png, overlay
+
+
+def test_colorize_goes_from_blue_to_red():
+    colors = colorize(np.array([[0.0, 1.0]]))
+    assert colors.shape == (1, 2, 3) and colors.dtype == np.uint8
+    assert colors[0, 0, 2] > colors[0, 0, 0]  # faible: bleu
+    assert colors[0, 1, 0] > colors[0, 1, 2]  # fort: rouge
+
+
+def test_overlay_is_a_compressed_png_of_the_image_size():
+    image = np.full((224, 224, 3), 128, dtype=np.uint8)
+    heatmap = np.zeros((7, 7), dtype=np.float32)
+    heatmap[3, 3] = 1.0
+
+    png = encode_png(overlay(image, heatmap))
+    decoded = Image.open(io.BytesIO(png))
+    assert decoded.format == 'PNG' and decoded.size == (224, 224)
+    assert len(png) < image.nbytes / 4
+    pixels = np.asarray(decoded)
+    # Le centre (zone expliquée) est plus rouge que le coin
+    assert pixels[112, 112, 0] > pixels[0, 0, 0]
+
+
+def test_jobs_run_once_per_key_in_the_background():
+    release = threading.Event()
+    done = threading.Event()
+    calls = []
+
+    def compute(path):
+        release.wait(timeout=5)
+        calls.append(path)
+        done.set()
+
+    jobs = ExplanationJobs(compute, max_workers=1, max_pending=1)
+    assert jobs.submit('a', 'a.jpg') == PENDING
+    assert jobs.submit('a', 'a.jpg') == PENDING
+    assert jobs.submit('b', 'b.jpg') == BUSY
+    release.set()
+    assert done.wait(timeout=5)
+    assert calls == ['a.jpg']
+
+
+def test_failures_are_remembered():
+    failed = threading.Event()
+
+    def compute():
+        failed.set()
+        raise RuntimeError('pas de modèle')
+
+    jobs = ExplanationJobs(compute)
+    jobs.submit('a')
+    assert failed.wait(timeout=5)
+    for _ in range(100):
+        if jobs.pending() == 0:
+            break
+        threading.Event().wait(0.01)
+    assert jobs.submit('a') == FAILED
+    assert jobs.status('a') == FAILED
+    assert jobs.error('a') == 'pas de modèle'
+
+
+def test_failures_expire():
+    attempts = []
+    done = threading.Event()
+
+    def compute():
+        attempts.append(1)
+        done.set()
+        if len(attempts) == 1:
+            raise RuntimeError('modèle en cours de rechargement')
+
+    jobs = ExplanationJobs(compute, failure_ttl=0)
+    jobs.submit('a')
+    assert done.wait(timeout=5)
+    for _ in range(100):
+        if jobs.pending() == 0:
+            break
+        threading.Event().wait(0.01)
+    # Échec oublié: le calcul est retenté
+    done.clear()
+    assert jobs.submit('a') == PENDING
+    assert done.wait(timeout=5)
+    assert len(attempts) == 2
+
+
+def test_explanation_is_computed_only_on_request(tmp_path, monkeypatch):
+    import os
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+    from django.test import RequestFactory, override_settings
+
+    from classifier import runtime, views
+
+    release = threading.Event()
+    calls = []
+
+    def compute(image_path, output_path):
+        calls.append(image_path)
+        release.wait(timeout=5)
+
+    jobs = ExplanationJobs(compute)
+    monkeypatch.setattr(runtime, 'explanations_available', lambda: True)
+    monkeypatch.setattr(runtime, 'get_explanation_jobs', lambda: jobs)
+    factory = RequestFactory()
+
+    # Image envoyée dans un MEDIA_ROOT temporaire, indépendant de media/dog_images
+    with override_settings(MEDIA_ROOT=str(tmp_path)):
+        jpeg = io.BytesIO()
+        Image.new('RGB', (32, 32), (120, 80, 40)).save(jpeg, format='JPEG')
+        name = os.path.basename(default_storage.save('dog_images/chien.jpg', ContentFile(jpeg.getvalue())))
+
+        # Afficher la page ne lance rien
+        assert views.explanation(factory.get(f'/explanation/{name}/'), name).status_code == 404
+        assert calls == []
+
+        response = views.explanation(factory.post(f'/explanation/{name}/'), name)
+        assert response.status_code == 202
+        assert views.explanation(factory.get(f'/explanation/{name}/'), name).status_code == 202
+        release.set()
+        for _ in range(100):
+            if jobs.pending() == 0:
+                break
+            threading.Event().wait(0.01)
+    assert len(calls) == 1
+    assert calls[0].startswith(str(tmp_path))
+
+
+def test_grad_cam_pass_runs_in_the_bulk_lane_of_the_inference_queue(tmp_path, monkeypatch):
+    import os
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from classifier import runtime
+
+    threads = []
+
+    class FakeClassifier:
+        def preprocess_image(self, image_path):
+            return np.full((8, 8, 3), 128, dtype=np.uint8)
+
+        def grad_cam(self, image):
+            threads.append(threading.current_thread().name)
+            return np.ones((2, 2), dtype=np.float32), 0
+
+    submitted = []
+    inference_queue = runtime.get_inference_queue()
+    submit_call = inference_queue.submit_call
+    monkeypatch.setattr(runtime, 'get_classifier', lambda warmup=True: FakeClassifier())
+    monkeypatch.setattr(
+        inference_queue, 'submit_call', lambda fn, lane: submitted.append(lane) or submit_call(fn, lane=lane)
+    )
+
+    output_path = str(tmp_path / 'explanations' / 'chien.jpg.png')
+    runtime._compute_explanation(str(tmp_path / 'chien.jpg'), output_path)
+    # Sur le thread de la file, derrière les prédictions interactives
+    assert submitted == ['bulk'] and threads == ['inference-queue']
+    assert Image.open(output_path).format == 'PNG'
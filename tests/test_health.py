@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests des sondes /healthz et /readyz.
+"""
+
+import json
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+
+from classifier import health, runtime  # noqa: E402
+
+
+def test_healthz_has_no_dependencies():
+    response = health.healthz(RequestFactory().get('/healthz'))
+    assert response.status_code == 200
+    assert json.loads(response.content) == {'status': 'ok'}
+
+
+def test_readyz_reports_model_queue_and_database():
+    runtime.get_classifier()
+    response = health.readyz(RequestFactory().get('/readyz'))
+    body = json.loads(response.content)
+    assert response.status_code == 200, body
+    assert body['model']['loaded'] and body['model']['warmed']
+    assert body['inference_queue']['depth'] == 0
+    assert body['database']['ok']
+
+
+def test_database_check_is_cached():
+    first = health.check_database()
+    assert health.check_database() is first
+
+
+def test_database_check_recovers_after_connection_loss():
+    from django.db import connection
+
+    def break_connection():
+        connection.ensure_connection()
+        connection.close_at = None  # connexion persistante (CONN_MAX_AGE=None)
+        # Connexion coupée sous Django (redémarrage de la base, délai d'inactivité)
+        connection.connection.close()
+
+    health._db_executor.submit(break_connection).result()
+    health._cache.clear()
+    assert not health.check_database()['ok']
+
+    # Le cache expiré, la sonde suivante rouvre une connexion
+    health._cache.clear()
+    assert health.check_database()['ok']
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests du déchargement du modèle après inactivité et de son rechargement.
+"""
+
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+django.setup()
+
+from django.test import override_settings  # noqa: E402
+
+from classifier import runtime  # noqa: E402
+from ml_models.idle import IdleUnloader  # noqa: E402
+from ml_models.metrics import metrics  # noqa: E402
+
+from doubles import FakeClock  # noqa: E402
+
+
+def test_unloads_only_after_idle_timeout():
+    clock = FakeClock()
+    calls = []
+    unloader = IdleUnloader(lambda: calls.append(clock.now) or True, idle_seconds=60, clock=clock)
+    clock.now = 59
+    assert not unloader.check()
+    clock.now = 61
+    assert unloader.check()
+    assert calls == [61]
+
+
+def test_never_unloads_while_busy():
+    clock = FakeClock()
+    unloader = IdleUnloader(lambda: True, idle_seconds=10, busy_fn=lambda: True, clock=clock)
+    clock.now = 100
+    assert not unloader.check()
+
+
+def test_unload_saves_artifact_and_reload_records_timings(tmp_path, monkeypatch):
+    artifact = str(tmp_path / 'serving_model.keras')
+    process_artifact = str(tmp_path / f'serving_model.{os.getpid()}.keras')
+    # Laissé par un autre worker ou un ancien déploiement: jamais rechargé
+    with open(artifact, 'w') as f:
+        f.write('stale')
+    classifier = runtime.get_classifier()
+    loaded = []
+
+    def save_model(filepath):
+        with open(filepath, 'w') as f:
+            f.write('model')
+
+    monkeypatch.setattr(classifier, 'save_model', save_model)
+    monkeypatch.setattr(classifier, 'load_model', lambda filepath: loaded.append(filepath) or True)
+    classifier.model = object()
+    metrics.reset()
+    try:
+        with override_settings(ML_MODEL_ARTIFACT=artifact):
+            assert runtime.unload_model()
+            assert os.path.exists(process_artifact)
+            assert runtime.is_idle_unloaded()
+            assert classifier.model is None
+
+            assert runtime.get_classifier() is classifier
+            assert not runtime.is_idle_unloaded()
+            assert loaded == [process_artifact]
+            assert not os.path.exists(process_artifact)
+    finally:
+        classifier.model = None
+        runtime._idle_unloaded = False
+
+    snapshot = metrics.snapshot()
+    assert snapshot['counters']['model.unloads'] == 1
+    assert snapshot['counters']['model.reloads'] == 1
+    assert snapshot['timings']['model.reload_seconds']['count'] == 1
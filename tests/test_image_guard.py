@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests de l'inspection des images par leur en-tête (avant décodage).
+"""
+
+import io
+
+import pytest
+from PIL import Image
+
+from ml_models.image_guard import ImageRejected, inspect_image
+
+
+def encode(size, image_format='PNG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, (120, 80, 40)).save(buffer, format=image_format)
+    buffer.seek(0)
+    return buffer
+
+
+def test_reads_format_and_dimensions():
+    header = inspect_image(encode((64, 48), 'JPEG'))
+    assert (header.format, header.width, header.height) == ('JPEG', 64, 48)
+    assert header.size_bytes > 0
+
+
+def test_rewinds_the_file():
+    fileobj = encode((16, 16))
+    inspect_image(fileobj)
+    assert fileobj.tell() == 0
+
+
+def test_rejects_too_many_bytes():
+    with pytest.raises(ImageRejected) as excinfo:
+        inspect_image(encode((64, 64)), max_bytes=10)
+    assert excinfo.value.status == 413
+
+
+def test_rejects_too_many_pixels_without_decoding():
+    # Une PNG unie de 4000x4000 pèse quelques dizaines de Ko: typique d'une bombe
+    with pytest.raises(ImageRejected) as excinfo:
+        inspect_image(encode((4000, 4000)), max_pixels=10_000_000)
+    assert excinfo.value.status == 413
+
+
+def test_rejects_unsupported_format():
+    with pytest.raises(ImageRejected) as excinfo:
+        inspect_image(encode((16, 16), 'BMP'))
+    assert excinfo.value.status == 415
+
+
+def test_rejects_non_images():
+    with pytest.raises(ImageRejected) as excinfo:
+        inspect_image(io.BytesIO(b'not an image at all'))
+    assert excinfo.value.status == 415
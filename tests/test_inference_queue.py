@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests de la file d'inférence avec regroupement en lots.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from ml_models.inference_queue import BULK, INTERACTIVE, InferenceQueue
+
+
+def test_concurrent_submissions_are_batched():
+    release = threading.Event()
+    batch_sizes = []
+
+    def predict_fn(batch):
+        release.wait(timeout=5)
+        batch_sizes.append(len(batch))
+        return batch.reshape(len(batch), -1).astype(np.float32)
+
+    inference_queue = InferenceQueue(predict_fn, max_batch_size=4, max_wait_ms=50)
+    # Le premier lot bloque le thread de travail; les suivants s'accumulent
+    first = inference_queue.submit(np.zeros((1, 1, 1), dtype=np.uint8))
+    futures = [inference_queue.submit(np.full((1, 1, 1), i, dtype=np.uint8)) for i in range(1, 4)]
+    release.set()
+
+    assert first.result(timeout=5)[0] == 0
+    assert [int(f.result(timeout=5)[0]) for f in futures] == [1, 2, 3]
+    assert sum(batch_sizes) == 4
+    assert len(batch_sizes) <= 2
+    assert inference_queue.depth() == 0
+
+
+def test_errors_are_propagated_to_every_future():
+    def predict_fn(batch):
+        raise RuntimeError('boom')
+
+    inference_queue = InferenceQueue(predict_fn)
+    future = inference_queue.submit(np.zeros((2, 2, 3), dtype=np.uint8))
+    try:
+        future.result(timeout=5)
+    except RuntimeError as e:
+        assert str(e) == 'boom'
+    else:
+        raise AssertionError('exception attendue')
+
+
+def blocked_queue(max_bulk_wait_ms=2000):
+    """File dont le premier lot reste bloqué jusqu'à ``release``; les lots servis sont notés"""
+    release = threading.Event()
+    served = []
+
+    def predict_fn(batch):
+        release.wait(timeout=5)
+        served.append([int(value) for value in batch.reshape(len(batch), -1)[:, 0]])
+        return batch.reshape(len(batch), -1).astype(np.float32)
+
+    inference_queue = InferenceQueue(predict_fn, max_batch_size=2, max_wait_ms=0, max_bulk_wait_ms=max_bulk_wait_ms)
+    blocker = inference_queue.submit(np.zeros((1,), dtype=np.uint8))
+    # Attendre que le thread de travail ait pris le premier lot
+    for _ in range(500):
+        if inference_queue.lane_depth(INTERACTIVE) == 0 and inference_queue.depth() == 1:
+            break
+        time.sleep(0.01)
+    return inference_queue, blocker, release, served
+
+
+def image(value):
+    return np.full((1,), value, dtype=np.uint8)
+
+
+def test_interactive_lane_goes_before_bulk():
+    inference_queue, blocker, release, served = blocked_queue()
+    bulk = [inference_queue.submit(image(10 + i), lane=BULK) for i in range(4)]
+    interactive = inference_queue.submit(image(1), lane=INTERACTIVE)
+
+    assert inference_queue.depth(INTERACTIVE) == 2  # l'image interactive + le lot en cours
+    assert inference_queue.depth() == 6
+    release.set()
+    for future in [blocker, interactive] + bulk:
+        future.result(timeout=5)
+
+    # L'image interactive part dans le premier lot libre, complété par une image en masse
+    assert served[1] == [1, 10]
+    stats = inference_queue.stats()['lanes']
+    assert stats[INTERACTIVE]['items'] == 2 and stats[BULK]['items'] == 4
+    assert stats[BULK]['ewma_wait_seconds'] is not None and stats[BULK]['depth'] == 0
+
+
+def test_old_bulk_images_are_not_starved():
+    inference_queue, blocker, release, served = blocked_queue(max_bulk_wait_ms=0)
+    bulk = inference_queue.submit(image(10), lane=BULK)
+    interactive = [inference_queue.submit(image(1 + i)) for i in range(2)]
+    release.set()
+    for future in [blocker, bulk] + interactive:
+        future.result(timeout=5)
+
+    assert served[1][0] == 10
+    assert inference_queue.stats()['lanes'][BULK]['promoted'] >= 1
+
+
+def test_calls_wait_their_turn_in_the_bulk_lane():
+    inference_queue, blocker, release, served = blocked_queue()
+    call = inference_queue.submit_call(lambda: served.append('grad-cam') or 'carte')
+    interactive = [inference_queue.submit(image(1 + i)) for i in range(2)]
+
+    # L'appel compte dans la profondeur vue par l'admission, pas devant les images interactives
+    assert inference_queue.depth() == 4
+    assert inference_queue.depth(INTERACTIVE) == 3
+    release.set()
+    assert call.result(timeout=5) == 'carte'
+    for future in [blocker] + interactive:
+        future.result(timeout=5)
+    assert served == [[0], [1, 2], 'grad-cam']
+
+
+def test_unknown_lane_is_refused():
+    inference_queue = InferenceQueue(lambda batch: batch)
+    try:
+        inference_queue.submit(image(0), lane='urgent')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError attendue')
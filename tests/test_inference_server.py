@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests du serveur d'inférence sur socket Unix et de son client.
+"""
+
+import os
+import socket
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+
+from ml_models.inference_server import (
+    MAGIC, PROBABILITY_DTYPE, REQUEST_HEADER, RESPONSE_HEADER, VERSION, InferenceClient, InferenceServer,
+    InferenceServerError, PeerClosedError, recv_exact,
+)
+
+
+class FakeClassifier:
+    is_loaded = True
+    is_warmed = True
+    is_tensorflow_available = False
+
+    def predict_batch(self, batch):
+        # Une « probabilité » par image: la moyenne de ses pixels, pour vérifier l'ordre
+        means = batch.reshape(len(batch), -1).mean(axis=1)
+        return np.stack([means, 1 - means], axis=1)
+
+
+def test_round_trip_over_unix_socket():
+    socket_path = os.path.join(tempfile.mkdtemp(), 'inference.sock')
+    server = InferenceServer(socket_path, FakeClassifier(), max_batch_size=4, max_wait_ms=1)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = InferenceClient(socket_path, pool_size=2)
+        batch = np.stack([np.full((4, 4, 3), value, dtype=np.uint8) for value in (0, 1, 2)])
+
+        probabilities = client.predict_batch(batch)
+        assert probabilities.shape == (3, 2)
+        assert probabilities[:, 0].tolist() == [0.0, 1.0, 2.0]
+
+        # La connexion est réutilisée pour la requête suivante
+        assert client.status()['warmed'] is True
+        assert client.predict_batch(batch[:1])[0, 0] == 0.0
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def serve_raw(handlers):
+    """Serveur brut: la n-ième connexion est confiée à ``handlers[n]``, qui reçoit le socket"""
+    socket_path = os.path.join(tempfile.mkdtemp(), 'inference.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen()
+
+    def accept():
+        for handler in handlers:
+            conn, _ = listener.accept()
+            with conn:
+                handler(conn)
+        listener.close()
+
+    threading.Thread(target=accept, daemon=True).start()
+    return socket_path
+
+
+def read_request(conn, requests):
+    header = recv_exact(conn, REQUEST_HEADER.size)
+    _, _, _, count, height, width, channels = REQUEST_HEADER.unpack(header)
+    recv_exact(conn, count * height * width * channels)
+    requests.append(count)
+
+
+def answer(conn, magic=MAGIC):
+    probabilities = np.array([[0.25, 0.75]], dtype=PROBABILITY_DTYPE)
+    conn.sendall(RESPONSE_HEADER.pack(magic, VERSION, 0, 1, 2) + probabilities.tobytes())
+
+
+def test_stale_pooled_connection_is_retried_once():
+    requests = []
+
+    def answer_then_close(conn):
+        read_request(conn, requests)
+        answer(conn)
+
+    def answer_twice(conn):
+        for _ in range(2):
+            read_request(conn, requests)
+            answer(conn)
+
+    client = InferenceClient(serve_raw([answer_then_close, answer_twice]), pool_size=1)
+    image = np.zeros((1, 2, 2, 3), dtype=np.uint8)
+    client.predict_batch(image)
+    # Le serveur a fermé la connexion du pool: la requête part sur une nouvelle connexion
+    assert client.predict_batch(image).tolist() == [[0.25, 0.75]]
+    assert client.predict_batch(image).tolist() == [[0.25, 0.75]]
+    assert requests == [1, 1, 1]
+
+
+def test_timeouts_and_fresh_connections_are_not_retried():
+    requests = []
+    release = threading.Event()
+
+    def hang(conn):
+        read_request(conn, requests)
+        release.wait(5)
+
+    def close_without_answer(conn):
+        read_request(conn, requests)
+
+    client = InferenceClient(serve_raw([hang, close_without_answer]), timeout=0.2)
+    image = np.zeros((1, 2, 2, 3), dtype=np.uint8)
+    with pytest.raises(TimeoutError):
+        client.predict_batch(image)
+    release.set()
+    with pytest.raises(PeerClosedError):
+        client.predict_batch(image)
+    # Chaque lot n'a été envoyé qu'une fois
+    assert requests == [1, 1]
+
+
+def test_response_with_a_bad_magic_is_rejected():
+    requests = []
+
+    def bad_magic(conn):
+        read_request(conn, requests)
+        answer(conn, magic=b'XX')
+
+    client = InferenceClient(serve_raw([bad_magic]))
+    with pytest.raises(InferenceServerError):
+        client.predict_batch(np.zeros((1, 2, 2, 3), dtype=np.uint8))
+
+
+def test_server_command_keeps_the_gate_and_the_cascade(tmp_path, monkeypatch):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.conf import settings
+    from django.core.management import call_command
+
+    from classifier.management.commands import run_inference_server
+
+    served = []
+
+    class RecordingServer:
+        def __init__(self, socket_path, classifier, **options):
+            served.append(classifier)
+
+        def serve_forever(self):
+            pass
+
+        def server_close(self):
+            pass
+
+    fast_model = str(tmp_path / 'fast_model.keras')
+    open(fast_model + '.sim', 'w').close()
+    monkeypatch.setattr(settings, 'ML_CASCADE_THRESHOLD', 0.8)
+    monkeypatch.setattr(settings, 'ML_DOG_GATE_THRESHOLD', 0.2)
+    monkeypatch.setattr(settings, 'ML_FAST_MODEL_PATH', fast_model)
+    monkeypatch.setattr(run_inference_server, 'InferenceServer', RecordingServer)
+    monkeypatch.setattr(run_inference_server.signal, 'signal', lambda signum, handler: None)
+
+    call_command('run_inference_server', socket=str(tmp_path / 'inference.sock'))
+
+    assert served[0].cascade_threshold == 0.8
+    assert served[0].dog_gate_threshold == 0.2
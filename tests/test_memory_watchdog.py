@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests de la surveillance mémoire qui recycle les workers.
+"""
+
+from ml_models.memory_watchdog import MemoryWatchdog, read_rss_bytes
+from ml_models.metrics import metrics
+
+MB = 2 ** 20
+
+
+def test_read_rss_of_current_process():
+    rss = read_rss_bytes()
+    assert rss is None or rss > MB
+    assert read_rss_bytes(pid=2 ** 30) is None
+
+
+def test_recycles_once_over_the_limit():
+    samples = iter([300 * MB, 450 * MB, 520 * MB, 530 * MB])
+    reasons = []
+    watchdog = MemoryWatchdog(500 * MB, reasons.append, rss_fn=lambda: next(samples))
+    metrics.reset()
+
+    assert not watchdog.check()
+    assert not watchdog.check()
+    assert watchdog.check()
+    # Un seul recyclage, même si la mémoire reste au-delà
+    assert not watchdog.check()
+
+    assert len(reasons) == 1 and '520' in reasons[0] and '500' in reasons[0]
+    assert watchdog.recycle_reason == reasons[0]
+    assert metrics.snapshot()['gauges']['worker.peak_rss_bytes'] == 520 * MB
+
+
+def test_unknown_rss_never_recycles():
+    reasons = []
+    watchdog = MemoryWatchdog(1, reasons.append, rss_fn=lambda: None)
+    assert not watchdog.check()
+    assert reasons == []
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Tests du pool de modèles chargés à la demande (éviction LRU sous budget mémoire).
+"""
+
+import threading
+import time
+
+import pytest
+
+from ml_models.metrics import metrics
+from ml_models.model_pool import ModelPool
+
+
+class FakeLoader:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.loads = []
+        self.unloaded = []
+
+    def load(self, name):
+        time.sleep(self.delay)
+        self.loads.append(name)
+        return {'name': name}
+
+    def unload(self, model):
+        self.unloaded.append(model['name'])
+
+
+def make_pool(loader, budget=2):
+    # Chaque modèle « pèse » un octet: le budget est un nombre de modèles
+    return ModelPool(loader.load, budget, size_fn=lambda model: 1, unload_fn=loader.unload)
+
+
+def test_hits_and_misses():
+    loader = FakeLoader()
+    pool = make_pool(loader)
+    metrics.reset()
+    for name in ('a', 'a', 'b', 'a'):
+        with pool.use(name) as model:
+            assert model['name'] == name
+
+    assert loader.loads == ['a', 'b']
+    stats = pool.stats()
+    assert (stats['hits'], stats['misses']) == (2, 2)
+    assert stats['hit_rate'] == 0.5
+    assert stats['used_bytes'] == 2
+    snapshot = metrics.snapshot()
+    assert snapshot['counters']['model_pool.misses'] == 2
+    assert 'model_pool.load_seconds' in snapshot['timings']
+
+
+def test_least_recently_used_is_evicted():
+    loader = FakeLoader()
+    pool = make_pool(loader)
+    for name in ('a', 'b', 'a', 'c'):
+        with pool.use(name):
+            pass
+
+    assert loader.unloaded == ['b']
+    assert pool.resident() == ['a', 'c']
+    assert pool.stats()['evictions'] == 1
+
+
+def test_model_in_use_is_not_evicted():
+    loader = FakeLoader()
+    pool = make_pool(loader, budget=1)
+    with pool.use('a'):
+        with pool.use('b'):
+            # Budget dépassé tant que les deux servent
+            assert pool.resident() == ['a', 'b']
+        assert loader.unloaded == []
+    with pool.use('c'):
+        pass
+    assert 'c' in pool.resident() and pool.used_bytes() <= 2
+
+
+def test_concurrent_requests_load_once():
+    loader = FakeLoader(delay=0.1)
+    pool = make_pool(loader)
+
+    def use():
+        with pool.use('a'):
+            pass
+
+    threads = [threading.Thread(target=use) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.loads == ['a']
+    assert pool.stats()['misses'] == 1
+
+
+def test_failed_load_is_retried():
+    attempts = []
+
+    def load(name):
+        attempts.append(name)
+        if len(attempts) == 1:
+            raise RuntimeError('fichier absent')
+        return name
+
+    pool = ModelPool(load, 10, size_fn=lambda model: 1)
+    with pytest.raises(RuntimeError):
+        with pool.use('a'):
+            pass
+    with pool.use('a') as model:
+        assert model == 'a'
+    assert attempts == ['a', 'a']
+
+
+def test_variant_requests_are_shed_on_their_own_queue(monkeypatch):
+    import os
+
+    import django
+    import numpy as np
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from classifier import runtime, views
+
+    monkeypatch.setattr(settings, 'ML_MODEL_VARIANTS', {'terriers': '/models/terriers.keras'})
+    controller = runtime.get_variant_admission_controller('terriers')
+    assert controller.inference_queue is runtime.get_variant_queue('terriers')
+    assert controller is not runtime.get_admission_controller()
+
+    # Chargements lents dans le pool: la file de la variante dépasse le budget d'attente
+    monkeypatch.setattr(controller.inference_queue, 'ewma_batch_seconds', 10 * settings.ADMISSION_WAIT_BUDGET_SECONDS)
+    request = RequestFactory().post(
+        '/predict/tensor/?model=terriers', data=np.zeros((1, 224, 224, 3), dtype=np.uint8).tobytes(),
+        content_type='application/octet-stream', HTTP_X_TENSOR_SHAPE='1,224,224,3',
+    )
+    response = views.predict_tensor(request)
+    assert response.status_code == 503
+    assert runtime.get_admission_controller().admit()[0]
+
+
+def test_variant_has_its_own_resolution_and_breeds(tmp_path, monkeypatch):
+    import json
+    import os
+
+    import django
+    import numpy as np
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from classifier import runtime, views
+
+    model_path = str(tmp_path / 'chiots.keras')
+    open(model_path + '.sim', 'w').close()
+    with open(model_path + '.json', 'w') as f:
+        json.dump({'input_shape': [160, 160, 3], 'breeds': ['Beagle', 'Pug', 'Corgi']}, f)
+    monkeypatch.setattr(settings, 'ML_MODEL_VARIANTS', {'chiots': model_path})
+    monkeypatch.setattr(runtime, '_variant_specs', {})
+
+    described = json.loads(views.predict_tensor(RequestFactory().get('/predict/tensor/?model=chiots')).content)
+    assert described['input_shape'] == [160, 160, 3]
+    assert described['breeds'] == ['Beagle', 'Pug', 'Corgi']
+
+    request = RequestFactory().post(
+        '/predict/tensor/?model=chiots', data=np.zeros((2, 160, 160, 3), dtype=np.uint8).tobytes(),
+        content_type='application/octet-stream', HTTP_X_TENSOR_SHAPE='2,160,160,3',
+    )
+    response = views.predict_tensor(request)
+    assert response.status_code == 200
+    assert json.loads(response.content)['shape'] == [2, 3]
+
+
+def test_evicted_variant_only_drops_its_references(monkeypatch):
+    import os
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from classifier import runtime
+    from ml_models import enhanced_model
+    from ml_models.enhanced_model import EnhancedDogBreedClassifier
+
+    collected = []
+    monkeypatch.setattr(enhanced_model.gc, 'collect', lambda: collected.append(True))
+    classifier = EnhancedDogBreedClassifier(num_classes=3)
+    classifier.model = object()
+
+    # Les autres modèles prédisent peut-être: ni clear_session, ni gc.collect, ni malloc_trim
+    assert runtime.get_model_pool().unload_fn(classifier)
+    assert classifier.model is None
+    assert collected == []
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests du mode ML_MODEL_LOADING=preload: rien de TensorFlow dans le maître de gunicorn.
+"""
+
+import gc
+import importlib.util
+import os
+
+import pytest
+
+from ml_models.weight_store import map_file
+
+PROJECT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'dog_breed_identifier')
+
+
+def test_map_file_shares_the_file_pages(tmp_path):
+    path = tmp_path / 'weights.h5'
+    path.write_bytes(b'poids' * 1000)
+    mapping = map_file(str(path))
+    assert mapping[:5] == b'poids' and len(mapping) == 5000
+
+
+def test_preload_maps_weights_without_building_the_model(tmp_path, monkeypatch):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.conf import settings
+
+    from classifier import runtime
+
+    fast_model = tmp_path / 'fast_model.keras'
+    fast_model.write_bytes(b'modele rapide')
+    monkeypatch.setattr(settings, 'ML_FAST_MODEL_PATH', str(fast_model))
+    monkeypatch.setattr(settings, 'ML_WEIGHTS_OFFLINE', True)
+    monkeypatch.setattr(settings, 'ML_WEIGHTS_DIR', str(tmp_path))
+    monkeypatch.setattr(runtime, '_preloaded_files', [])
+
+    def no_model(*args, **kwargs):
+        pytest.fail("le maître ne doit pas construire le modèle")
+
+    monkeypatch.setattr(runtime, 'EnhancedDogBreedClassifier', no_model)
+    mapped = runtime.preload()
+    # ResNet50 absent en mode hors ligne: seul le modèle rapide est projeté
+    assert [bytes(mapping) for mapping in mapped] == [b'modele rapide']
+
+
+def test_master_reenables_gc_when_ready(monkeypatch):
+    monkeypatch.setenv('ML_MODEL_LOADING', 'preload')
+    spec = importlib.util.spec_from_file_location('gunicorn_conf', os.path.join(PROJECT_DIR, 'gunicorn.conf.py'))
+    conf = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(conf)
+        assert not gc.isenabled()
+        conf.when_ready(server=None)
+        assert gc.isenabled()
+    finally:
+        gc.enable()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests du prétraitement des images (décodage JPEG réduit, budget de décodage).
+"""
+
+import pytest
+from PIL import Image
+
+from ml_models.enhanced_model import EnhancedDogBreedClassifier, sample_frame_indices
+from ml_models.image_guard import ImageRejected
+
+
+@pytest.fixture
+def classifier():
+    return EnhancedDogBreedClassifier()
+
+
+@pytest.mark.parametrize('size, expected', [
+    ((4032, 3024), 8),
+    ((1920, 1080), 4),
+    ((640, 480), 2),
+    ((300, 300), 1),
+])
+def test_draft_scale_matches_pillow(tmp_path, classifier, size, expected):
+    path = tmp_path / 'photo.jpg'
+    Image.new('RGB', size, (90, 60, 30)).save(path)
+    assert classifier.draft_scale('JPEG', size) == expected
+
+    with Image.open(path) as img:
+        img.draft('RGB', (224, 224))
+        assert img.size[0] * img.size[1] == classifier.decode_pixels('JPEG', size)
+
+
+def test_other_formats_are_decoded_in_full(classifier):
+    assert classifier.draft_scale('PNG', (4032, 3024)) == 1
+    assert classifier.decode_pixels('PNG', (4032, 3024)) == 4032 * 3024
+
+
+def test_preprocess_returns_model_input(tmp_path, classifier):
+    path = tmp_path / 'photo.jpg'
+    Image.new('RGB', (4032, 3024), (90, 60, 30)).save(path)
+    array = classifier.preprocess_image(str(path))
+    assert array.shape == (224, 224, 3)
+    assert array.dtype.name == 'uint8'
+
+
+def test_preprocess_enforces_decode_budget(tmp_path):
+    classifier = EnhancedDogBreedClassifier(max_decode_pixels=1_000_000)
+    path = tmp_path / 'large.png'
+    Image.new('RGB', (2000, 1000)).save(path)
+    with pytest.raises(ImageRejected):
+        classifier.preprocess_image(str(path))
+
+    # Le même nombre de pixels en JPEG est décodé à l'échelle 1/4: dans le budget
+    path = tmp_path / 'large.jpg'
+    Image.new('RGB', (2000, 1000)).save(path)
+    assert classifier.preprocess_image(str(path)).shape == (224, 224, 3)
+
+
+def save_animation(path, colors):
+    frames = [Image.new('RGB', (64, 48), color) for color in colors]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=40)
+
+
+def test_sample_frame_indices():
+    assert sample_frame_indices(3, 8) == [0, 1, 2]
+    assert sample_frame_indices(100, 5) == [0, 25, 50, 74, 99]
+    assert sample_frame_indices(100, 1) == [0]
+
+
+def test_preprocess_frames_samples_animation(tmp_path, classifier):
+    path = tmp_path / 'clip.gif'
+    save_animation(path, [(i * 20, 0, 0) for i in range(10)])
+    frames = classifier.preprocess_frames(str(path), max_frames=4)
+    assert frames.shape == (4, 224, 224, 3)
+    # Première et dernière images incluses
+    assert frames[0, 0, 0, 0] < frames[-1, 0, 0, 0]
+
+
+def test_preprocess_frames_on_still_image(tmp_path, classifier):
+    path = tmp_path / 'photo.jpg'
+    Image.new('RGB', (640, 480)).save(path)
+    assert classifier.preprocess_frames(str(path)).shape == (1, 224, 224, 3)
+
+
+def test_preprocess_frames_stays_within_decode_budget(tmp_path):
+    classifier = EnhancedDogBreedClassifier(max_decode_pixels=64 * 48 * 3)
+    path = tmp_path / 'clip.gif'
+    save_animation(path, [(i * 20, 0, 0) for i in range(10)])
+    # Seules les 3 premières images tiennent dans le budget
+    frames = classifier.preprocess_frames(str(path), max_frames=8)
+    assert len(frames) == 3
+
+
+def test_export_serving_without_tensorflow_writes_marker(tmp_path, classifier):
+    if classifier.is_tensorflow_available:
+        pytest.skip('TensorFlow installé: export réel testé par test_serving_signature_matches_python_preprocessing')
+    export_dir = str(tmp_path / 'serving')
+    assert classifier.export_serving(export_dir) is False
+    assert (tmp_path / 'serving.sim').exists()
+
+
+def test_serving_signature_matches_python_preprocessing(tmp_path):
+    tf = pytest.importorskip('tensorflow')
+    import numpy as np
+
+    classifier = EnhancedDogBreedClassifier(num_classes=5)
+    classifier.model = tf.keras.Sequential([
+        tf.keras.Input((224, 224, 3)),
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(5, activation='softmax'),
+    ])
+    path = tmp_path / 'photo.png'
+    pixels = np.random.default_rng(0).integers(0, 256, (300, 400, 3), dtype=np.uint8)
+    Image.fromarray(pixels).save(path)
+
+    export_dir = str(tmp_path / 'serving')
+    assert classifier.export_serving(export_dir)
+    serving = tf.saved_model.load(export_dir).signatures['serving_default']
+    from_bytes = serving(images=tf.constant([path.read_bytes()]))['probabilities'].numpy()
+    from_python = classifier.predict_accurate(classifier.preprocess_image(path)[np.newaxis])
+    np.testing.assert_allclose(from_bytes, from_python, atol=1e-2)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests du service à plusieurs résolutions (prétraitement, tenseurs, files par résolution).
+"""
+
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from ml_models.enhanced_model import EnhancedDogBreedClassifier
+from ml_models.inference_server import InferenceClient, InferenceServer
+from ml_models.tensor_codec import TensorRejected, decode_tensor
+
+
+@pytest.fixture
+def classifier():
+    return EnhancedDogBreedClassifier(resolutions=(160, 288))
+
+
+def test_default_resolution_is_always_served(classifier):
+    assert classifier.resolutions == (160, 224, 288)
+    assert EnhancedDogBreedClassifier().resolutions == (224,)
+
+
+def test_preprocess_at_each_resolution(tmp_path, classifier):
+    path = tmp_path / 'photo.jpg'
+    Image.new('RGB', (1920, 1080), (90, 60, 30)).save(path)
+
+    assert classifier.preprocess_image(path).shape == (224, 224, 3)
+    for resolution in classifier.resolutions:
+        assert classifier.preprocess_image(path, resolution).shape == (resolution, resolution, 3)
+        assert classifier.preprocess_frames(path, resolution=resolution).shape == (1, resolution, resolution, 3)
+
+
+def test_draft_scale_follows_resolution(classifier):
+    # 1920 / 160 = 12 -> 1/8, mais 1920 / 288 = 6 -> 1/4
+    assert classifier.draft_scale('JPEG', (1920, 1080), 160) == 4
+    assert classifier.draft_scale('JPEG', (4032, 3024), 160) == 8
+    assert classifier.draft_scale('JPEG', (1920, 1080), 288) == 2
+
+
+def test_unknown_resolution_is_refused(classifier):
+    with pytest.raises(ValueError):
+        classifier.target_size(512)
+
+
+def test_simulated_predictions_at_other_resolution(classifier):
+    probabilities = classifier.predict_batch(np.zeros((2, 160, 160, 3), dtype=np.uint8))
+    assert probabilities.shape == (2, len(classifier.breeds))
+
+
+def test_decode_tensor_accepts_any_served_shape():
+    shapes = [(2, 2, 3), (4, 4, 3)]
+    small = np.zeros((3, 2, 2, 3), dtype=np.uint8)
+    large = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    assert decode_tensor(small.tobytes(), shapes, shape=small.shape).shape == (3, 2, 2, 3)
+    assert decode_tensor(large.tobytes(), shapes, shape=large.shape).shape == (1, 4, 4, 3)
+    with pytest.raises(TensorRejected) as excinfo:
+        decode_tensor(bytes(27), shapes, shape=(3, 3, 3))
+    assert excinfo.value.status == 422
+
+
+class ShapeCheckingClassifier:
+    is_loaded = True
+    is_warmed = True
+    is_tensorflow_available = False
+
+    def predict_batch(self, batch):
+        # np.stack échouerait déjà si un lot mélangeait deux résolutions
+        return np.full((len(batch), 1), batch.shape[1], dtype=np.float32)
+
+
+def test_inference_server_batches_each_resolution_separately():
+    socket_path = os.path.join(tempfile.mkdtemp(), 'inference.sock')
+    server = InferenceServer(socket_path, ShapeCheckingClassifier(), max_batch_size=8, max_wait_ms=20)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = InferenceClient(socket_path, pool_size=2)
+        results = {}
+
+        def predict(side):
+            results[side] = client.predict_batch(np.zeros((2, side, side, 3), dtype=np.uint8))
+
+        threads = [threading.Thread(target=predict, args=(side,)) for side in (2, 4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results[2][:, 0].tolist() == [2.0, 2.0]
+        assert results[4][:, 0].tolist() == [4.0, 4.0]
+        assert sorted(client.status()['inference_queues']) == ['2', '4']
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests de la lecture des limites cgroup et du plan de service gunicorn/TensorFlow.
+"""
+
+from ml_models.resources import plan_serving, read_cpu_quota, read_memory_limit
+
+GB = 1024 ** 3
+
+
+def test_reads_cgroup_v2(tmp_path):
+    (tmp_path / 'cpu.max').write_text('200000 100000\n')
+    (tmp_path / 'memory.max').write_text(f'{2 * GB}\n')
+    assert read_cpu_quota(str(tmp_path)) == 2.0
+    assert read_memory_limit(str(tmp_path)) == 2 * GB
+
+
+def test_cgroup_v2_without_limits(tmp_path):
+    (tmp_path / 'cpu.max').write_text('max 100000\n')
+    (tmp_path / 'memory.max').write_text('max\n')
+    assert read_cpu_quota(str(tmp_path)) is None
+    assert read_memory_limit(str(tmp_path)) is None
+
+
+def test_reads_cgroup_v1(tmp_path):
+    (tmp_path / 'cpu').mkdir()
+    (tmp_path / 'cpu' / 'cpu.cfs_quota_us').write_text('150000\n')
+    (tmp_path / 'cpu' / 'cpu.cfs_period_us').write_text('100000\n')
+    (tmp_path / 'memory').mkdir()
+    (tmp_path / 'memory' / 'memory.limit_in_bytes').write_text('9223372036854771712\n')
+    assert read_cpu_quota(str(tmp_path)) == 1.5
+    assert read_memory_limit(str(tmp_path)) is None
+
+
+def test_splits_cpus_between_workers():
+    plan, sources = plan_serving(cpu_quota=8, cpu_count=32)
+    assert plan['workers'] == 4
+    assert plan['intra_op_threads'] == 2
+    assert plan['omp_threads'] == 2
+    assert plan['inter_op_threads'] == 1
+    assert set(sources.values()) == {'computed'}
+
+
+def test_memory_limit_caps_workers():
+    plan, _ = plan_serving(cpu_quota=8, cpu_count=8, memory_limit=1 * GB, worker_memory_mb=500)
+    assert plan['workers'] == 2
+    assert plan['intra_op_threads'] == 4
+
+
+def test_inference_server_mode_uses_light_workers():
+    plan, _ = plan_serving(cpu_quota=2, cpu_count=8, uses_inference_server=True)
+    assert plan['workers'] == 5
+    assert plan['intra_op_threads'] == 1
+
+
+def test_overrides_win():
+    plan, sources = plan_serving(cpu_quota=4, cpu_count=4, overrides={'workers': 3, 'intra_op_threads': 3})
+    assert plan['workers'] == 3 and sources['workers'] == 'override'
+    assert plan['omp_threads'] == 3
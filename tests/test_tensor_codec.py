@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tests du décodage des tenseurs bruts envoyés à /predict/tensor/.
+"""
+
+import io
+
+import numpy as np
+import pytest
+
+from ml_models.tensor_codec import (
+    BINARY_CONTENT_TYPE, NPY_CONTENT_TYPE, TensorRejected, decode_tensor, encode_probabilities, parse_shape,
+)
+
+INPUT_SHAPE = (4, 4, 3)
+
+
+def npy(array):
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+def test_parse_shape():
+    assert parse_shape('224,224,3') == (224, 224, 3)
+    assert parse_shape('2x224x224x3') == (2, 224, 224, 3)
+    with pytest.raises(TensorRejected):
+        parse_shape('224,abc')
+
+
+def test_npy_single_image_becomes_a_batch():
+    image = np.arange(48, dtype=np.uint8).reshape(INPUT_SHAPE)
+    batch = decode_tensor(npy(image), INPUT_SHAPE)
+    assert batch.shape == (1,) + INPUT_SHAPE
+    assert (batch[0] == image).all()
+
+
+def test_raw_body_requires_matching_shape():
+    body = bytes(2 * 48)
+    assert decode_tensor(body, INPUT_SHAPE, shape=(2,) + INPUT_SHAPE).shape == (2,) + INPUT_SHAPE
+    with pytest.raises(TensorRejected):
+        decode_tensor(body, INPUT_SHAPE)
+    with pytest.raises(TensorRejected):
+        decode_tensor(body[:-1], INPUT_SHAPE, shape=(2,) + INPUT_SHAPE)
+
+
+def test_rejects_wrong_dtype_and_shape():
+    with pytest.raises(TensorRejected) as excinfo:
+        decode_tensor(npy(np.zeros(INPUT_SHAPE, dtype=np.float32)), INPUT_SHAPE)
+    assert excinfo.value.status == 415
+    with pytest.raises(TensorRejected) as excinfo:
+        decode_tensor(npy(np.zeros((5, 4, 3), dtype=np.uint8)), INPUT_SHAPE)
+    assert excinfo.value.status == 422
+
+
+def test_rejects_too_many_images():
+    with pytest.raises(TensorRejected) as excinfo:
+        decode_tensor(npy(np.zeros((3,) + INPUT_SHAPE, dtype=np.uint8)), INPUT_SHAPE, max_images=2)
+    assert excinfo.value.status == 413
+
+
+def test_encode_probabilities():
+    probabilities = np.array([[0.25, 0.75]], dtype=np.float32)
+    raw = encode_probabilities(probabilities, BINARY_CONTENT_TYPE)
+    assert np.frombuffer(raw, dtype='<f4').tolist() == [0.25, 0.75]
+    assert np.load(io.BytesIO(encode_probabilities(probabilities, NPY_CONTENT_TYPE))).shape == (1, 2)
+
+
+def test_view_accepts_bodies_above_django_upload_limit():
+    import json
+    import os
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from classifier import views
+
+    batch = np.zeros((20, 224, 224, 3), dtype=np.uint8)
+    assert batch.nbytes > settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    request = RequestFactory().post(
+        '/predict/tensor/', data=batch.tobytes(), content_type=BINARY_CONTENT_TYPE,
+        HTTP_X_TENSOR_SHAPE='20,224,224,3',
+    )
+    response = views.predict_tensor(request)
+    assert response.status_code == 200, response.content
+    assert json.loads(response.content)['shape'][0] == 20
+
+    chunked = RequestFactory().post(
+        '/predict/tensor/', data=batch[:1].tobytes(), content_type=BINARY_CONTENT_TYPE,
+        HTTP_TRANSFER_ENCODING='chunked',
+    )
+    chunked.META.pop('CONTENT_LENGTH')
+    assert views.predict_tensor(chunked).status_code == 411
+
+
+def test_interactive_lane_requires_the_priority_token():
+    import os
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.test import RequestFactory, override_settings
+
+    from classifier import views
+
+    body = np.zeros((1, 224, 224, 3), dtype=np.uint8).tobytes()
+
+    def post(**headers):
+        return views.predict_tensor(RequestFactory().post(
+            '/predict/tensor/?priority=interactive', data=body, content_type=BINARY_CONTENT_TYPE,
+            HTTP_X_TENSOR_SHAPE='1,224,224,3', **headers,
+        ))
+
+    with override_settings(TENSOR_INTERACTIVE_TOKEN=''):
+        assert post(HTTP_X_PRIORITY_TOKEN='').status_code == 403
+    with override_settings(TENSOR_INTERACTIVE_TOKEN='secret'):
+        assert post().status_code == 403
+        assert post(HTTP_X_PRIORITY_TOKEN='wrong').status_code == 403
+        assert post(HTTP_X_PRIORITY_TOKEN='secret').status_code == 200
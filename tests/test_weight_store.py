@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests du stockage local des poids pré-entraînés.
+"""
+
+import hashlib
+import os
+
+from ml_models.weight_store import WeightStore
+
+
+def _store(tmp_path, content=b'weights'):
+    known = {
+        'tiny': {
+            'filename': 'tiny.h5',
+            'url': 'http://invalid.example/tiny.h5',
+            'md5': hashlib.md5(content).hexdigest(),
+        },
+    }
+    return WeightStore(str(tmp_path), known_weights=known)
+
+
+def test_resolve_offline_without_file_returns_none(tmp_path):
+    assert _store(tmp_path).resolve('tiny', allow_download=False) is None
+
+
+def test_verified_file_is_resolved_and_stamped(tmp_path):
+    store = _store(tmp_path)
+    with open(store.path_for('tiny'), 'wb') as f:
+        f.write(b'weights')
+
+    assert store.resolve('tiny', allow_download=False) == store.path_for('tiny')
+    assert os.path.exists(store.path_for('tiny') + '.verified')
+
+
+def test_corrupted_file_is_rejected(tmp_path):
+    store = _store(tmp_path)
+    with open(store.path_for('tiny'), 'wb') as f:
+        f.write(b'corrupted')
+
+    assert not store.is_available('tiny')
+    assert store.resolve('tiny', allow_download=False) is None
+
+
+def test_unpublished_digest_is_pinned_on_first_verification(tmp_path):
+    known = {'tiny': {'filename': 'tiny.h5', 'url': 'http://invalid.example/tiny.h5'}}
+    store = WeightStore(str(tmp_path), known_weights=known)
+    with open(store.path_for('tiny'), 'wb') as f:
+        f.write(b'weights')
+    assert store.is_available('tiny')
+
+    # Le contenu change: l'empreinte mémorisée ne correspond plus
+    with open(store.path_for('tiny'), 'wb') as f:
+        f.write(b'tampered')
+    assert not store.is_available('tiny')
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests du tampon d'écriture différée des enregistrements d'envoi.
+"""
+
+import threading
+import time
+
+from ml_models.write_behind import WriteBehindBuffer
+
+
+class Store:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+        self.written = threading.Event()
+
+    def write(self, records):
+        if self.fail:
+            raise RuntimeError('base indisponible')
+        self.batches.append(list(records))
+        self.written.set()
+
+
+def test_flushes_when_batch_is_full():
+    store = Store()
+    buffer = WriteBehindBuffer(store.write, batch_size=3, max_delay=60)
+    for i in range(3):
+        buffer.add(i)
+    assert store.written.wait(timeout=5)
+    assert store.batches == [[0, 1, 2]]
+    assert buffer.pending() == 0
+
+
+def test_flushes_after_max_delay():
+    store = Store()
+    buffer = WriteBehindBuffer(store.write, batch_size=100, max_delay=0.05)
+    start = time.monotonic()
+    buffer.add('a')
+    assert store.written.wait(timeout=5)
+    assert store.batches == [['a']]
+    assert time.monotonic() - start >= 0.05
+
+
+def test_full_buffer_is_written_by_the_caller():
+    writers = []
+    buffer = WriteBehindBuffer(
+        lambda records: writers.append((threading.current_thread().name, list(records))),
+        batch_size=4, max_delay=60, max_pending=4,
+    )
+    for i in range(4):
+        buffer.add(i)
+    # Tampon plein: écrit tout de suite par l'appelant, sans attendre le thread d'écriture
+    assert writers == [(threading.current_thread().name, [0, 1, 2, 3])]
+    assert buffer.pending() == 0
+
+
+def test_flush_writes_everything():
+    store = Store()
+    buffer = WriteBehindBuffer(store.write, batch_size=2, max_delay=60)
+    buffer._pending.extend(range(5))
+    assert buffer.flush() == 5
+    assert store.batches == [[0, 1], [2, 3], [4]]
+
+
+def test_records_survive_a_failed_flush():
+    store = Store(fail=True)
+    buffer = WriteBehindBuffer(store.write, batch_size=2, max_delay=60)
+    buffer._pending.extend(range(3))
+    assert buffer.flush() == 0
+    assert buffer.pending() == 3
+
+    # La base revient: rien n'a été perdu, et l'ordre est conservé
+    store.fail = False
+    assert buffer.flush() == 3
+    assert store.batches == [[0, 1], [2]]
+
+
+def test_failed_batches_are_bounded_by_max_pending():
+    store = Store(fail=True)
+    buffer = WriteBehindBuffer(store.write, batch_size=2, max_delay=60, max_pending=4)
+    buffer._pending.extend(range(5))
+    assert buffer.flush() == 0
+    # Le lot remis en tête ferait dépasser max_pending: les plus anciens sont perdus
+    assert buffer._pending == [1, 2, 3, 4]
+
+
+def test_upload_batch_is_retried_on_a_fresh_connection(monkeypatch):
+    import os
+
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'dog_identifier.settings')
+    django.setup()
+    from django.db import OperationalError
+
+    from classifier import runtime
+    from classifier.models import UploadedImage
+    from ml_models.metrics import metrics
+
+    attempts = []
+
+    def bulk_create(records):
+        attempts.append(list(records))
+        if len(attempts) == 1:
+            raise OperationalError('server closed the connection unexpectedly')
+        return records
+
+    monkeypatch.setattr(UploadedImage.objects, 'bulk_create', bulk_create)
+    metrics.reset()
+    buffer = WriteBehindBuffer(runtime._write_uploads, batch_size=10, max_delay=60)
+    buffer._pending.extend(['a', 'b'])
+
+    assert buffer.flush() == 2
+    assert attempts == [['a', 'b'], ['a', 'b']]
+    counters = metrics.snapshot()['counters']
+    assert counters['write_behind.retries'] == 1
+    assert 'write_behind.dropped' not in counters